@@ -0,0 +1,59 @@
+"""
+Benchmark tool-call latency under concurrent callers.
+
+Runs N concurrent callers against MongoMCPServer.call_tool on a single event
+loop and reports latency percentiles. Requires a reachable MongoDB configured
+through the usual MONGO_URI / DB_NAME / COLLECTION_NAME environment variables.
+
+Usage:
+    python -m benchmarks.bench_concurrent_queries --callers 32 --calls 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from src.mongo_mcp_server import config
+from src.mongo_mcp_server.server import MongoMCPServer
+
+def percentile(samples, pct):
+    """Return the pct-th percentile of a list of samples."""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+async def caller(server, calls, limit, latencies):
+    """Issue sequential tool calls and record each latency in milliseconds."""
+    arguments = {"query": {}, "options": {"limit": limit}}
+    for _ in range(calls):
+        start = time.perf_counter()
+        await server.call_tool(f"query_{config.COLLECTION_NAME}", arguments)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+async def run_benchmark(callers, calls, limit):
+    server = MongoMCPServer()
+    if not await server.setup_mongodb():
+        raise SystemExit("Could not connect to MongoDB")
+
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(caller(server, calls, limit, latencies) for _ in range(callers)))
+    elapsed = time.perf_counter() - start
+
+    print(f"callers={callers} calls/caller={calls} limit={limit}")
+    print(f"total requests: {len(latencies)} in {elapsed:.2f}s ({len(latencies) / elapsed:.1f} req/s)")
+    print(f"mean: {statistics.mean(latencies):.1f} ms")
+    for pct in (50, 95, 99):
+        print(f"p{pct}: {percentile(latencies, pct):.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--callers", type=int, default=32, help="Concurrent callers")
+    parser.add_argument("--calls", type=int, default=20, help="Calls per caller")
+    parser.add_argument("--limit", type=int, default=10, help="Documents per query")
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.callers, args.calls, args.limit))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Microbenchmark for document JSON encoding.
+
+Compares the legacy path (str(_id) + json.dumps(indent=2, cls=MongoJSONEncoder))
+with the DocumentEncoder backends on synthetic documents shaped like
+detailed_financials records, and BSON-to-JSON through decoded dicts with the
+RawBSONDocument pass-through. Does not need a MongoDB server.
+
+Usage:
+    python -m benchmarks.bench_json_encoding --docs 100 --repeat 20
+"""
+
+import argparse
+import json
+import random
+import timeit
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import bson
+from bson import Binary, Decimal128, Int64, ObjectId
+from bson.raw_bson import RawBSONDocument
+
+from src.mongo_mcp_server.encoding import DocumentEncoder, MongoJSONEncoder, RAW_CODEC_OPTIONS, orjson
+
+def make_document(rng, rich_types):
+    """Build one detailed_financials-like document."""
+    def money(value):
+        return Decimal128(Decimal(f"{value:.2f}")) if rich_types else round(value, 2)
+
+    quarters = []
+    for q in range(8):
+        revenue = rng.uniform(1e8, 1e11)
+        quarters.append({
+            "period": f"{2022 + q // 4}-Q{q % 4 + 1}",
+            "reported_at": datetime(2022, 1, 1, tzinfo=timezone.utc) + timedelta(days=91 * q),
+            "revenue": money(revenue),
+            "net_income": money(revenue * rng.uniform(0.05, 0.3)),
+            "eps": round(rng.uniform(0.1, 12), 4),
+            "shares_outstanding": Int64(rng.randint(10**8, 10**10)) if rich_types else rng.randint(10**8, 10**10)
+        })
+    doc = {
+        "_id": ObjectId(),
+        "symbol": rng.choice(["AAPL", "MSFT", "GOOG", "AMZN", "NVDA", "TSLA"]),
+        "company_name": "Example Corporation",
+        "timestamp": datetime.now(timezone.utc),
+        "financial_metrics": {
+            "revenue": money(rng.uniform(1e9, 4e11)),
+            "gross_margin": rng.uniform(0.2, 0.8),
+            "operating_margin": rng.uniform(0.05, 0.5),
+            "debt_to_equity": rng.uniform(0, 3),
+            "ratios": {f"ratio_{i}": rng.uniform(0, 100) for i in range(20)}
+        },
+        "quarterly_results": quarters,
+        "tags": [f"tag{i}" for i in range(10)]
+    }
+    if rich_types:
+        doc["source_id"] = Binary.from_uuid(uuid4())
+        doc["filing_ref"] = {"accession": ObjectId(), "parent": ObjectId()}
+    return doc
+
+def legacy_encode(doc):
+    """The pre-DocumentEncoder serialization path."""
+    doc = dict(doc)
+    doc["_id"] = str(doc["_id"])
+    return json.dumps(doc, indent=2, cls=MongoJSONEncoder)
+
+def bench(label, func, docs, repeat):
+    seconds = min(timeit.repeat(lambda: [func(d) for d in docs], number=1, repeat=repeat))
+    per_doc_us = seconds / len(docs) * 1e6
+    size = sum(len(func(d)) for d in docs)
+    print(f"{label:<28} {seconds * 1000:9.2f} ms  {per_doc_us:8.1f} us/doc  {size / len(docs):8.0f} B/doc")
+    return seconds
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=100, help="Documents per run")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs (best is reported)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    legacy_docs = [make_document(rng, rich_types=False) for _ in range(args.docs)]
+    rich_docs = [make_document(rng, rich_types=True) for _ in range(args.docs)]
+
+    encoders = {"json indent=2": DocumentEncoder("json"), "json compact": DocumentEncoder("json", compact=True)}
+    if orjson is not None:
+        encoders["orjson indent=2"] = DocumentEncoder("orjson")
+        encoders["orjson compact"] = DocumentEncoder("orjson", compact=True)
+    else:
+        print("orjson not installed; install the 'fast' extra to benchmark it")
+
+    print(f"Legacy-compatible documents ({args.docs} docs, best of {args.repeat}):")
+    baseline = bench("legacy MongoJSONEncoder", legacy_encode, legacy_docs, args.repeat)
+    for label, encoder in encoders.items():
+        seconds = bench(label, encoder.encode, legacy_docs, args.repeat)
+        print(f"{'':<28} {baseline / seconds:9.2f}x vs legacy")
+
+    print(f"\nDocuments with ObjectId/Decimal128/Int64/UUID at depth ({args.docs} docs):")
+    for label, encoder in encoders.items():
+        bench(label, encoder.encode, rich_docs, args.repeat)
+
+    print(f"\nBSON bytes to JSON, decoded dicts vs RawBSONDocument ({args.docs} docs):")
+    raw_docs = [bson.encode(d) for d in rich_docs]
+    for label, encoder in encoders.items():
+        bench(f"{label} (dict)", lambda b, e=encoder: e.encode(bson.decode(b)), raw_docs, args.repeat)
+        bench(f"{label} (raw)", lambda b, e=encoder: e.encode(RawBSONDocument(b, RAW_CODEC_OPTIONS)),
+              raw_docs, args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+Index advisor built from observed query shapes.
+
+Every query's filter, sort and projection is reduced to its shape (field
+names and operators, values removed) and counted with its latency. Shapes
+are turned into compound index suggestions following the
+equality-sort-range rule, checked against the collection's existing
+indexes, and ranked by the total time spent on shapes that no index serves.
+"""
+
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+import json
+import logging
+from pymongo.asynchronous.collection import AsyncCollection
+from . import config
+
+logger = logging.getLogger(__name__)
+
+IndexKey = List[Tuple[str, int]]
+
+def strip_values(query: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Replace every value in a filter with '?' while keeping fields and operators.
+
+    Args:
+        query (Mapping[str, Any]): MongoDB query filter
+
+    Returns:
+        Dict[str, Any]: Filter shape, e.g. {"symbol": "?", "price": {"$gte": "?"}}
+    """
+    shape: Dict[str, Any] = {}
+    for key, value in query.items():
+        if key in ('$and', '$or', '$nor') and isinstance(value, list):
+            shape[key] = [strip_values(item) for item in value if isinstance(item, Mapping)]
+        elif isinstance(value, Mapping) and value and all(str(op).startswith('$') for op in value):
+            shape[key] = {
+                op: strip_values(operand) if op == '$elemMatch' and isinstance(operand, Mapping) else '?'
+                for op, operand in value.items()
+            }
+        else:
+            shape[key] = '?'
+    return shape
+
+def _classify(shape: Mapping[str, Any], equality: List[str], ranges: List[str]) -> None:
+    """Collect equality and range fields that a single compound index can serve."""
+    for key, value in shape.items():
+        if key == '$and':
+            for item in value:
+                _classify(item, equality, ranges)
+        elif key.startswith('$'):
+            # $or, $nor, $expr, $text... need other index strategies
+            continue
+        elif isinstance(value, Mapping):
+            target = equality if set(value) <= {'$eq', '$in'} else ranges
+            if key not in target:
+                target.append(key)
+        elif key not in equality:
+            equality.append(key)
+
+class QueryShape(NamedTuple):
+    """A query with its values removed, and the index that would serve it."""
+    collection_name: str
+    filter: Dict[str, Any]
+    sort: IndexKey
+    projection: List[str]
+    equality: List[str]
+    ranges: List[str]
+
+    @property
+    def key(self) -> str:
+        return json.dumps(
+            [self.collection_name, self.filter, self.sort, sorted(self.projection)], sort_keys=True
+        )
+
+    def suggested_index(self) -> IndexKey:
+        """Equality fields first, then the sort, then range fields."""
+        index: IndexKey = [(field, 1) for field in self.equality]
+        used = set(self.equality)
+        for field, direction in self.sort:
+            if field not in used:
+                index.append((field, direction))
+                used.add(field)
+        index.extend((field, 1) for field in self.ranges if field not in used)
+        return index
+
+    def is_covered_by(self, index: IndexKey) -> bool:
+        """
+        Check whether an existing index serves this shape without a scan or in-memory sort.
+
+        Args:
+            index (IndexKey): Key pattern of an existing index
+
+        Returns:
+            bool: True if the index leads with the equality fields, then the
+                sort (same or fully reversed directions); a shape with neither
+                needs the index to lead with one of its range fields
+        """
+        position = len(self.equality)
+        if {field for field, _ in index[:position]} != set(self.equality):
+            return False
+        sort = [(field, direction) for field, direction in self.sort if field not in self.equality]
+        if sort:
+            prefix = index[position:position + len(sort)]
+            if [field for field, _ in prefix] != [field for field, _ in sort]:
+                return False
+            same = all(direction == existing for (_, direction), (_, existing) in zip(sort, prefix))
+            reversed_ = all(direction == -existing for (_, direction), (_, existing) in zip(sort, prefix))
+            if not (same or reversed_):
+                return False
+            position += len(sort)
+        if position:
+            return True
+        return bool(index) and index[0][0] in self.ranges
+
+def make_shape(
+    collection_name: str,
+    query: Optional[Mapping[str, Any]],
+    sort: Optional[Mapping[str, Any]] = None,
+    projection: Optional[Mapping[str, Any]] = None
+) -> QueryShape:
+    """
+    Build the value-free shape of a query.
+
+    Args:
+        collection_name (str): Name of the MongoDB collection
+        query (Mapping[str, Any], optional): MongoDB query filter
+        sort (Mapping[str, Any], optional): Sort criteria
+        projection (Mapping[str, Any], optional): Fields to include/exclude
+
+    Returns:
+        QueryShape: The shape with its equality and range fields
+    """
+    shape = strip_values(query or {})
+    equality: List[str] = []
+    ranges: List[str] = []
+    _classify(shape, equality, ranges)
+    sort_key = [
+        (field, -1 if direction == -1 else 1)
+        for field, direction in (sort or {}).items()
+    ]
+    return QueryShape(collection_name, shape, sort_key, list(projection or {}), equality, ranges)
+
+class ShapeStats:
+    """Observed executions of one query shape."""
+
+    def __init__(self, shape: QueryShape):
+        self.shape = shape
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+class Suggestion(NamedTuple):
+    """A proposed index and the observed traffic it would serve."""
+    collection_name: str
+    index: IndexKey
+    queries: int
+    total_ms: float
+    shapes: List[QueryShape]
+
+    def describe(self) -> str:
+        spec = json.dumps(dict(self.index))
+        example = self.shapes[0]
+        lines = [
+            f"{self.collection_name}: create index {spec}",
+            f"   could save up to {self.total_ms:.1f} ms over {self.queries} queries "
+            f"({len(self.shapes)} shape(s), avg {self.total_ms / max(self.queries, 1):.1f} ms)",
+            f"   example filter: {json.dumps(example.filter)}"
+            + (f" sort: {json.dumps(dict(example.sort))}" if example.sort else "")
+        ]
+        return "\n".join(lines)
+
+class IndexAdvisor:
+    def __init__(self, max_shapes: int = config.ADVISOR_MAX_SHAPES):
+        """
+        Initialize the index advisor.
+
+        Args:
+            max_shapes (int): Maximum number of distinct shapes tracked; the least
+                used shape is dropped when a new one arrives
+        """
+        self.max_shapes = max_shapes
+        self._shapes: Dict[str, ShapeStats] = {}
+        self.recorded = 0
+
+    def record(
+        self,
+        collection_name: str,
+        query: Optional[Mapping[str, Any]],
+        sort: Optional[Mapping[str, Any]],
+        projection: Optional[Mapping[str, Any]],
+        duration_ms: float
+    ) -> None:
+        """
+        Record one executed query.
+
+        Args:
+            collection_name (str): Name of the MongoDB collection
+            query (Mapping[str, Any], optional): MongoDB query filter
+            sort (Mapping[str, Any], optional): Sort criteria
+            projection (Mapping[str, Any], optional): Fields to include/exclude
+            duration_ms (float): Time spent running the query
+        """
+        shape = make_shape(collection_name, query, sort, projection)
+        stats = self._shapes.get(shape.key)
+        if stats is None:
+            if self.max_shapes <= 0:
+                return
+            if len(self._shapes) >= self.max_shapes:
+                least_used = min(self._shapes, key=lambda key: self._shapes[key].count)
+                del self._shapes[least_used]
+            stats = self._shapes[shape.key] = ShapeStats(shape)
+        stats.count += 1
+        stats.total_ms += duration_ms
+        stats.max_ms = max(stats.max_ms, duration_ms)
+        self.recorded += 1
+
+    async def advise(
+        self,
+        collections: Mapping[str, AsyncCollection]
+    ) -> Tuple[List[Suggestion], List[Tuple[QueryShape, str]]]:
+        """
+        Turn recorded shapes into ranked index suggestions.
+
+        Args:
+            collections (Mapping[str, AsyncCollection]): Collections by name, used
+                to read their existing indexes
+
+        Returns:
+            Tuple[List[Suggestion], List[Tuple[QueryShape, str]]]: Suggestions ranked
+                by total time, and shapes already covered with the covering index name
+        """
+        existing: Dict[str, List[Tuple[str, IndexKey]]] = {}
+        for name in {stats.shape.collection_name for stats in self._shapes.values()}:
+            if name not in collections:
+                continue
+            cursor = await collections[name].list_indexes()
+            existing[name] = [
+                (index['name'], [(field, direction) for field, direction in index['key'].items()])
+                for index in await cursor.to_list()
+            ]
+
+        grouped: Dict[str, Suggestion] = {}
+        covered: List[Tuple[QueryShape, str]] = []
+        for stats in self._shapes.values():
+            shape = stats.shape
+            if shape.collection_name not in existing:
+                continue
+            index = shape.suggested_index()
+            if not index:
+                continue
+            covering = next(
+                (name for name, key in existing[shape.collection_name]
+                 if all(isinstance(direction, (int, float)) for _, direction in key)
+                 and shape.is_covered_by(key)),
+                None
+            )
+            if covering:
+                covered.append((shape, covering))
+                continue
+            group_key = json.dumps([shape.collection_name, index])
+            previous = grouped.get(group_key)
+            if previous is None:
+                grouped[group_key] = Suggestion(shape.collection_name, index, stats.count, stats.total_ms, [shape])
+            else:
+                grouped[group_key] = previous._replace(
+                    queries=previous.queries + stats.count,
+                    total_ms=previous.total_ms + stats.total_ms,
+                    shapes=previous.shapes + [shape]
+                )
+
+        suggestions = sorted(grouped.values(), key=lambda suggestion: suggestion.total_ms, reverse=True)
+        return suggestions, covered
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of tracked shapes and recorded queries."""
+        return {
+            "shapes": len(self._shapes),
+            "recorded": self.recorded
+        }
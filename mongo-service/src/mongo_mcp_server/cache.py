@@ -0,0 +1,254 @@
+"""
+In-process query result cache.
+
+Entries are keyed by a canonical form of the query shape (collection, filter,
+projection, sort, skip, limit) and evicted by LRU order, total size and TTL.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional
+import hashlib
+import logging
+import time
+from bson import json_util
+from bson.json_util import CANONICAL_JSON_OPTIONS
+from . import config
+
+logger = logging.getLogger(__name__)
+
+def _canonicalize(value: Any, top_level: bool = False) -> Any:
+    """
+    Normalize a filter or projection so equivalent queries produce the same key.
+
+    Key order is only normalized where MongoDB ignores it: the top level of a
+    filter or projection and operator documents such as {"$gte": 1, "$lt": 5}.
+    Embedded documents used for exact matches keep their order, because
+    {"a": {"x": 1, "y": 2}} and {"a": {"y": 2, "x": 1}} match different documents.
+    """
+    if isinstance(value, dict):
+        items = [(key, _canonicalize(item)) for key, item in value.items()]
+        if top_level or all(str(key).startswith('$') for key in value):
+            items.sort(key=lambda item: item[0])
+        return {key: item for key, item in items}
+    if isinstance(value, (list, tuple)):
+        return [_canonicalize(item) for item in value]
+    return value
+
+def make_cache_key(
+    collection_name: str,
+    query: Optional[Dict[str, Any]] = None,
+    projection: Optional[Dict[str, Any]] = None,
+    sort: Optional[Dict[str, Any]] = None,
+    skip: int = 0,
+    limit: int = 0
+) -> str:
+    """
+    Build a cache key from the normalized shape of a query.
+
+    Args:
+        collection_name (str): Name of the MongoDB collection
+        query (Dict[str, Any], optional): MongoDB query filter
+        projection (Dict[str, Any], optional): Fields to include/exclude
+        sort (Dict[str, Any], optional): Sort criteria (order is significant)
+        skip (int): Number of documents skipped
+        limit (int): Maximum number of documents
+
+    Returns:
+        str: Collection-prefixed digest of the canonical query
+    """
+    canonical = json_util.dumps(
+        [
+            _canonicalize(query or {}, top_level=True),
+            _canonicalize(projection or {}, top_level=True),
+            list((sort or {}).items()),
+            skip or 0,
+            limit or 0
+        ],
+        json_options=CANONICAL_JSON_OPTIONS
+    )
+    return f"{collection_name}:{hashlib.sha256(canonical.encode('utf-8')).hexdigest()}"
+
+def filter_digest(query: Optional[Dict[str, Any]]) -> str:
+    """
+    Short digest identifying a normalized filter.
+
+    Args:
+        query (Dict[str, Any], optional): MongoDB query filter
+
+    Returns:
+        str: 16-character hex digest
+    """
+    canonical = json_util.dumps(
+        _canonicalize(query or {}, top_level=True), json_options=CANONICAL_JSON_OPTIONS
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+class CacheEntry(NamedTuple):
+    value: str
+    size: int
+    expires_at: float
+    collection_name: str
+
+class QueryCache:
+    def __init__(
+        self,
+        max_entries: int = config.CACHE_MAX_ENTRIES,
+        max_bytes: int = config.CACHE_MAX_BYTES,
+        ttl: float = config.CACHE_TTL_SECONDS
+    ):
+        """
+        Initialize the query cache.
+
+        Args:
+            max_entries (int): Maximum number of cached results
+            max_bytes (int): Maximum total size of cached keys and results, in UTF-8 bytes
+            ttl (float): Seconds a result stays valid
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.collection_ttls: Dict[str, float] = {}
+        self._generations: Dict[str, int] = {}
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.stale_writes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached result, refreshing its LRU position.
+
+        Args:
+            key (str): Cache key from make_cache_key
+
+        Returns:
+            Optional[str]: The cached result, or None on a miss
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def generation(self, collection_name: str) -> int:
+        """
+        Return a counter that changes every time a collection is invalidated.
+
+        Read it before running a query and pass it to set(), so a result
+        that was read while the collection changed is not cached.
+
+        Args:
+            collection_name (str): Name of the MongoDB collection
+
+        Returns:
+            int: Current invalidation generation of the collection
+        """
+        return self._generations.get(collection_name, 0)
+
+    def set(
+        self,
+        key: str,
+        value: str,
+        collection_name: str,
+        generation: Optional[int] = None
+    ) -> None:
+        """
+        Store a result, evicting least recently used entries as needed.
+
+        Args:
+            key (str): Cache key from make_cache_key
+            value (str): Result text to cache
+            collection_name (str): Collection the result was read from
+            generation (int, optional): Collection generation read before the
+                query ran; the result is dropped if it has changed since
+        """
+        if generation is not None and generation != self.generation(collection_name):
+            # Invalidated while the query ran; the result may predate the change
+            self.stale_writes += 1
+            return
+        # Sized in UTF-8 bytes, so non-ASCII results count for what they hold
+        size = len(key.encode('utf-8')) + len(value.encode('utf-8'))
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+        if key in self._entries:
+            self._remove(key)
+        ttl = self.collection_ttls.get(collection_name, self.ttl)
+        self._entries[key] = CacheEntry(value, size, time.monotonic() + ttl, collection_name)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def set_collection_ttl(self, collection_name: str, ttl: Optional[float]) -> None:
+        """
+        Override the TTL for one collection's results.
+
+        Used while a change stream keeps the collection's entries fresh, so
+        they can live longer than the default TTL.
+
+        Args:
+            collection_name (str): Name of the MongoDB collection
+            ttl (float, optional): TTL in seconds, or None to restore the default
+        """
+        if ttl is None:
+            self.collection_ttls.pop(collection_name, None)
+        else:
+            self.collection_ttls[collection_name] = ttl
+
+    def invalidate_collection(self, collection_name: str) -> int:
+        """
+        Drop every cached result read from a collection.
+
+        Args:
+            collection_name (str): Name of the MongoDB collection
+
+        Returns:
+            int: Number of entries removed
+        """
+        self._generations[collection_name] = self.generation(collection_name) + 1
+        keys = [key for key, entry in self._entries.items() if entry.collection_name == collection_name]
+        for key in keys:
+            self._remove(key)
+        if keys:
+            logger.debug(f"Invalidated {len(keys)} cached result(s) for '{collection_name}'")
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss/eviction counters and current usage."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "stale_writes": self.stale_writes
+        }
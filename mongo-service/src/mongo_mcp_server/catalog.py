@@ -0,0 +1,182 @@
+"""
+Collection catalog for the server.
+
+By default the server exposes the single configured collection. With
+discovery enabled, the catalog lists the database's collections with
+list_collection_names, keeps those that match the allow globs and none of
+the deny globs, and refreshes the list periodically. Tool and resource
+objects for a collection are only built when it is first used, so a
+database with hundreds of collections costs one name listing at startup.
+"""
+
+from collections.abc import Mapping
+from fnmatch import fnmatchcase
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence
+import asyncio
+import logging
+import time
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import PyMongoError
+from . import config
+from .resources import MongoCollectionResource
+from .tools import MongoAggregateTool, MongoExplainTool, MongoQueryTool
+
+logger = logging.getLogger(__name__)
+
+def parse_globs(value: str) -> List[str]:
+    """
+    Split a comma-separated list of glob patterns.
+
+    Args:
+        value (str): Patterns such as "orders,stock_*"
+
+    Returns:
+        List[str]: Non-empty, stripped patterns
+    """
+    return [pattern.strip() for pattern in value.split(',') if pattern.strip()]
+
+def collection_allowed(name: str, allow: Sequence[str], deny: Sequence[str]) -> bool:
+    """
+    Check a collection name against allow and deny globs (deny wins).
+
+    Args:
+        name (str): Collection name
+        allow (Sequence[str]): Globs a name must match at least one of
+        deny (Sequence[str]): Globs a name must match none of
+
+    Returns:
+        bool: True if the collection should be exposed
+    """
+    return (
+        any(fnmatchcase(name, pattern) for pattern in allow)
+        and not any(fnmatchcase(name, pattern) for pattern in deny)
+    )
+
+class CollectionHandlers(NamedTuple):
+    """Tool and resource objects serving one collection."""
+    query_tool: MongoQueryTool
+    aggregate_tool: MongoAggregateTool
+    explain_tool: MongoExplainTool
+    resource: MongoCollectionResource
+
+class CollectionCatalog(Mapping):
+    """Exposed collections by name, with their handlers built on first use."""
+
+    def __init__(
+        self,
+        db: AsyncDatabase,
+        factory: Callable[[str], CollectionHandlers],
+        collection_names: Optional[Sequence[str]] = None,
+        allow: Sequence[str] = (),
+        deny: Sequence[str] = (),
+        refresh_interval: float = config.COLLECTION_REFRESH_SECONDS
+    ):
+        """
+        Initialize the catalog.
+
+        Args:
+            db (AsyncDatabase): Async MongoDB database instance
+            factory (Callable[[str], CollectionHandlers]): Builds the handlers for a collection
+            collection_names (Sequence[str], optional): Fixed collections to expose;
+                when omitted, collections are discovered
+            allow (Sequence[str]): Globs of discovered collections to expose
+            deny (Sequence[str]): Globs of discovered collections to hide
+            refresh_interval (float): Seconds before the discovered list is refreshed
+        """
+        self.db = db
+        self.factory = factory
+        self.discover = collection_names is None
+        self.allow = list(allow) or ['*']
+        self.deny = list(deny)
+        self.refresh_interval = refresh_interval
+        self._names: List[str] = sorted(collection_names or [])
+        self._name_set = frozenset(self._names)
+        self._handlers: Dict[str, CollectionHandlers] = {}
+        self._refreshed_at = 0.0 if self.discover else float('inf')
+        self._refresh_lock = asyncio.Lock()
+        self.refreshes = 0
+
+    def __getitem__(self, name: str) -> AsyncCollection:
+        if name not in self._name_set:
+            raise KeyError(name)
+        return self.db[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._name_set
+
+    async def names(self) -> List[str]:
+        """
+        Return the exposed collection names, refreshing them when stale.
+
+        Returns:
+            List[str]: Sorted collection names
+        """
+        if time.monotonic() - self._refreshed_at >= self.refresh_interval:
+            await self.refresh()
+        return self._names
+
+    async def refresh(self) -> bool:
+        """
+        Re-list the database's collections (discovery mode only).
+
+        Returns:
+            bool: True if the set of exposed collections changed
+        """
+        if not self.discover:
+            return False
+        async with self._refresh_lock:
+            if time.monotonic() - self._refreshed_at < self.refresh_interval:
+                return False  # Another caller refreshed while we waited
+            try:
+                listed = await self.db.list_collection_names()
+            except PyMongoError as e:
+                # Keep serving the last known list; try again after the interval
+                logger.warning(f"Could not list collections: {e}")
+                self._refreshed_at = time.monotonic()
+                return False
+            names = sorted(name for name in listed if collection_allowed(name, self.allow, self.deny))
+            self._refreshed_at = time.monotonic()
+            self.refreshes += 1
+            if names == self._names:
+                return False
+            for name in set(self._handlers) - set(names):
+                del self._handlers[name]
+            logger.info(f"Collection catalog changed: {len(self._names)} -> {len(names)} collection(s)")
+            self._names = names
+            self._name_set = frozenset(names)
+            return True
+
+    async def handlers(self, name: str) -> Optional[CollectionHandlers]:
+        """
+        Return the handlers for a collection, building them on first use.
+
+        Args:
+            name (str): Collection name
+
+        Returns:
+            Optional[CollectionHandlers]: Handlers, or None if the collection is not exposed
+        """
+        await self.names()
+        if name not in self._name_set:
+            return None
+        handlers = self._handlers.get(name)
+        if handlers is None:
+            handlers = self._handlers[name] = self.factory(name)
+            logger.debug(f"Built handlers for collection '{name}'")
+        return handlers
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of exposed collections and how many have handlers."""
+        return {
+            "discover": self.discover,
+            "collections": len(self._names),
+            "loaded": len(self._handlers),
+            "refreshes": self.refreshes
+        }
@@ -0,0 +1,190 @@
+"""
+MongoDB change stream watcher.
+
+Opens one change stream per collection and fans each change event out to
+registered listeners (cache invalidation, resource subscriptions). Resume
+tokens are persisted so a restarted server continues where it stopped.
+Standalone servers do not support change streams; the watcher then reports
+the collection as inactive and callers fall back to TTL expiry.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Union
+import asyncio
+import logging
+import os
+import time
+from bson import json_util
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import OperationFailure, PyMongoError
+from . import config
+
+logger = logging.getLogger(__name__)
+
+# Error codes returned when the deployment cannot serve change streams
+CHANGE_STREAMS_UNSUPPORTED = {40573}
+# The resume token is no longer in the oplog
+CHANGE_STREAM_HISTORY_LOST = {286, 280}
+
+ChangeListener = Callable[[str, Optional[Mapping[str, Any]]], Union[None, Awaitable[None]]]
+StateListener = Callable[[str, bool], None]
+
+class ChangeStreamWatcher:
+    def __init__(
+        self,
+        db: AsyncDatabase,
+        collection_names: Iterable[str],
+        token_path: str = config.RESUME_TOKEN_PATH,
+        max_backoff: float = config.CHANGE_STREAM_MAX_BACKOFF_SECONDS
+    ):
+        """
+        Initialize the change stream watcher.
+
+        Args:
+            db (AsyncDatabase): Async MongoDB database instance
+            collection_names (Iterable[str]): Collections to watch
+            token_path (str): File that stores resume tokens ('' disables persistence)
+            max_backoff (float): Maximum delay between reconnection attempts
+        """
+        self.db = db
+        self.collection_names = list(collection_names)
+        self.token_path = token_path
+        self.max_backoff = max_backoff
+        self.active: Dict[str, bool] = {}
+        self.events = 0
+        self._listeners: List[ChangeListener] = []
+        self._state_listeners: List[StateListener] = []
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._tokens: Dict[str, Any] = self._load_tokens()
+        self._last_flush = 0.0
+
+    def add_listener(self, listener: ChangeListener) -> None:
+        """
+        Register a callback for change events.
+
+        The callback receives the collection name and the change event. A
+        None event means changes may have been missed and everything derived
+        from the collection should be treated as stale.
+        """
+        self._listeners.append(listener)
+
+    def add_state_listener(self, listener: StateListener) -> None:
+        """Register a callback told whether a collection's stream is live."""
+        self._state_listeners.append(listener)
+
+    def watch(self, collection_name: str) -> None:
+        """Start watching an additional collection."""
+        if collection_name not in self.collection_names:
+            self.collection_names.append(collection_name)
+        if collection_name not in self._tasks:
+            self._tasks[collection_name] = asyncio.create_task(
+                self._watch(collection_name), name=f"change-stream-{collection_name}"
+            )
+
+    def start(self) -> None:
+        """Start one background task per collection."""
+        for collection_name in self.collection_names:
+            self.watch(collection_name)
+
+    async def stop(self) -> None:
+        """Cancel the watcher tasks and persist the latest resume tokens."""
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._tasks.clear()
+        self._save_tokens()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return stream state per collection and the number of events seen."""
+        return {
+            "collections": dict(self.active),
+            "events": self.events
+        }
+
+    async def _watch(self, collection_name: str) -> None:
+        """Keep a change stream open on one collection, reconnecting with backoff."""
+        collection = self.db[collection_name]
+        namespace = f"{self.db.name}.{collection_name}"
+        backoff = 1.0
+        while True:
+            try:
+                async with await collection.watch(
+                    resume_after=self._tokens.get(namespace)
+                ) as stream:
+                    self._set_active(collection_name, True)
+                    logger.info(f"Watching change stream on '{collection_name}'")
+                    backoff = 1.0
+                    async for change in stream:
+                        self.events += 1
+                        self._tokens[namespace] = stream.resume_token
+                        await self._notify(collection_name, change)
+                        self._maybe_flush()
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as e:
+                if e.code in CHANGE_STREAMS_UNSUPPORTED:
+                    logger.info(
+                        f"Change streams unavailable for '{collection_name}' ({e}); "
+                        "cached results will expire by TTL only"
+                    )
+                    self._set_active(collection_name, False)
+                    return
+                if e.code in CHANGE_STREAM_HISTORY_LOST:
+                    logger.warning(f"Resume token for '{collection_name}' expired; restarting stream")
+                    self._tokens.pop(namespace, None)
+                    backoff = 0.0
+                else:
+                    logger.error(f"Change stream on '{collection_name}' failed: {e}")
+                await self._stream_lost(collection_name)
+            except PyMongoError as e:
+                logger.error(f"Change stream on '{collection_name}' failed: {e}")
+                await self._stream_lost(collection_name)
+            await asyncio.sleep(backoff)
+            backoff = min(max(backoff, 1.0) * 2, self.max_backoff)
+
+    async def _stream_lost(self, collection_name: str) -> None:
+        """Mark a stream inactive; changes may be missed until it reopens."""
+        self._set_active(collection_name, False)
+        await self._notify(collection_name, None)
+
+    async def _notify(self, collection_name: str, change: Optional[Mapping[str, Any]]) -> None:
+        for listener in self._listeners:
+            try:
+                result = listener(collection_name, change)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Change listener failed for '{collection_name}': {e}")
+
+    def _set_active(self, collection_name: str, active: bool) -> None:
+        if self.active.get(collection_name) == active:
+            return
+        self.active[collection_name] = active
+        for listener in self._state_listeners:
+            listener(collection_name, active)
+
+    def _load_tokens(self) -> Dict[str, Any]:
+        if not self.token_path or not os.path.exists(self.token_path):
+            return {}
+        try:
+            with open(self.token_path, 'r', encoding='utf-8') as f:
+                return json_util.loads(f.read())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable resume token file {self.token_path}: {e}")
+            return {}
+
+    def _maybe_flush(self) -> None:
+        if time.monotonic() - self._last_flush >= config.RESUME_TOKEN_FLUSH_SECONDS:
+            self._save_tokens()
+
+    def _save_tokens(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self.token_path or not self._tokens:
+            return
+        tmp_path = f"{self.token_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.token_path) or '.', exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(json_util.dumps(self._tokens))
+            os.replace(tmp_path, self.token_path)
+        except OSError as e:
+            logger.warning(f"Could not persist resume tokens to {self.token_path}: {e}")
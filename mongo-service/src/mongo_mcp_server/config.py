@@ -8,10 +8,110 @@ import os
 MONGO_URI = os.getenv('MONGO_URI', 'mongodb://localhost:27017/')
 DB_NAME = os.getenv('DB_NAME', 'stock_data')
 COLLECTION_NAME = os.getenv('COLLECTION_NAME', 'detailed_financials')
+CONNECT_WAIT_SECONDS = float(os.getenv('CONNECT_WAIT_SECONDS', '10'))  # early calls wait this long for MongoDB
+CONNECT_RETRY_MAX_SECONDS = float(os.getenv('CONNECT_RETRY_MAX_SECONDS', '30'))
+
+# Connection Pool Configuration
+MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', '100'))
+MONGO_MIN_POOL_SIZE = int(os.getenv('MONGO_MIN_POOL_SIZE', '4'))  # also opened at startup
+MONGO_MAX_CONNECTING = int(os.getenv('MONGO_MAX_CONNECTING', '2'))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv('MONGO_MAX_IDLE_TIME_MS', '300000'))  # 0 keeps idle connections
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', '0'))  # 0 waits for the operation timeout
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000'))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv('MONGO_CONNECT_TIMEOUT_MS', '5000'))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv('MONGO_SOCKET_TIMEOUT_MS', '0'))  # 0 relies on maxTimeMS
+MONGO_COMPRESSORS = os.getenv('MONGO_COMPRESSORS', '')  # e.g. zstd,snappy,zlib
+
+# Health Monitor Configuration
+HEALTH_CHECK_INTERVAL_SECONDS = float(os.getenv('HEALTH_CHECK_INTERVAL_SECONDS', '5'))
+HEALTH_PING_TIMEOUT_SECONDS = float(os.getenv('HEALTH_PING_TIMEOUT_SECONDS', '2'))
+HEALTH_FAILURE_THRESHOLD = int(os.getenv('HEALTH_FAILURE_THRESHOLD', '2'))  # failed pings that open the circuit
+HEALTH_MAX_BACKOFF_SECONDS = float(os.getenv('HEALTH_MAX_BACKOFF_SECONDS', '10'))
+
+# Collection Discovery Configuration
+COLLECTION_DISCOVERY = os.getenv('COLLECTION_DISCOVERY', 'false').lower() == 'true'
+COLLECTION_ALLOW = os.getenv('COLLECTION_ALLOW', '*')  # comma-separated globs
+COLLECTION_DENY = os.getenv('COLLECTION_DENY', 'system.*')  # comma-separated globs, deny wins
+COLLECTION_REFRESH_SECONDS = float(os.getenv('COLLECTION_REFRESH_SECONDS', '60'))
+LIST_PAGE_SIZE = int(os.getenv('LIST_PAGE_SIZE', '100'))  # tools/resources per list page
+
+# Executor Configuration
+EXECUTOR_MAX_WORKERS = int(os.getenv('EXECUTOR_MAX_WORKERS', '8'))
+COLLECTION_MAX_CONCURRENCY = int(os.getenv('COLLECTION_MAX_CONCURRENCY', '4'))
+
+# Result Serialization Configuration
+RESULT_MAX_BYTES = int(os.getenv('RESULT_MAX_BYTES', '1000000'))
+RESULT_BATCH_SIZE = int(os.getenv('RESULT_BATCH_SIZE', '20'))
+JSON_ENCODER = os.getenv('JSON_ENCODER', 'auto')  # auto, orjson or json
+JSON_COMPACT = os.getenv('JSON_COMPACT', 'false').lower() == 'true'
+RAW_BSON = os.getenv('RAW_BSON', 'false').lower() == 'true'
+
+# Query Cache Configuration
+QUERY_CACHE_ENABLED = os.getenv('QUERY_CACHE_ENABLED', 'true').lower() == 'true'
+CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '256'))
+CACHE_MAX_BYTES = int(os.getenv('CACHE_MAX_BYTES', str(32 * 1024 * 1024)))
+CACHE_TTL_SECONDS = float(os.getenv('CACHE_TTL_SECONDS', '60'))
+
+# Count Configuration
+COUNT_MODE = os.getenv('COUNT_MODE', 'capped')  # exact, capped or none
+COUNT_LIMIT = int(os.getenv('COUNT_LIMIT', '10000'))
+COUNT_CACHE_TTL_SECONDS = float(os.getenv('COUNT_CACHE_TTL_SECONDS', '30'))
+COUNT_CACHE_MAX_ENTRIES = int(os.getenv('COUNT_CACHE_MAX_ENTRIES', '1024'))
+
+# Aggregation Configuration
+AGGREGATE_MAX_TIME_MS = int(os.getenv('AGGREGATE_MAX_TIME_MS', '30000'))  # default and upper bound
+AGGREGATE_ALLOW_DISK_USE = os.getenv('AGGREGATE_ALLOW_DISK_USE', 'false').lower() == 'true'  # default and upper bound
+
+# Query Plan Configuration
+COLLSCAN_MODE = os.getenv('COLLSCAN_MODE', 'off')  # off, warn or reject
+COLLSCAN_MIN_DOCUMENTS = int(os.getenv('COLLSCAN_MIN_DOCUMENTS', '100000'))
+PLAN_CACHE_TTL_SECONDS = float(os.getenv('PLAN_CACHE_TTL_SECONDS', '300'))
+
+# Request Deadline Configuration
+TOOL_TIMEOUT_MS = int(os.getenv('TOOL_TIMEOUT_MS', '30000'))  # per tool call, 0 disables
+
+# Cost Guard Configuration
+QUERY_MAX_TIME_MS = int(os.getenv('QUERY_MAX_TIME_MS', '10000'))  # forced on every find (0 disables)
+COST_GUARD_ENABLED = os.getenv('COST_GUARD_ENABLED', 'true').lower() == 'true'
+GUARD_SORT_MAX_DOCUMENTS = int(os.getenv('GUARD_SORT_MAX_DOCUMENTS', '100000'))
+GUARD_STATS_TTL_SECONDS = float(os.getenv('GUARD_STATS_TTL_SECONDS', '60'))
+
+# Index Advisor Configuration
+ADVISOR_MAX_SHAPES = int(os.getenv('ADVISOR_MAX_SHAPES', '1000'))
+
+# Cursor Session Configuration
+CURSOR_MAX_PER_SESSION = int(os.getenv('CURSOR_MAX_PER_SESSION', '8'))
+CURSOR_MAX_BYTES = int(os.getenv('CURSOR_MAX_BYTES', str(64 * 1024 * 1024)))
+CURSOR_IDLE_TIMEOUT_SECONDS = float(os.getenv('CURSOR_IDLE_TIMEOUT_SECONDS', '300'))
+CURSOR_REAP_INTERVAL_SECONDS = float(os.getenv('CURSOR_REAP_INTERVAL_SECONDS', '30'))
+
+# Change Stream Configuration
+CHANGE_STREAMS_ENABLED = os.getenv('CHANGE_STREAMS_ENABLED', 'true').lower() == 'true'
+CHANGE_STREAM_CACHE_TTL_SECONDS = float(os.getenv('CHANGE_STREAM_CACHE_TTL_SECONDS', '600'))
+CHANGE_STREAM_MAX_BACKOFF_SECONDS = float(os.getenv('CHANGE_STREAM_MAX_BACKOFF_SECONDS', '30'))
+RESUME_TOKEN_PATH = os.getenv(
+    'RESUME_TOKEN_PATH',
+    os.path.join(os.path.expanduser('~'), '.mongo_mcp_server', 'resume_tokens.json')
+)
+RESUME_TOKEN_FLUSH_SECONDS = float(os.getenv('RESUME_TOKEN_FLUSH_SECONDS', '1'))
+SUBSCRIPTION_DEBOUNCE_SECONDS = float(os.getenv('SUBSCRIPTION_DEBOUNCE_SECONDS', '0.5'))
 
 # Server Configuration
 HOST = os.getenv('HOST', '0.0.0.0')
 PORT = int(os.getenv('PORT', '8000'))
+MCP_TRANSPORT = os.getenv('MCP_TRANSPORT', 'stdio')  # stdio, http or daemon
+HTTP_WORKERS = int(os.getenv('HTTP_WORKERS', '1'))
+HTTP_KEEP_ALIVE_SECONDS = int(os.getenv('HTTP_KEEP_ALIVE_SECONDS', '75'))
+HTTP_STATELESS = os.getenv('HTTP_STATELESS', 'false').lower() == 'true'  # needed for more than one worker
+
+# Daemon Configuration
+DAEMON_SOCKET_PATH = os.getenv(
+    'DAEMON_SOCKET_PATH',
+    os.path.join(os.path.expanduser('~'), '.mongo_mcp_server', 'daemon.sock')
+)
+DAEMON_AUTOSTART = os.getenv('DAEMON_AUTOSTART', 'true').lower() == 'true'  # shim starts a missing daemon
+DAEMON_START_TIMEOUT_SECONDS = float(os.getenv('DAEMON_START_TIMEOUT_SECONDS', '10'))
+DAEMON_MAX_MESSAGE_BYTES = int(os.getenv('DAEMON_MAX_MESSAGE_BYTES', str(16 * 1024 * 1024)))
 
 # Logging Configuration
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
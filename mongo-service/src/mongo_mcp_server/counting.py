@@ -0,0 +1,153 @@
+"""
+Count strategies for query results.
+
+An exact count_documents is a full scan of every matching document, which on
+large collections costs more than the page of results itself. CountStrategy
+picks a cheaper way to report a total:
+
+- empty filters use estimated_document_count (collection metadata, no scan);
+- 'capped' mode stops counting at COUNT_LIMIT and reports "10,000+";
+- 'none' mode skips the count entirely;
+- results are cached per filter shape for a short TTL.
+
+Callers run the count concurrently with the find, and can also skip it per call.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional
+import logging
+import time
+from pymongo.asynchronous.collection import AsyncCollection
+from . import config
+from .cache import make_cache_key
+from .deadlines import max_time_ms
+
+logger = logging.getLogger(__name__)
+
+COUNT_MODES = ('exact', 'capped', 'none')
+
+class CountResult(NamedTuple):
+    """A document count and how it was obtained."""
+    value: int
+    kind: str  # 'exact', 'estimated' or 'capped'
+
+    def display(self) -> str:
+        """Human-readable count, e.g. '42', '~1,200,000' or '10,000+'."""
+        if self.kind == 'capped':
+            return f"{self.value:,}+"
+        if self.kind == 'estimated':
+            return f"~{self.value:,}"
+        return str(self.value)
+
+class CountStrategy:
+    def __init__(
+        self,
+        mode: str = config.COUNT_MODE,
+        limit: int = config.COUNT_LIMIT,
+        cache_ttl: float = config.COUNT_CACHE_TTL_SECONDS,
+        max_entries: int = config.COUNT_CACHE_MAX_ENTRIES
+    ):
+        """
+        Initialize the count strategy.
+
+        Args:
+            mode (str): 'exact', 'capped' or 'none'
+            limit (int): Cap for 'capped' mode
+            cache_ttl (float): Seconds a cached count stays valid (0 disables caching)
+            max_entries (int): Maximum number of cached counts
+        """
+        if mode not in COUNT_MODES:
+            raise ValueError(f"Unknown count mode: {mode} (expected one of {', '.join(COUNT_MODES)})")
+        self.mode = mode
+        self.limit = limit
+        self.cache_ttl = cache_ttl
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self.counts = {kind: 0 for kind in ('exact', 'estimated', 'capped', 'cached', 'skipped')}
+
+    async def count(
+        self,
+        collection: AsyncCollection,
+        query: Dict[str, Any]
+    ) -> Optional[CountResult]:
+        """
+        Count the documents matching a filter using the configured strategy.
+
+        Args:
+            collection (AsyncCollection): Collection to count in
+            query (Dict[str, Any]): MongoDB query filter
+
+        Returns:
+            Optional[CountResult]: The count, or None when counting is disabled
+        """
+        if self.mode == 'none':
+            self.counts['skipped'] += 1
+            return None
+
+        key = make_cache_key(collection.name, query)
+        cached = self._get_cached(key)
+        if cached is not None:
+            self.counts['cached'] += 1
+            return cached
+
+        # An invalidation while the count runs makes its result unsafe to cache
+        generation = self._generations.get(collection.name, 0)
+        kwargs = {}
+        time_limit = max_time_ms()
+        if time_limit:
+            kwargs['maxTimeMS'] = time_limit
+        if not query:
+            result = CountResult(await collection.estimated_document_count(**kwargs), 'estimated')
+        elif self.mode == 'capped':
+            # Count one past the cap to tell "exactly the cap" from "more than the cap"
+            value = await collection.count_documents(query, limit=self.limit + 1, **kwargs)
+            if value > self.limit:
+                result = CountResult(self.limit, 'capped')
+            else:
+                result = CountResult(value, 'exact')
+        else:
+            result = CountResult(await collection.count_documents(query, **kwargs), 'exact')
+
+        self.counts[result.kind] += 1
+        if generation == self._generations.get(collection.name, 0):
+            self._set_cached(key, result, collection.name)
+        return result
+
+    def skip(self) -> None:
+        """Record a count the caller chose not to run."""
+        self.counts['skipped'] += 1
+
+    def invalidate_collection(self, collection_name: str) -> None:
+        """Drop cached counts for a collection."""
+        self._generations[collection_name] = self._generations.get(collection_name, 0) + 1
+        for key in [k for k, (_, _, name) in self._cache.items() if name == collection_name]:
+            del self._cache[key]
+
+    def _get_cached(self, key: str) -> Optional[CountResult]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        result, expires_at, _ = entry
+        if expires_at <= time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return result
+
+    def _set_cached(self, key: str, result: CountResult, collection_name: str) -> None:
+        if self.cache_ttl <= 0 or self.max_entries <= 0:
+            return
+        self._cache[key] = (result, time.monotonic() + self.cache_ttl, collection_name)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the strategy settings and how many counts of each kind ran."""
+        return {
+            "mode": self.mode,
+            "limit": self.limit,
+            "cached_counts": len(self._cache),
+            **self.counts
+        }
@@ -0,0 +1,289 @@
+"""
+Registry of open server-side cursors.
+
+A query can keep its driver cursor open under an opaque handle, so the next
+page is a getMore on the existing cursor rather than a new find that plans
+the query and skips past earlier results again. Open cursors hold server
+resources, so the registry caps them per session and by estimated memory,
+closes a session's cursors when the session ends, and runs a background
+reaper that closes cursors that have been idle too long.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import secrets
+import time
+from . import config
+from .deadlines import shielded_close
+from .executor import MongoExecutor
+from .formatting import FormattedResults, StreamingFormatter
+
+logger = logging.getLogger(__name__)
+
+class CursorHandleError(LookupError):
+    """Raised when a cursor handle is unknown, expired or owned by another session."""
+
+class HeldCursor:
+    """
+    An open driver cursor plus the documents already read from it but not yet returned.
+
+    Exposes the to_list/close subset of the cursor API so it can be passed
+    straight to StreamingFormatter.format_cursor.
+    """
+
+    def __init__(self, cursor, collection_name: str, session_key: str):
+        self.cursor = cursor
+        self.collection_name = collection_name
+        self.session_key = session_key
+        self.pending: List[Any] = []
+        self.size = 0
+        self.last_used = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    @property
+    def alive(self) -> bool:
+        """Whether more documents may be available."""
+        return bool(self.pending) or self.cursor.alive
+
+    async def to_list(self, length: int) -> List[Any]:
+        documents = self.pending[:length]
+        del self.pending[:length]
+        if len(documents) < length and self.cursor.alive:
+            documents.extend(await self.cursor.to_list(length - len(documents)))
+        return documents
+
+    async def close(self) -> None:
+        await self.cursor.close()
+
+class CursorRegistry:
+    def __init__(
+        self,
+        executor: MongoExecutor,
+        max_per_session: int = config.CURSOR_MAX_PER_SESSION,
+        max_bytes: int = config.CURSOR_MAX_BYTES,
+        idle_timeout: float = config.CURSOR_IDLE_TIMEOUT_SECONDS,
+        reap_interval: float = config.CURSOR_REAP_INTERVAL_SECONDS
+    ):
+        """
+        Initialize the cursor registry.
+
+        Args:
+            executor (MongoExecutor): Executor used to serialize fetched batches
+            max_per_session (int): Open cursors allowed per client session
+            max_bytes (int): Estimated memory all open cursors may hold
+            idle_timeout (float): Seconds after which an unused cursor is closed
+            reap_interval (float): Seconds between idle cursor sweeps
+        """
+        self.executor = executor
+        self.formatter = StreamingFormatter(executor)
+        self.max_per_session = max_per_session
+        self.max_bytes = max_bytes
+        self.idle_timeout = idle_timeout
+        self.reap_interval = reap_interval
+        self._cursors: Dict[str, HeldCursor] = {}
+        self._reaper: Optional[asyncio.Task] = None
+        self.opened = 0
+        self.fetches = 0
+        self.exhausted = 0
+        self.reaped = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._cursors)
+
+    @property
+    def bytes(self) -> int:
+        return sum(held.size for held in self._cursors.values())
+
+    def start(self) -> None:
+        """Start the idle cursor reaper."""
+        if self._reaper is None:
+            self._reaper = asyncio.create_task(self._reap_loop(), name="cursor-reaper")
+
+    async def stop(self) -> None:
+        """Stop the reaper and close every open cursor."""
+        if self._reaper is not None:
+            self._reaper.cancel()
+            await asyncio.gather(self._reaper, return_exceptions=True)
+            self._reaper = None
+        for handle in list(self._cursors):
+            await self._close(handle)
+
+    async def register(
+        self,
+        cursor,
+        collection_name: str,
+        session_key: str,
+        results: FormattedResults
+    ) -> Optional[str]:
+        """
+        Keep a partially read cursor open and return its handle.
+
+        Args:
+            cursor: Async driver cursor the first page was read from
+            collection_name (str): Collection the cursor reads
+            session_key (str): Identity of the client session that owns it
+            results (FormattedResults): First page, read with keep_open=True
+
+        Returns:
+            Optional[str]: Handle for fetching more, or None if the cursor is
+                exhausted or alone exceeds the memory cap (it is then closed)
+        """
+        held = HeldCursor(cursor, collection_name, session_key)
+        held.pending = list(results.pending)
+        if not held.alive:
+            await shielded_close(held)
+            return None
+        held.size = self._estimate_size(held, results)
+        if held.size > self.max_bytes:
+            logger.info(f"Not keeping cursor on '{collection_name}': {held.size} bytes exceeds the cap")
+            await shielded_close(held)
+            return None
+
+        # Make room: oldest cursor of the same session first, then oldest overall
+        owned = self._by_age(session_key)
+        while len(owned) >= self.max_per_session > 0:
+            await self._close(owned.pop(0)[0])
+            self.evicted += 1
+        while self._cursors and self.bytes + held.size > self.max_bytes:
+            await self._close(self._by_age()[0][0])
+            self.evicted += 1
+
+        handle = secrets.token_urlsafe(12)
+        self._cursors[handle] = held
+        self.opened += 1
+        return handle
+
+    async def fetch(
+        self,
+        handle: str,
+        session_key: str,
+        max_documents: int
+    ) -> Tuple[FormattedResults, bool]:
+        """
+        Read the next batch from a registered cursor.
+
+        Args:
+            handle (str): Handle returned by register
+            session_key (str): Identity of the calling session
+            max_documents (int): Maximum number of documents to return
+
+        Returns:
+            Tuple[FormattedResults, bool]: The batch and whether the cursor stays open
+
+        Raises:
+            CursorHandleError: If the handle is unknown, expired or owned by another session
+        """
+        held = self._cursors.get(handle)
+        if held is None or held.session_key != session_key:
+            raise CursorHandleError(f"Cursor {handle} not found or expired; run the query again")
+
+        async with held.lock:
+            if handle not in self._cursors:
+                raise CursorHandleError(f"Cursor {handle} was closed; run the query again")
+            try:
+                async with self.executor.limit(held.collection_name):
+                    results = await self.formatter.format_cursor(
+                        held, max_documents=max_documents, keep_open=True
+                    )
+            except BaseException:
+                await self._close(handle)
+                raise
+            self.fetches += 1
+            held.pending = list(results.pending) + held.pending
+            held.last_used = time.monotonic()
+            if not held.alive:
+                await self._close(handle)
+                self.exhausted += 1
+                return results, False
+            held.size = self._estimate_size(held, results)
+            return results, True
+
+    async def close(self, handle: str, session_key: str) -> bool:
+        """
+        Close a cursor before it is exhausted.
+
+        Args:
+            handle (str): Handle returned by register
+            session_key (str): Identity of the calling session
+
+        Returns:
+            bool: True if a cursor was closed
+        """
+        held = self._cursors.get(handle)
+        if held is None or held.session_key != session_key:
+            return False
+        await self._close(handle)
+        return True
+
+    async def close_session(self, session_key: str) -> int:
+        """
+        Close every cursor owned by a session that has ended.
+
+        Args:
+            session_key (str): Identity of the session
+
+        Returns:
+            int: Number of cursors closed
+        """
+        owned = [handle for handle, held in self._cursors.items() if held.session_key == session_key]
+        for handle in owned:
+            await self._close(handle)
+        return len(owned)
+
+    def _estimate_size(self, held: HeldCursor, results: FormattedResults) -> int:
+        """Estimate memory held: one driver batch plus pending documents, at the page's average size."""
+        average = len(results.text) // max(results.count, 1)
+        return average * (len(held.pending) + self.formatter.batch_size)
+
+    def _by_age(self, session_key: Optional[str] = None) -> List[Tuple[str, HeldCursor]]:
+        cursors = [
+            (handle, held) for handle, held in self._cursors.items()
+            if session_key is None or held.session_key == session_key
+        ]
+        return sorted(cursors, key=lambda item: item[1].last_used)
+
+    async def _close(self, handle: str) -> None:
+        held = self._cursors.pop(handle, None)
+        if held is not None:
+            await shielded_close(held)
+
+    async def _reap_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.reap_interval)
+            await self.reap_idle()
+
+    async def reap_idle(self) -> int:
+        """
+        Close cursors that have not been used within the idle timeout.
+
+        Returns:
+            int: Number of cursors closed
+        """
+        cutoff = time.monotonic() - self.idle_timeout
+        idle = [
+            handle for handle, held in self._cursors.items()
+            if held.last_used < cutoff and not held.lock.locked()
+        ]
+        for handle in idle:
+            await self._close(handle)
+        if idle:
+            self.reaped += len(idle)
+            logger.info(f"Closed {len(idle)} idle cursor(s)")
+        return len(idle)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return open cursor counts, estimated memory and lifecycle counters."""
+        return {
+            "open": len(self._cursors),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "max_per_session": self.max_per_session,
+            "idle_timeout_seconds": self.idle_timeout,
+            "opened": self.opened,
+            "fetches": self.fetches,
+            "exhausted": self.exhausted,
+            "reaped": self.reaped,
+            "evicted": self.evicted
+        }
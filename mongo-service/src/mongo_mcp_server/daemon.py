@@ -0,0 +1,139 @@
+"""
+Shared daemon mode over a Unix domain socket.
+
+One long-lived server process listens on DAEMON_SOCKET_PATH. Each
+connection is its own MCP session, using the stdio framing (one JSON-RPC
+message per line). All sessions share the process's MongoDB pool, caches
+and cursor registry. Desktop clients reach the daemon through the stdio
+shim (shim.py) instead of each starting their own server.
+"""
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Tuple
+import asyncio
+import logging
+import os
+import anyio
+import anyio.abc
+from anyio.streams.buffered import BufferedByteReceiveStream
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+import mcp.types as types
+from mcp.shared.message import SessionMessage
+from . import config
+from .server import MongoMCPServer
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def socket_transport(
+    stream: anyio.abc.ByteStream,
+    max_message_bytes: int = config.DAEMON_MAX_MESSAGE_BYTES
+) -> AsyncIterator[Tuple[MemoryObjectReceiveStream, MemoryObjectSendStream]]:
+    """
+    Exchange newline-delimited JSON-RPC messages over a byte stream.
+
+    Args:
+        stream (anyio.abc.ByteStream): Connected client socket
+        max_message_bytes (int): Longest accepted message line
+
+    Yields:
+        Tuple[MemoryObjectReceiveStream, MemoryObjectSendStream]: Streams for Server.run
+    """
+    read_stream_writer, read_stream = anyio.create_memory_object_stream(0)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream(0)
+    buffered = BufferedByteReceiveStream(stream)
+
+    async def socket_reader():
+        async with read_stream_writer:
+            while True:
+                try:
+                    line = await buffered.receive_until(b"\n", max_message_bytes)
+                except (anyio.EndOfStream, anyio.IncompleteRead, anyio.BrokenResourceError):
+                    return  # Client went away
+                except anyio.DelimiterNotFound:
+                    # The rest of the line is still unread, so the stream cannot be
+                    # resynchronized: reject the message and end the session
+                    logger.warning(f"Closing daemon session: message exceeds {max_message_bytes} bytes")
+                    await read_stream_writer.send(
+                        ValueError(f"Message exceeds the {max_message_bytes}-byte limit")
+                    )
+                    return
+                if not line.strip():
+                    continue
+                try:
+                    message = types.JSONRPCMessage.model_validate_json(line)
+                except Exception as exc:
+                    await read_stream_writer.send(exc)
+                    continue
+                await read_stream_writer.send(SessionMessage(message))
+
+    async def socket_writer():
+        async with write_stream_reader:
+            async for session_message in write_stream_reader:
+                payload = session_message.message.model_dump_json(by_alias=True, exclude_none=True)
+                try:
+                    await stream.send(payload.encode('utf-8') + b"\n")
+                except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+                    return
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(socket_reader)
+        tg.start_soon(socket_writer)
+        try:
+            yield read_stream, write_stream
+        finally:
+            tg.cancel_scope.cancel()
+
+async def _socket_in_use(path: str) -> bool:
+    """Whether another daemon is accepting connections on the socket path."""
+    try:
+        _, writer = await asyncio.open_unix_connection(path)
+    except OSError:
+        return False
+    writer.close()
+    return True
+
+async def serve_daemon(server: Optional[MongoMCPServer] = None, path: str = config.DAEMON_SOCKET_PATH) -> None:
+    """
+    Serve MCP sessions on a Unix domain socket until cancelled.
+
+    Args:
+        server (MongoMCPServer, optional): Server to expose; a new one is created if omitted
+        path (str): Socket path
+    """
+    server = server or MongoMCPServer()
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    if os.path.exists(path):
+        if await _socket_in_use(path):
+            logger.info(f"A daemon is already listening on {path}")
+            return
+        os.unlink(path)  # Left behind by a daemon that did not shut down cleanly
+
+    async def handle(stream: anyio.abc.SocketStream) -> None:
+        async with stream:
+            try:
+                async with socket_transport(stream) as (read_stream, write_stream):
+                    await server.mcp_server.run(read_stream, write_stream, server.initialization_options())
+            except Exception as e:
+                logger.error(f"Error in daemon session: {e}")
+
+    # Only this user's clients may connect: the socket is created with mode
+    # 0600 instead of being chmod-ed after it is already reachable
+    previous_umask = os.umask(0o177)
+    try:
+        listener = await anyio.create_unix_listener(path)
+    finally:
+        os.umask(previous_umask)
+    logger.info(f"MCP daemon listening on {path}")
+    try:
+        await server.start()
+        async with listener:
+            await listener.serve(handle)
+    finally:
+        await server.shutdown()
+        if os.path.exists(path):
+            os.unlink(path)
+
+def run_daemon() -> None:
+    """Run the daemon when started with MCP_TRANSPORT=daemon."""
+    asyncio.run(serve_daemon())
@@ -0,0 +1,66 @@
+"""
+Per-request deadlines and cancellation-safe cleanup.
+
+Each tool call runs under a deadline held in a context variable, so every
+MongoDB operation started on its behalf (directly or in a task it spawns)
+can pass the remaining time down as maxTimeMS. When a request is cancelled
+or times out, cursors are closed inside a shielded scope so the killCursors
+round trip still happens and the server releases the cursor immediately.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+import logging
+import time
+import anyio
+
+logger = logging.getLogger(__name__)
+
+_deadline: ContextVar[Optional[float]] = ContextVar('deadline', default=None)
+
+@contextmanager
+def deadline(timeout_ms: int) -> Iterator[None]:
+    """
+    Run the enclosed block under a deadline (0 or less means none).
+
+    Args:
+        timeout_ms (int): Time budget in milliseconds
+    """
+    if timeout_ms <= 0:
+        yield
+        return
+    token = _deadline.set(time.monotonic() + timeout_ms / 1000)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def max_time_ms(limit_ms: int = 0) -> Optional[int]:
+    """
+    maxTimeMS for an operation: the configured limit capped by the current deadline.
+
+    Args:
+        limit_ms (int): Configured limit in milliseconds (0 for none)
+
+    Returns:
+        Optional[int]: Milliseconds to pass as maxTimeMS, or None for no limit
+    """
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return limit_ms or None
+    remaining = max(1, int((expires_at - time.monotonic()) * 1000))
+    return min(limit_ms, remaining) if limit_ms else remaining
+
+async def shielded_close(cursor) -> None:
+    """
+    Close a cursor even while the calling task is being cancelled.
+
+    Args:
+        cursor: Async cursor (or anything with an async close())
+    """
+    with anyio.CancelScope(shield=True):
+        try:
+            await cursor.close()
+        except Exception as e:
+            logger.warning(f"Error closing cursor: {e}")
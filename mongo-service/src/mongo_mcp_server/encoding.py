@@ -0,0 +1,136 @@
+"""
+JSON encoding helpers for MongoDB documents.
+
+Two backends are available: orjson (optional dependency, much faster) and the
+standard library json module. Both share the same conversion rules for BSON
+types and write non-ASCII text as UTF-8, so their output is identical.
+"""
+
+from base64 import b64encode
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Mapping
+from uuid import UUID
+import json
+import logging
+from bson import Binary, Decimal128, Int64, ObjectId
+from bson.binary import UUID_SUBTYPE
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from . import config
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Codec options for raw mode: documents stay as undecoded BSON bytes until a
+# field is read, and nested documents stay raw until the encoder reaches them
+RAW_CODEC_OPTIONS = CodecOptions(document_class=RawBSONDocument)
+
+def convert_bson(obj: Any) -> Any:
+    """
+    Convert a BSON or Python value that JSON cannot represent natively.
+
+    Args:
+        obj (Any): Value the JSON backend could not serialize
+
+    Returns:
+        Any: A JSON-compatible replacement
+
+    Raises:
+        TypeError: If the value has no known conversion
+    """
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, datetime) or isinstance(obj, date):
+        return obj.isoformat()
+    if isinstance(obj, (Decimal128, Decimal)):
+        return str(obj)
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, Binary):
+        if obj.subtype == UUID_SUBTYPE:
+            return str(obj.as_uuid())
+        return b64encode(obj).decode('ascii')
+    if isinstance(obj, bytes):
+        return b64encode(obj).decode('ascii')
+    if isinstance(obj, Int64):
+        return int(obj)
+    if isinstance(obj, RawBSONDocument):
+        # Decodes this level only; nested documents are converted on demand
+        return dict(obj.items())
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class MongoJSONEncoder(json.JSONEncoder):
+    """Custom JSON encoder for MongoDB documents."""
+    def default(self, obj):
+        try:
+            return convert_bson(obj)
+        except TypeError:
+            return super().default(obj)
+
+class DocumentEncoder:
+    def __init__(self, backend: str = config.JSON_ENCODER, compact: bool = config.JSON_COMPACT):
+        """
+        Initialize the document encoder.
+
+        Args:
+            backend (str): 'orjson', 'json' or 'auto' (orjson when installed)
+            compact (bool): Emit compact JSON instead of 2-space indentation
+        """
+        if backend == 'auto':
+            backend = 'orjson' if orjson is not None else 'json'
+        elif backend == 'orjson' and orjson is None:
+            logger.warning("orjson is not installed; falling back to the json encoder")
+            backend = 'json'
+        elif backend not in ('orjson', 'json'):
+            raise ValueError(f"Unknown JSON encoder backend: {backend}")
+
+        self.backend = backend
+        self.compact = compact
+        if backend == 'orjson':
+            self._options = orjson.OPT_NON_STR_KEYS
+            if not compact:
+                self._options |= orjson.OPT_INDENT_2
+        else:
+            # Non-ASCII text is written as UTF-8, not \u escapes, as orjson does
+            self._encoder = MongoJSONEncoder(
+                ensure_ascii=False,
+                indent=None if compact else 2,
+                separators=(',', ':') if compact else None
+            )
+
+    def encode(self, doc: Any) -> str:
+        """
+        Serialize a document to JSON.
+
+        Args:
+            doc (Any): Document or value to serialize
+
+        Returns:
+            str: JSON text
+        """
+        if self.backend == 'orjson':
+            return self.encode_bytes(doc).decode('utf-8')
+        return self._encoder.encode(doc)
+
+    def encode_bytes(self, doc: Any) -> bytes:
+        """
+        Serialize a document to UTF-8 encoded JSON.
+
+        orjson produces bytes natively, so this skips its decode step.
+
+        Args:
+            doc (Any): Document or value to serialize
+
+        Returns:
+            bytes: JSON text encoded as UTF-8
+        """
+        if self.backend == 'orjson':
+            return orjson.dumps(doc, default=convert_bson, option=self._options)
+        return self._encoder.encode(doc).encode('utf-8')
@@ -0,0 +1,142 @@
+"""
+Bounded executor for MongoDB work.
+
+Blocking or CPU-heavy work (decoding and formatting large result pages) runs
+on a bounded thread pool so the event loop stays free to serve the stdio
+transport. Every collection also gets its own semaphore so one heavy
+collection cannot occupy all of the capacity.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict
+import asyncio
+import functools
+import logging
+import threading
+import time
+from . import config
+
+logger = logging.getLogger(__name__)
+
+class MongoExecutor:
+    def __init__(
+        self,
+        max_workers: int = config.EXECUTOR_MAX_WORKERS,
+        collection_concurrency: int = config.COLLECTION_MAX_CONCURRENCY
+    ):
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers (int): Maximum number of worker threads
+            collection_concurrency (int): Maximum concurrent operations per collection
+        """
+        self.max_workers = max_workers
+        self.collection_concurrency = collection_concurrency
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="mongo-worker"
+        )
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._waiting: Dict[str, int] = {}
+        self._running: Dict[str, int] = {}
+        self._pending_jobs = 0
+        self._active_workers = 0
+        self._completed_jobs = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._acquisitions = 0
+
+    def _semaphore(self, collection_name: str) -> asyncio.Semaphore:
+        """Get or create the semaphore for a collection."""
+        semaphore = self._semaphores.get(collection_name)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.collection_concurrency)
+            self._semaphores[collection_name] = semaphore
+        return semaphore
+
+    @asynccontextmanager
+    async def limit(self, collection_name: str) -> AsyncIterator[None]:
+        """
+        Hold one of the collection's concurrency slots for the duration of the block.
+
+        Args:
+            collection_name (str): Name of the MongoDB collection
+        """
+        semaphore = self._semaphore(collection_name)
+        self._waiting[collection_name] = self._waiting.get(collection_name, 0) + 1
+        started = time.perf_counter()
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting[collection_name] -= 1
+
+        waited = time.perf_counter() - started
+        self._acquisitions += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+        if waited > 1.0:
+            logger.warning(f"Waited {waited:.2f}s for a concurrency slot on '{collection_name}'")
+
+        self._running[collection_name] = self._running.get(collection_name, 0) + 1
+        try:
+            yield
+        finally:
+            self._running[collection_name] -= 1
+            semaphore.release()
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a blocking callable on the worker pool.
+
+        Args:
+            func (Callable): Blocking function to run
+            *args: Positional arguments for the function
+            **kwargs: Keyword arguments for the function
+
+        Returns:
+            Any: The function's return value
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._pending_jobs += 1
+        return await loop.run_in_executor(
+            self._pool, functools.partial(self._run_job, func, *args, **kwargs)
+        )
+
+    def _run_job(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a job on a worker thread while tracking pool occupancy."""
+        with self._lock:
+            self._pending_jobs -= 1
+            self._active_workers += 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._active_workers -= 1
+                self._completed_jobs += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, worker and wait-time statistics."""
+        return {
+            "max_workers": self.max_workers,
+            "active_workers": self._active_workers,
+            "queued_jobs": self._pending_jobs,
+            "completed_jobs": self._completed_jobs,
+            "collection_concurrency": self.collection_concurrency,
+            "collections": {
+                name: {
+                    "running": self._running.get(name, 0),
+                    "waiting": self._waiting.get(name, 0)
+                }
+                for name in self._semaphores
+            },
+            "avg_wait_ms": round(self._total_wait / self._acquisitions * 1000, 3) if self._acquisitions else 0.0,
+            "max_wait_ms": round(self._max_wait * 1000, 3)
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker pool."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,220 @@
+"""
+Query plan inspection.
+
+Runs MongoDB's explain for find commands, reduces the output to the few
+numbers that matter (winning plan, index, keys vs documents examined, time)
+and optionally guards the query path against full collection scans on large
+collections.
+"""
+
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+import logging
+import time
+from pymongo.asynchronous.collection import AsyncCollection
+from . import config
+from .deadlines import max_time_ms
+from .pagination import FindSpec
+
+logger = logging.getLogger(__name__)
+
+COLLSCAN_MODES = ('off', 'warn', 'reject')
+PLAN_CACHE_MAX_ENTRIES = 1024
+
+class CollectionScanRejected(ValueError):
+    """Raised when a query would scan a large collection without an index."""
+
+class PlanSummary(NamedTuple):
+    """Compact view of an explain result."""
+    stages: List[str]
+    index_names: List[str]
+    keys_examined: Optional[int] = None
+    docs_examined: Optional[int] = None
+    returned: Optional[int] = None
+    time_ms: Optional[int] = None
+
+    @property
+    def is_collscan(self) -> bool:
+        return 'COLLSCAN' in self.stages
+
+    @property
+    def in_memory_sort(self) -> bool:
+        return 'SORT' in self.stages
+
+    def describe(self) -> str:
+        """Human-readable summary, one fact per line."""
+        lines = [
+            f"Winning plan: {' <- '.join(self.stages) or 'unknown'}",
+            f"Index used: {', '.join(self.index_names) or 'none'}"
+        ]
+        if self.docs_examined is not None:
+            lines.append(
+                f"Keys examined: {self.keys_examined}, documents examined: {self.docs_examined}, "
+                f"returned: {self.returned}"
+            )
+            if self.returned:
+                lines.append(f"Documents examined per result: {self.docs_examined / self.returned:.1f}")
+        if self.time_ms is not None:
+            lines.append(f"Execution time: {self.time_ms} ms")
+        if self.in_memory_sort:
+            lines.append("Warning: blocking in-memory SORT stage (no index provides the sort order)")
+        if self.is_collscan:
+            lines.append("Warning: COLLSCAN reads every document in the collection")
+        return "\n".join(lines)
+
+def _walk_plan(plan: Mapping[str, Any]) -> Tuple[List[str], List[str]]:
+    """Flatten a plan tree into stage names (top first) and index names."""
+    stages: List[str] = []
+    indexes: List[str] = []
+    nodes = [plan]
+    while nodes:
+        node = nodes.pop(0)
+        if node.get('stage'):
+            stages.append(node['stage'])
+        if node.get('indexName'):
+            indexes.append(node['indexName'])
+        if isinstance(node.get('inputStage'), Mapping):
+            nodes.append(node['inputStage'])
+        nodes.extend(stage for stage in node.get('inputStages', []) if isinstance(stage, Mapping))
+    return stages, indexes
+
+def summarize_explain(explain: Mapping[str, Any]) -> PlanSummary:
+    """
+    Reduce an explain result to a PlanSummary.
+
+    Args:
+        explain (Mapping[str, Any]): Output of the explain command
+
+    Returns:
+        PlanSummary: Winning plan stages, indexes and execution statistics
+    """
+    winning = explain.get('queryPlanner', {}).get('winningPlan', {})
+    # The slot-based engine nests the classic plan tree under queryPlan
+    stages, indexes = _walk_plan(winning.get('queryPlan', winning))
+    stats = explain.get('executionStats')
+    if not stats:
+        return PlanSummary(stages, indexes)
+    return PlanSummary(
+        stages,
+        indexes,
+        keys_examined=stats.get('totalKeysExamined'),
+        docs_examined=stats.get('totalDocsExamined'),
+        returned=stats.get('nReturned'),
+        time_ms=stats.get('executionTimeMillis')
+    )
+
+async def explain_find(
+    collection: AsyncCollection,
+    spec: FindSpec,
+    verbosity: str = 'executionStats'
+) -> Dict[str, Any]:
+    """
+    Run explain for a find command.
+
+    Args:
+        collection (AsyncCollection): Collection the find runs on
+        spec (FindSpec): Find command as planned by plan_find
+        verbosity (str): 'queryPlanner' (plan only) or 'executionStats' (runs the query)
+
+    Returns:
+        Dict[str, Any]: Raw explain output
+    """
+    find: Dict[str, Any] = {"find": collection.name, "filter": spec.filter or {}}
+    if spec.projection:
+        find["projection"] = spec.projection
+    if spec.sort:
+        find["sort"] = spec.sort_document()
+    if spec.skip:
+        find["skip"] = spec.skip
+    if spec.limit:
+        find["limit"] = spec.limit
+    time_limit = max_time_ms(config.QUERY_MAX_TIME_MS)
+    if time_limit:
+        find["maxTimeMS"] = time_limit
+    return await collection.database.command({"explain": find, "verbosity": verbosity})
+
+class PlanGuard:
+    def __init__(
+        self,
+        mode: str = config.COLLSCAN_MODE,
+        min_documents: int = config.COLLSCAN_MIN_DOCUMENTS,
+        cache_ttl: float = config.PLAN_CACHE_TTL_SECONDS
+    ):
+        """
+        Initialize the collection scan guard.
+
+        Args:
+            mode (str): 'off', 'warn' (annotate results) or 'reject' (refuse the query)
+            min_documents (int): Collections smaller than this are never flagged
+            cache_ttl (float): Seconds a plan verdict and collection size are reused
+        """
+        if mode not in COLLSCAN_MODES:
+            raise ValueError(f"Unknown COLLSCAN mode: {mode} (expected one of {', '.join(COLLSCAN_MODES)})")
+        self.mode = mode
+        self.min_documents = min_documents
+        self.cache_ttl = cache_ttl
+        self._sizes: Dict[str, Tuple[int, float]] = {}
+        self._verdicts: Dict[str, Tuple[bool, float]] = {}
+        self.checked = 0
+        self.warned = 0
+        self.rejected = 0
+
+    async def check(self, collection: AsyncCollection, spec: FindSpec) -> Optional[str]:
+        """
+        Check whether a query would scan a large collection without an index.
+
+        Uses queryPlanner verbosity, which plans the query without running it.
+
+        Args:
+            collection (AsyncCollection): Collection the query runs on
+            spec (FindSpec): Find command the query sends
+
+        Returns:
+            Optional[str]: Warning to show with the results, or None
+
+        Raises:
+            CollectionScanRejected: In reject mode, if the plan is a COLLSCAN
+        """
+        if self.mode == 'off':
+            return None
+        now = time.monotonic()
+        size, expires_at = self._sizes.get(collection.name, (0, 0.0))
+        if expires_at <= now:
+            size = await collection.estimated_document_count()
+            self._sizes[collection.name] = (size, now + self.cache_ttl)
+        if size < self.min_documents:
+            return None
+
+        key = spec.cache_key(collection.name)
+        collscan, expires_at = self._verdicts.get(key, (False, 0.0))
+        if expires_at <= now:
+            self.checked += 1
+            plan = summarize_explain(
+                await explain_find(collection, spec, verbosity='queryPlanner')
+            )
+            collscan = plan.is_collscan
+            if len(self._verdicts) >= PLAN_CACHE_MAX_ENTRIES:
+                self._verdicts.clear()
+            self._verdicts[key] = (collscan, now + self.cache_ttl)
+        if not collscan:
+            return None
+
+        message = (
+            f"query scans all ~{size:,} documents of '{collection.name}' without an index; "
+            "filter on an indexed field"
+        )
+        if self.mode == 'reject':
+            self.rejected += 1
+            raise CollectionScanRejected(f"Rejected: {message}")
+        self.warned += 1
+        logger.warning(f"COLLSCAN: {message} (filter: {spec.query})")
+        return f"Warning: {message}."
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the guard settings and how many plans were checked, warned or rejected."""
+        return {
+            "mode": self.mode,
+            "min_documents": self.min_documents,
+            "plans_checked": self.checked,
+            "warned": self.warned,
+            "rejected": self.rejected
+        }
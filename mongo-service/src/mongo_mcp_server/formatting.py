@@ -0,0 +1,133 @@
+"""
+Streaming serialization of MongoDB cursors.
+
+Documents are pulled from the cursor one driver batch at a time and written
+into a single output buffer, so only one batch of decoded documents is alive
+at any moment. Output stops as soon as the configured byte budget is reached.
+"""
+
+from io import BytesIO
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+import logging
+from . import config
+from .deadlines import shielded_close
+from .encoding import DocumentEncoder
+from .executor import MongoExecutor
+
+logger = logging.getLogger(__name__)
+
+class FormattedResults(NamedTuple):
+    """Serialized documents plus bookkeeping about how they were produced."""
+    text: str
+    count: int
+    truncated: bool
+    last_document: Optional[Any] = None
+    # Documents read from a kept-open cursor but not written (byte budget reached)
+    pending: Tuple[Any, ...] = ()
+
+class StreamingFormatter:
+    def __init__(
+        self,
+        executor: MongoExecutor,
+        max_bytes: int = config.RESULT_MAX_BYTES,
+        batch_size: int = config.RESULT_BATCH_SIZE,
+        encoder: Optional[DocumentEncoder] = None
+    ):
+        """
+        Initialize the streaming formatter.
+
+        Args:
+            executor (MongoExecutor): Executor used to serialize batches off the event loop
+            max_bytes (int): Output budget in bytes; serialization stops once reached
+            batch_size (int): Number of documents requested per driver batch
+            encoder (DocumentEncoder, optional): Document encoder (default: configured backend)
+        """
+        self.executor = executor
+        self.max_bytes = max_bytes
+        self.batch_size = batch_size
+        self.encoder = encoder or DocumentEncoder()
+
+    def _write_batch(self, buffer: BytesIO, documents: List[Dict[str, Any]], count: int) -> int:
+        """
+        Write documents into the buffer until the byte budget is reached.
+
+        Args:
+            buffer (BytesIO): UTF-8 output buffer shared across batches
+            documents (List[Dict[str, Any]]): Decoded documents from one driver batch
+            count (int): Number of documents already written
+
+        Returns:
+            int: Number of documents written from this batch
+        """
+        written = 0
+        for doc in documents:
+            # Measured as encoded UTF-8, so non-ASCII text counts every byte
+            data = self.encoder.encode_bytes(doc)
+            size = len(data) + (1 if count + written else 0)
+            if count + written and buffer.tell() + size > self.max_bytes:
+                break
+            if count + written:
+                buffer.write(b"\n")
+            buffer.write(data)
+            written += 1
+        return written
+
+    async def format_cursor(
+        self,
+        cursor,
+        max_documents: Optional[int] = None,
+        keep_open: bool = False
+    ) -> FormattedResults:
+        """
+        Serialize a cursor's documents into one string within the byte budget.
+
+        The first document is always included, even when it alone exceeds the
+        budget, so callers never get an empty page for a non-empty result.
+
+        Args:
+            cursor: Async MongoDB cursor to drain
+            max_documents (int, optional): Stop after this many documents
+            keep_open (bool): Leave the cursor open for later batches; documents
+                read but not written are returned as pending instead of dropped
+
+        Returns:
+            FormattedResults: Serialized text, number of documents and truncation flag
+        """
+        buffer = BytesIO()
+        count = 0
+        truncated = False
+        last_document = None
+        pending: Tuple[Any, ...] = ()
+        if not keep_open:
+            cursor = cursor.batch_size(self.batch_size)
+        try:
+            while True:
+                size = self.batch_size
+                if max_documents is not None:
+                    size = min(size, max_documents - count)
+                    if size <= 0:
+                        break
+                documents = await cursor.to_list(size)
+                if not documents:
+                    break
+                written = await self.executor.run(self._write_batch, buffer, documents, count)
+                count += written
+                if written:
+                    last_document = documents[written - 1]
+                if written < len(documents) or buffer.tell() >= self.max_bytes:
+                    if keep_open:
+                        pending = tuple(documents[written:])
+                        truncated = bool(pending) or cursor.alive
+                    else:
+                        truncated = written < len(documents) or bool(await cursor.to_list(1))
+                    break
+                if len(documents) < size:
+                    break
+        finally:
+            if not keep_open:
+                # Also runs on cancellation, so the server-side cursor is killed right away
+                await shielded_close(cursor)
+
+        if truncated:
+            logger.info(f"Result output truncated at {buffer.tell()} bytes after {count} document(s)")
+        return FormattedResults(buffer.getvalue().decode('utf-8'), count, truncated, last_document, pending)
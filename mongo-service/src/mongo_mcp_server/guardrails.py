@@ -0,0 +1,165 @@
+"""
+Cost guardrails for the query path.
+
+Before a find runs, CostGuard estimates what it will cost from cheap
+metadata: collStats (document count and average object size), the
+collection's index definitions and, only when those are inconclusive, the
+query plan. It lowers the limit when the response would exceed the result
+budget and rejects sorts that no index serves on large collections when
+the filter is not narrowed by an index either, which would otherwise make
+MongoDB sort the whole collection in memory.
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+import logging
+import time
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.errors import PyMongoError
+from . import config
+from .advisor import make_shape
+from .explain import explain_find, summarize_explain
+from .pagination import FindSpec
+
+logger = logging.getLogger(__name__)
+
+SORT_VERDICT_MAX_ENTRIES = 1024
+
+class UnindexedSortRejected(ValueError):
+    """Raised when a query sorts a large collection on fields no index provides."""
+
+class CostEstimate(NamedTuple):
+    """Outcome of the guard: the limit to use and notes for the caller."""
+    limit: Optional[int]
+    notes: List[str]
+
+class CostGuard:
+    def __init__(
+        self,
+        max_response_bytes: int = config.RESULT_MAX_BYTES,
+        sort_max_documents: int = config.GUARD_SORT_MAX_DOCUMENTS,
+        stats_ttl: float = config.GUARD_STATS_TTL_SECONDS
+    ):
+        """
+        Initialize the cost guard.
+
+        Args:
+            max_response_bytes (int): Estimated response size above which the limit is lowered
+            sort_max_documents (int): Collections larger than this reject unindexed sorts
+            stats_ttl (float): Seconds collection statistics and index lists are reused
+        """
+        self.max_response_bytes = max_response_bytes
+        self.sort_max_documents = sort_max_documents
+        self.stats_ttl = stats_ttl
+        self._stats: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        self._indexes: Dict[str, Tuple[List[List[Tuple[str, Any]]], float]] = {}
+        self._sort_verdicts: Dict[str, bool] = {}
+        self.limits_lowered = 0
+        self.sorts_rejected = 0
+        self.plans_checked = 0
+
+    async def check(self, collection: AsyncCollection, spec: FindSpec) -> CostEstimate:
+        """
+        Estimate a find's cost and adjust or reject it.
+
+        Args:
+            collection (AsyncCollection): Collection the find runs on
+            spec (FindSpec): Find command as it will be sent (filter, sort and limit)
+
+        Returns:
+            CostEstimate: Limit to apply and notes to show with the results
+
+        Raises:
+            UnindexedSortRejected: If the sort needs an in-memory sort of a large collection
+                and no indexed equality field narrows the filter
+        """
+        limit = spec.limit or None
+        stats = await self._collection_stats(collection)
+        if stats is None:
+            return CostEstimate(limit, [])
+        count = int(stats.get('count') or 0)
+        avg_size = int(stats.get('avgObjSize') or 0)
+        notes: List[str] = []
+
+        if (
+            spec.sort
+            and count > self.sort_max_documents
+            and not await self._filter_narrowed(collection, spec)
+            and not await self._sort_indexed(collection, spec)
+        ):
+            self.sorts_rejected += 1
+            fields = [field for field, _ in spec.sort]
+            raise UnindexedSortRejected(
+                f"Rejected: sorting ~{count:,} documents on {fields} needs an in-memory sort "
+                "because no index provides that order; add an equality filter on an indexed "
+                "field or sort on an indexed field"
+            )
+
+        if avg_size:
+            expected = min(limit or count, count) * avg_size
+            if expected > self.max_response_bytes:
+                lowered = max(1, self.max_response_bytes // avg_size)
+                if not limit or lowered < limit:
+                    self.limits_lowered += 1
+                    notes.append(
+                        f"Limit lowered to {lowered} (documents average {avg_size:,} bytes; "
+                        f"the response budget is {self.max_response_bytes:,} bytes)."
+                    )
+                    limit = lowered
+        return CostEstimate(limit, notes)
+
+    async def _collection_stats(self, collection: AsyncCollection) -> Optional[Dict[str, Any]]:
+        stats, expires_at = self._stats.get(collection.name, ({}, 0.0))
+        if expires_at > time.monotonic():
+            return stats
+        try:
+            stats = await collection.database.command("collStats", collection.name)
+        except PyMongoError as e:
+            # Views and restricted users cannot run collStats; skip the guard
+            logger.debug(f"collStats unavailable for '{collection.name}': {e}")
+            return None
+        self._stats[collection.name] = (stats, time.monotonic() + self.stats_ttl)
+        return stats
+
+    async def _index_keys(self, collection: AsyncCollection) -> List[List[Tuple[str, Any]]]:
+        keys, expires_at = self._indexes.get(collection.name, ([], 0.0))
+        if expires_at > time.monotonic():
+            return keys
+        information = await collection.index_information()
+        keys = [list(index['key']) for index in information.values()]
+        self._indexes[collection.name] = (keys, time.monotonic() + self.stats_ttl)
+        return keys
+
+    async def _filter_narrowed(self, collection: AsyncCollection, spec: FindSpec) -> bool:
+        """Whether an index leads with an equality field of the filter, so only matches get sorted."""
+        equality = make_shape(collection.name, spec.filter).equality
+        if not equality:
+            return False
+        return any(key and key[0][0] in equality for key in await self._index_keys(collection))
+
+    async def _sort_indexed(self, collection: AsyncCollection, spec: FindSpec) -> bool:
+        """Whether an index provides the sort order, from index metadata first and the plan second."""
+        shape = make_shape(collection.name, spec.filter, spec.sort_document())
+        for key in await self._index_keys(collection):
+            if all(isinstance(direction, (int, float)) for _, direction in key) and shape.is_covered_by(key):
+                return True
+
+        verdict = self._sort_verdicts.get(shape.key)
+        if verdict is None:
+            # Index metadata is inconclusive (e.g. equality on some prefix fields); ask the planner
+            self.plans_checked += 1
+            plan = summarize_explain(await explain_find(collection, spec, verbosity='queryPlanner'))
+            verdict = not plan.in_memory_sort
+            if len(self._sort_verdicts) >= SORT_VERDICT_MAX_ENTRIES:
+                self._sort_verdicts.clear()
+            self._sort_verdicts[shape.key] = verdict
+        return verdict
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the guard settings and how often it intervened."""
+        return {
+            "max_response_bytes": self.max_response_bytes,
+            "sort_max_documents": self.sort_max_documents,
+            "limits_lowered": self.limits_lowered,
+            "sorts_rejected": self.sorts_rejected,
+            "plans_checked": self.plans_checked
+        }
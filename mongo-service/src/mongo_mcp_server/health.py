@@ -0,0 +1,198 @@
+"""
+MongoDB health monitoring and circuit breaker.
+
+A background task pings the deployment on an interval. After a few
+consecutive failed pings the circuit breaker opens: tool calls and
+resource reads then fail fast with a status message instead of each
+waiting out server selection. While the breaker is open, the monitor
+keeps probing with exponential backoff; the driver re-establishes its
+pool on its own once the deployment is reachable, so the first
+successful ping closes the breaker again.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Optional
+import asyncio
+import logging
+import time
+from . import config
+
+logger = logging.getLogger(__name__)
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+
+    def __init__(self, failure_threshold: int = config.HEALTH_FAILURE_THRESHOLD):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the breaker
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+        self.opened_at: Optional[float] = None
+        self.trips = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        """Whether a request may go to MongoDB (counts rejections while open)."""
+        if self.state == self.OPEN:
+            self.rejected += 1
+            return False
+        return True
+
+    def record_success(self) -> bool:
+        """
+        Record a successful health check.
+
+        Returns:
+            bool: True if this closed an open breaker
+        """
+        self.consecutive_failures = 0
+        self.last_error = None
+        if self.state == self.OPEN:
+            logger.info(f"MongoDB reachable again after {time.monotonic() - self.opened_at:.1f} s; circuit closed")
+            self.state = self.CLOSED
+            self.opened_at = None
+            return True
+        return False
+
+    def record_failure(self, error: str) -> bool:
+        """
+        Record a failed health check.
+
+        Args:
+            error (str): Description of the failure
+
+        Returns:
+            bool: True if this opened the breaker
+        """
+        self.consecutive_failures += 1
+        self.last_error = error
+        if self.state == self.CLOSED and self.consecutive_failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self.trips += 1
+            logger.error(
+                f"MongoDB unreachable after {self.consecutive_failures} failed health check(s); "
+                f"circuit open: {error}"
+            )
+            return True
+        return False
+
+    def describe(self) -> str:
+        """Status message returned to callers while the breaker is open."""
+        if self.state == self.CLOSED:
+            return "MongoDB is reachable"
+        return (
+            f"MongoDB unavailable for {time.monotonic() - self.opened_at:.1f} s "
+            f"({self.consecutive_failures} failed health checks, last error: {self.last_error}); "
+            "reconnecting in the background, try again shortly"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the breaker state and counters."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "open_seconds": round(time.monotonic() - self.opened_at, 1) if self.opened_at else 0,
+            "trips": self.trips,
+            "rejected": self.rejected,
+            "last_error": self.last_error
+        }
+
+class HealthMonitor:
+    def __init__(
+        self,
+        ping: Callable[[], Awaitable[Any]],
+        breaker: CircuitBreaker,
+        interval: float = config.HEALTH_CHECK_INTERVAL_SECONDS,
+        timeout: float = config.HEALTH_PING_TIMEOUT_SECONDS,
+        max_backoff: float = config.HEALTH_MAX_BACKOFF_SECONDS,
+        on_change: Optional[Callable[[bool], None]] = None
+    ):
+        """
+        Initialize the health monitor.
+
+        Args:
+            ping (Callable[[], Awaitable[Any]]): Health check, e.g. the ping command
+            breaker (CircuitBreaker): Breaker updated with every check
+            interval (float): Seconds between checks while healthy
+            timeout (float): Seconds before a check counts as failed
+            max_backoff (float): Longest wait between probes while unhealthy
+            on_change (Callable[[bool], None], optional): Called with the new health
+                when the breaker opens or closes
+        """
+        self.ping = ping
+        self.breaker = breaker
+        self.interval = interval
+        self.timeout = timeout
+        self.max_backoff = max_backoff
+        self.on_change = on_change
+        self.checks = 0
+        self.last_latency_ms: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def start(self) -> None:
+        """Start the background health checks."""
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run(), name="mongodb-health")
+
+    async def stop(self) -> None:
+        """Stop the background health checks."""
+        if self._task is not None:
+            # wait_for can swallow a cancellation that arrives as the ping
+            # completes, so the loop also checks this flag
+            self._stopping = True
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def check(self) -> bool:
+        """
+        Run one health check and update the breaker.
+
+        Returns:
+            bool: True if MongoDB answered in time
+        """
+        self.checks += 1
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.ping(), self.timeout)
+        except Exception as e:
+            error = str(e) or f"no reply within {self.timeout:g} s"
+            if self.breaker.record_failure(error) and self.on_change:
+                self.on_change(False)
+            return False
+        self.last_latency_ms = (time.perf_counter() - started) * 1000
+        if self.breaker.record_success() and self.on_change:
+            self.on_change(True)
+        return True
+
+    async def _run(self) -> None:
+        backoff = 0.5
+        while not self._stopping:
+            if self.breaker.state == CircuitBreaker.OPEN:
+                delay = backoff
+                backoff = min(backoff * 2, self.max_backoff)
+            elif self.breaker.consecutive_failures:
+                # Confirm a first failure quickly instead of a full interval later
+                delay = min(self.interval, 0.5)
+            else:
+                delay = self.interval
+                backoff = 0.5
+            await asyncio.sleep(delay)
+            await self.check()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return check counts, the last ping latency and the breaker state."""
+        return {
+            "checks": self.checks,
+            "last_ping_ms": round(self.last_latency_ms, 2) if self.last_latency_ms is not None else None,
+            "breaker": self.breaker.stats()
+        }
@@ -0,0 +1,112 @@
+"""
+HTTP transport for the MCP server, served by uvicorn.
+
+One long-lived process serves many MCP sessions over the same MongoDB
+connection pool, caches and cursor registry:
+
+- Streamable HTTP at /mcp
+- HTTP+SSE at /sse (event stream) and /messages/ (client messages)
+- /health (liveness) and /ready (MongoDB connected and the circuit closed)
+"""
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+import logging
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from mcp.server.sse import SseServerTransport
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Mount, Route
+from starlette.types import Receive, Scope, Send
+from . import config
+from .server import MongoMCPServer
+
+logger = logging.getLogger(__name__)
+
+class _StreamableHTTPApp:
+    """ASGI endpoint handing requests to the session manager."""
+
+    def __init__(self, session_manager: StreamableHTTPSessionManager):
+        self.session_manager = session_manager
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.session_manager.handle_request(scope, receive, send)
+
+def create_app(server: Optional[MongoMCPServer] = None) -> FastAPI:
+    """
+    Build the ASGI application serving MCP over HTTP.
+
+    Args:
+        server (MongoMCPServer, optional): Server to expose; a new one is created if omitted
+
+    Returns:
+        FastAPI: Application with the MCP, health and readiness routes
+    """
+    server = server or MongoMCPServer()
+    session_manager = StreamableHTTPSessionManager(
+        app=server.mcp_server,
+        stateless=config.HTTP_STATELESS
+    )
+    sse = SseServerTransport("/messages/")
+
+    async def handle_sse(request: Request) -> Response:
+        async with sse.connect_sse(request.scope, request.receive, request._send) as (read_stream, write_stream):
+            await server.mcp_server.run(read_stream, write_stream, server.initialization_options())
+        return Response()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        await server.start()
+        try:
+            async with session_manager.run():
+                logger.info(f"MCP HTTP transport listening on {config.HOST}:{config.PORT}")
+                yield
+        finally:
+            await server.shutdown()
+
+    app = FastAPI(
+        title="stock-data-mcp-server",
+        lifespan=lifespan,
+        routes=[
+            Route("/mcp", endpoint=_StreamableHTTPApp(session_manager)),
+            Route("/sse", endpoint=handle_sse, methods=["GET"]),
+            Mount("/messages/", app=sse.handle_post_message)
+        ]
+    )
+
+    @app.get("/health")
+    async def health() -> JSONResponse:
+        return JSONResponse({"status": "ok"})
+
+    @app.get("/ready")
+    async def ready() -> JSONResponse:
+        # Ready once MongoDB is connected and the health monitor has not opened the circuit
+        if server.is_connected:
+            return JSONResponse({"status": "ready"})
+        detail = (
+            server.breaker.describe() if server.breaker.state == server.breaker.OPEN
+            else "MongoDB connection not initialized"
+        )
+        return JSONResponse({"status": "not ready", "detail": detail}, status_code=503)
+
+    return app
+
+def serve() -> None:
+    """Run the HTTP transport with uvicorn."""
+    options = dict(
+        host=config.HOST,
+        port=config.PORT,
+        timeout_keep_alive=config.HTTP_KEEP_ALIVE_SECONDS,
+        log_level=config.LOG_LEVEL.lower()
+    )
+    if config.HTTP_WORKERS > 1:
+        if not config.HTTP_STATELESS:
+            # Sessions live in one process; without sticky routing requests reach the wrong worker
+            logger.warning("HTTP_WORKERS > 1 without HTTP_STATELESS=true: sessions need sticky routing")
+        # Each worker process builds its own app, MongoDB pool and caches
+        uvicorn.run(f"{__name__}:create_app", factory=True, workers=config.HTTP_WORKERS, **options)
+    else:
+        uvicorn.run(create_app(), **options)
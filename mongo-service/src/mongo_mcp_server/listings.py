@@ -0,0 +1,178 @@
+"""
+Precomputed tools/list and resources/list responses.
+
+Tool and resource descriptors are built once, when the server starts and
+when the exposed collections change, and kept as an immutable snapshot with
+a version stamp. Every page of both listings is built up front, so a client
+that re-lists often gets the same cached result objects back. A new
+version is only published when the descriptors actually differ, which is
+also the only time list_changed notifications are worth sending.
+"""
+
+from typing import Any, Dict, NamedTuple, Optional, Sequence, Tuple
+import hashlib
+import json
+import logging
+from mcp.types import ListResourcesResult, ListToolsResult, Resource, Tool
+from . import config
+
+logger = logging.getLogger(__name__)
+
+class ListingSnapshot(NamedTuple):
+    """One version of the listings, with every page prebuilt."""
+    version: int
+    digest: str
+    collection_names: Tuple[str, ...]
+    tools: Tuple[Tool, ...]
+    resources: Tuple[Resource, ...]
+    tool_pages: Tuple[ListToolsResult, ...]
+    resource_pages: Tuple[ListResourcesResult, ...]
+
+def listing_digest(tools: Sequence[Tool], resources: Sequence[Resource]) -> str:
+    """
+    Hash the serialized descriptors to detect real changes.
+
+    Args:
+        tools (Sequence[Tool]): Tool descriptors
+        resources (Sequence[Resource]): Resource descriptors
+
+    Returns:
+        str: Hex digest of the listings' content
+    """
+    payload = json.dumps(
+        [
+            [tool.model_dump(mode='json', exclude_none=True) for tool in tools],
+            [resource.model_dump(mode='json', exclude_none=True) for resource in resources]
+        ],
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class ListingCache:
+    def __init__(self, page_size: int = config.LIST_PAGE_SIZE):
+        """
+        Initialize the listing cache.
+
+        Args:
+            page_size (int): Entries per tools/list and resources/list page
+                (0 or less returns everything in one page)
+        """
+        self.page_size = page_size
+        self.snapshot = self._build(0, '', (), (), ())
+        self.rebuilds = 0
+        self.unchanged = 0
+
+    def update(
+        self,
+        collection_names: Sequence[str],
+        tools: Sequence[Tool],
+        resources: Sequence[Resource]
+    ) -> bool:
+        """
+        Publish new listings if their content differs from the current snapshot.
+
+        Args:
+            collection_names (Sequence[str]): Collections the descriptors were built for
+            tools (Sequence[Tool]): Tool descriptors
+            resources (Sequence[Resource]): Resource descriptors
+
+        Returns:
+            bool: True if a new version was published
+        """
+        digest = listing_digest(tools, resources)
+        if digest == self.snapshot.digest:
+            self.unchanged += 1
+            # Remember the names so the same collection set is not rebuilt again
+            self.snapshot = self.snapshot._replace(collection_names=tuple(collection_names))
+            return False
+        self.snapshot = self._build(self.snapshot.version + 1, digest, collection_names, tools, resources)
+        self.rebuilds += 1
+        logger.info(
+            f"Published listings version {self.snapshot.version}: "
+            f"{len(tools)} tool(s), {len(resources)} resource(s)"
+        )
+        return True
+
+    def tool_page(self, cursor: Optional[str] = None) -> ListToolsResult:
+        """
+        Return a prebuilt tools/list page.
+
+        Args:
+            cursor (str, optional): nextCursor of the previous page
+
+        Returns:
+            ListToolsResult: Cached page (shared, must not be modified)
+        """
+        snapshot = self.snapshot
+        return snapshot.tool_pages[self._page_index(snapshot, cursor, len(snapshot.tool_pages))]
+
+    def resource_page(self, cursor: Optional[str] = None) -> ListResourcesResult:
+        """
+        Return a prebuilt resources/list page.
+
+        Args:
+            cursor (str, optional): nextCursor of the previous page
+
+        Returns:
+            ListResourcesResult: Cached page (shared, must not be modified)
+        """
+        snapshot = self.snapshot
+        return snapshot.resource_pages[self._page_index(snapshot, cursor, len(snapshot.resource_pages))]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the listing version and how often rebuilds changed it."""
+        return {
+            "version": self.snapshot.version,
+            "tools": len(self.snapshot.tools),
+            "resources": len(self.snapshot.resources),
+            "rebuilds": self.rebuilds,
+            "unchanged": self.unchanged
+        }
+
+    @staticmethod
+    def _page_index(snapshot: ListingSnapshot, cursor: Optional[str], pages: int) -> int:
+        """Resolve a "version:page" cursor against the snapshot it came from."""
+        if not cursor:
+            return 0
+        version, _, index = cursor.partition(':')
+        if not (version.isdigit() and index.isdigit()):
+            raise ValueError(f"Invalid cursor: {cursor}")
+        if int(version) != snapshot.version:
+            raise ValueError(f"Cursor is from listing version {version}, now {snapshot.version}; list again")
+        if not 0 < int(index) < pages:
+            raise ValueError(f"Invalid cursor: {cursor}")
+        return int(index)
+
+    def _build(
+        self,
+        version: int,
+        digest: str,
+        collection_names: Sequence[str],
+        tools: Sequence[Tool],
+        resources: Sequence[Resource]
+    ) -> ListingSnapshot:
+        tools = tuple(tools)
+        resources = tuple(resources)
+        return ListingSnapshot(
+            version=version,
+            digest=digest,
+            collection_names=tuple(collection_names),
+            tools=tools,
+            resources=resources,
+            tool_pages=tuple(
+                ListToolsResult(tools=list(page), nextCursor=next_cursor)
+                for page, next_cursor in self._pages(version, tools)
+            ),
+            resource_pages=tuple(
+                ListResourcesResult(resources=list(page), nextCursor=next_cursor)
+                for page, next_cursor in self._pages(version, resources)
+            )
+        )
+
+    def _pages(self, version: int, items: Tuple[Any, ...]):
+        """Split items into pages, each with the cursor of the page after it."""
+        size = self.page_size if self.page_size > 0 else max(len(items), 1)
+        starts = range(0, max(len(items), 1), size)
+        for index, start in enumerate(starts):
+            has_next = start + size < len(items)
+            yield items[start:start + size], f"{version}:{index + 1}" if has_next else None
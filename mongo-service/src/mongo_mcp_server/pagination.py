@@ -0,0 +1,258 @@
+"""
+Keyset (continuation token) pagination.
+
+Instead of skipping N documents, the next page is a range query that starts
+right after the last document of the previous page. The token is opaque to
+the caller and carries the sort specification, the last document's sort key
+values (with _id as a tie-breaker) and a digest of the filter it belongs to.
+
+Only paginated queries are changed: their sort gets the _id tie-breaker,
+so a sort on {a: 1} runs as {a: 1, _id: 1} and needs a compound index
+ending in _id (e.g. {a: 1, _id: 1}) to avoid an in-memory sort. Other
+queries run with the caller's sort exactly as given.
+"""
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import Any, Collection, Dict, List, Mapping, NamedTuple, Optional, Tuple
+import binascii
+from bson import json_util
+from bson.json_util import CANONICAL_JSON_OPTIONS
+from .cache import filter_digest, make_cache_key
+
+SortSpec = List[Tuple[str, int]]
+
+class PageTokenError(ValueError):
+    """Raised when a page token is malformed or does not match the query."""
+
+class FindSpec(NamedTuple):
+    """
+    The find command a query runs.
+
+    Built once by plan_find and shared by the query tool, the explain tool
+    and the plan and cost guards, so a plan is always checked for the
+    command that is actually sent.
+    """
+    query: Dict[str, Any]
+    filter: Dict[str, Any]
+    projection: Optional[Dict[str, Any]]
+    sort: Optional[List[Tuple[str, Any]]]
+    skip: int
+    limit: int
+    paginate: bool
+
+    def sort_document(self) -> Optional[Dict[str, Any]]:
+        """The sort as a document, e.g. for cache keys and query shapes."""
+        return dict(self.sort) if self.sort else None
+
+    def cache_key(self, collection_name: str) -> str:
+        """Cache key of this exact find command on a collection."""
+        return make_cache_key(
+            collection_name, self.filter, self.projection, self.sort_document(), self.skip, self.limit
+        )
+
+def normalize_sort(sort: Optional[Mapping[str, Any]]) -> SortSpec:
+    """
+    Turn a sort document into a keyset sort specification for a paginated query.
+
+    _id is appended as a final tie-breaker so every document has a unique
+    position, following the direction of the last sort key.
+
+    Args:
+        sort (Mapping[str, Any], optional): Sort criteria such as {"timestamp": -1}
+
+    Returns:
+        SortSpec: List of (field, direction) pairs ending with _id
+    """
+    spec: SortSpec = []
+    for field, direction in (sort or {}).items():
+        if direction not in (1, -1):
+            raise PageTokenError(
+                f"Sort direction for '{field}' must be 1 or -1 to use page tokens"
+            )
+        spec.append((field, direction))
+    if not any(field == '_id' for field, _ in spec):
+        spec.append(('_id', spec[-1][1] if spec else 1))
+    return spec
+
+def include_sort_fields(
+    projection: Optional[Dict[str, Any]],
+    sort_spec: SortSpec
+) -> Optional[Dict[str, Any]]:
+    """
+    Make sure the projection returns every field the page token needs.
+
+    Args:
+        projection (Dict[str, Any], optional): Caller's projection
+        sort_spec (SortSpec): Keyset sort specification
+
+    Returns:
+        Optional[Dict[str, Any]]: Projection that keeps the sort fields
+    """
+    if not projection:
+        return projection
+    projection = dict(projection)
+    sort_fields = [field for field, _ in sort_spec]
+    inclusive = any(value and field != '_id' for field, value in projection.items())
+    for field in sort_fields:
+        if inclusive:
+            projection[field] = 1
+        elif field in projection and not projection[field]:
+            del projection[field]
+    return projection
+
+def _get_path(doc: Mapping[str, Any], path: str) -> Any:
+    """Read a dotted field path from a document, None if missing."""
+    value: Any = doc
+    for part in path.split('.'):
+        if not isinstance(value, Mapping) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+def encode_page_token(
+    sort_spec: SortSpec,
+    last_document: Mapping[str, Any],
+    query: Dict[str, Any]
+) -> str:
+    """
+    Build the continuation token for the page ending at last_document.
+
+    Args:
+        sort_spec (SortSpec): Keyset sort specification
+        last_document (Mapping[str, Any]): Last document returned on the page
+        query (Dict[str, Any]): Caller's filter (without the keyset range)
+
+    Returns:
+        str: URL-safe opaque token
+    """
+    payload = {
+        "s": [[field, direction] for field, direction in sort_spec],
+        "v": [_get_path(last_document, field) for field, _ in sort_spec],
+        "f": filter_digest(query)
+    }
+    raw = json_util.dumps(payload, json_options=CANONICAL_JSON_OPTIONS).encode('utf-8')
+    return urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_page_token(token: str, sort_spec: SortSpec, query: Dict[str, Any]) -> List[Any]:
+    """
+    Validate a continuation token against the current query and return its key values.
+
+    Args:
+        token (str): Token from a previous page
+        sort_spec (SortSpec): Keyset sort specification of the current request
+        query (Dict[str, Any]): Caller's filter (without the keyset range)
+
+    Returns:
+        List[Any]: Sort key values of the last document on the previous page
+
+    Raises:
+        PageTokenError: If the token is malformed or was issued for another query or sort
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json_util.loads(urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+        token_sort = [(field, direction) for field, direction in payload["s"]]
+        values = list(payload["v"])
+        digest = payload["f"]
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError) as e:
+        raise PageTokenError(f"Invalid page token: {e}") from e
+    if token_sort != sort_spec:
+        raise PageTokenError("Page token was issued for a different sort order")
+    if digest != filter_digest(query):
+        raise PageTokenError("Page token was issued for a different query filter")
+    if len(values) != len(sort_spec):
+        raise PageTokenError("Invalid page token: sort key count mismatch")
+    return values
+
+def keyset_filter(query: Dict[str, Any], sort_spec: SortSpec, values: List[Any]) -> Dict[str, Any]:
+    """
+    Combine the caller's filter with the range that starts after the last document.
+
+    For sort keys (a, b, _id) this builds
+    {a > va} OR {a = va, b > vb} OR {a = va, b = vb, _id > vid},
+    with > replaced by < for descending keys.
+
+    Args:
+        query (Dict[str, Any]): Caller's filter
+        sort_spec (SortSpec): Keyset sort specification
+        values (List[Any]): Sort key values from the page token
+
+    Returns:
+        Dict[str, Any]: Filter selecting the next page
+    """
+    branches = []
+    for i, (field, direction) in enumerate(sort_spec):
+        branch = {prefix: values[j] for j, (prefix, _) in enumerate(sort_spec[:i])}
+        value = values[i]
+        if value is None:
+            # null/missing sorts first: after it come all non-null values
+            # ascending, and nothing descending
+            if direction == -1:
+                continue
+            branch[field] = {"$ne": None}
+        else:
+            branch[field] = {"$gt" if direction == 1 else "$lt": value}
+        branches.append(branch)
+    range_filter = {"$or": branches} if branches else {"_id": {"$exists": False}}
+    return {"$and": [query, range_filter]} if query else range_filter
+
+def validate_find_options(options: Mapping[str, Any], allowed: Collection[str]) -> Dict[str, Any]:
+    """
+    Validate and filter find options.
+
+    Unknown options are dropped, limit is capped at 100 and a negative or
+    non-integer skip becomes 0.
+
+    Args:
+        options (Mapping[str, Any]): Raw query options
+        allowed (Collection[str]): Names of the options the caller accepts
+
+    Returns:
+        Dict[str, Any]: Validated and filtered options
+    """
+    validated = {}
+    for key, value in options.items():
+        if key in allowed:
+            if key == 'limit' and (not isinstance(value, int) or value > 100):
+                validated[key] = 100  # Cap limit at 100
+            elif key == 'skip' and (not isinstance(value, int) or value < 0):
+                validated[key] = 0  # Ensure skip is non-negative
+            else:
+                validated[key] = value
+    return validated
+
+def plan_find(query: Dict[str, Any], options: Mapping[str, Any]) -> FindSpec:
+    """
+    Build the find command for a query and its validated options.
+
+    The caller's sort and projection are used unchanged unless the query is
+    paginated (options.paginate or options.page_token). Then the sort gets
+    the _id tie-breaker, the projection keeps the sort fields and a page
+    token is resolved into a range on the sort keys.
+
+    Args:
+        query (Dict[str, Any]): Caller's filter
+        options (Mapping[str, Any]): Validated query options
+
+    Returns:
+        FindSpec: Filter, projection, sort, skip and limit to send
+
+    Raises:
+        PageTokenError: If the token is invalid or the sort cannot be paginated
+    """
+    skip = options.get('skip') or 0
+    limit = options.get('limit') or 0
+    page_token = options.get('page_token')
+    if not (page_token or options.get('paginate')):
+        sort = list(options['sort'].items()) if options.get('sort') else None
+        return FindSpec(query, query, options.get('projection') or None, sort, skip, limit, False)
+
+    sort_spec = normalize_sort(options.get('sort'))
+    find_query = query
+    if page_token:
+        if skip:
+            raise PageTokenError("page_token cannot be combined with skip")
+        values = decode_page_token(page_token, sort_spec, query)
+        find_query = keyset_filter(query, sort_spec, values)
+    projection = include_sort_fields(options.get('projection'), sort_spec)
+    return FindSpec(query, find_query, projection or None, sort_spec, skip, limit, True)
@@ -0,0 +1,178 @@
+"""
+MongoDB connection pool configuration, warm-up and monitoring.
+
+The client's pool settings come from config.py instead of driver defaults.
+Right after connecting, concurrent pings open connections ahead of the
+driver's background minPoolSize maintenance, so the first tool calls are
+less likely to pay for TCP, TLS and authentication handshakes. A ConnectionPoolListener tracks checked-out
+connections, the wait queue and connection setup and checkout latency.
+"""
+
+from typing import Any, Dict, Optional
+import asyncio
+import logging
+import time
+from pymongo import AsyncMongoClient
+from pymongo.monitoring import (
+    ConnectionCheckedInEvent,
+    ConnectionCheckedOutEvent,
+    ConnectionCheckOutFailedEvent,
+    ConnectionCheckOutStartedEvent,
+    ConnectionClosedEvent,
+    ConnectionCreatedEvent,
+    ConnectionPoolListener,
+    ConnectionReadyEvent,
+    PoolClearedEvent,
+    PoolClosedEvent,
+    PoolCreatedEvent,
+    PoolReadyEvent
+)
+from . import config
+
+logger = logging.getLogger(__name__)
+
+def client_options() -> Dict[str, Any]:
+    """
+    Build the MongoClient keyword arguments for the pool from config.
+
+    Returns:
+        Dict[str, Any]: Client options; unset optional limits are left to the driver
+    """
+    options: Dict[str, Any] = {
+        "maxPoolSize": config.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": config.MONGO_MIN_POOL_SIZE,
+        "maxConnecting": config.MONGO_MAX_CONNECTING,
+        "serverSelectionTimeoutMS": config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": config.MONGO_CONNECT_TIMEOUT_MS
+    }
+    if config.MONGO_MAX_IDLE_TIME_MS > 0:
+        options["maxIdleTimeMS"] = config.MONGO_MAX_IDLE_TIME_MS
+    if config.MONGO_SOCKET_TIMEOUT_MS > 0:
+        options["socketTimeoutMS"] = config.MONGO_SOCKET_TIMEOUT_MS
+    if config.MONGO_WAIT_QUEUE_TIMEOUT_MS > 0:
+        options["waitQueueTimeoutMS"] = config.MONGO_WAIT_QUEUE_TIMEOUT_MS
+    if config.MONGO_COMPRESSORS:
+        options["compressors"] = config.MONGO_COMPRESSORS
+    return options
+
+class PoolStats(ConnectionPoolListener):
+    """Connection pool listener that keeps running totals for server_stats."""
+
+    def __init__(self):
+        self.pools = 0
+        self.clears = 0
+        self.checked_out = 0
+        self.wait_queue = 0
+        self.max_wait_queue = 0
+        self.open_connections = 0
+        self.created = 0
+        self.closed = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self._setup_seconds = 0.0
+        self._setup_max = 0.0
+        self._checkout_seconds = 0.0
+        self._checkout_max = 0.0
+
+    def pool_created(self, event: PoolCreatedEvent) -> None:
+        self.pools += 1
+
+    def pool_ready(self, event: PoolReadyEvent) -> None:
+        pass
+
+    def pool_cleared(self, event: PoolClearedEvent) -> None:
+        # A cleared pool (e.g. after a network error) re-creates its connections
+        self.clears += 1
+
+    def pool_closed(self, event: PoolClosedEvent) -> None:
+        self.pools -= 1
+
+    def connection_created(self, event: ConnectionCreatedEvent) -> None:
+        self.created += 1
+        self.open_connections += 1
+
+    def connection_ready(self, event: ConnectionReadyEvent) -> None:
+        # duration covers the TCP, TLS and authentication handshakes
+        duration = event.duration or 0.0
+        self._setup_seconds += duration
+        self._setup_max = max(self._setup_max, duration)
+
+    def connection_closed(self, event: ConnectionClosedEvent) -> None:
+        self.closed += 1
+        self.open_connections -= 1
+
+    def connection_check_out_started(self, event: ConnectionCheckOutStartedEvent) -> None:
+        self.wait_queue += 1
+        self.max_wait_queue = max(self.max_wait_queue, self.wait_queue)
+
+    def connection_check_out_failed(self, event: ConnectionCheckOutFailedEvent) -> None:
+        self.wait_queue -= 1
+        self.checkout_failures += 1
+
+    def connection_checked_out(self, event: ConnectionCheckedOutEvent) -> None:
+        self.wait_queue -= 1
+        self.checked_out += 1
+        self.checkouts += 1
+        duration = event.duration or 0.0
+        self._checkout_seconds += duration
+        self._checkout_max = max(self._checkout_max, duration)
+
+    def connection_checked_in(self, event: ConnectionCheckedInEvent) -> None:
+        self.checked_out -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool occupancy and connection setup / checkout latency."""
+        return {
+            "pools": self.pools,
+            "open_connections": self.open_connections,
+            "checked_out": self.checked_out,
+            "wait_queue": self.wait_queue,
+            "max_wait_queue": self.max_wait_queue,
+            "created": self.created,
+            "closed": self.closed,
+            "clears": self.clears,
+            "checkout_failures": self.checkout_failures,
+            "avg_connection_setup_ms": round(self._setup_seconds * 1000 / max(self.created, 1), 2),
+            "max_connection_setup_ms": round(self._setup_max * 1000, 2),
+            "avg_checkout_ms": round(self._checkout_seconds * 1000 / max(self.checkouts, 1), 2),
+            "max_checkout_ms": round(self._checkout_max * 1000, 2)
+        }
+
+async def warm_up(
+    client: AsyncMongoClient,
+    connections: int,
+    pool_stats: Optional[PoolStats] = None
+) -> Optional[float]:
+    """
+    Send concurrent pings so the pool opens connections before they are needed.
+
+    This is best effort: a ping that finishes early checks its connection
+    back in, and a later ping may reuse it, so fewer than the given number
+    of connections can be opened. The driver's background maintenance still
+    fills the pool to minPoolSize. The log reports the connections actually
+    open when pool_stats is given.
+
+    Args:
+        client (AsyncMongoClient): Connected client
+        connections (int): Number of concurrent pings
+        pool_stats (PoolStats, optional): Listener registered on the client
+
+    Returns:
+        Optional[float]: Seconds the warm-up took, or None if nothing was done
+    """
+    if connections <= 0:
+        return None
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(client.admin.command('ping') for _ in range(connections)),
+        return_exceptions=True
+    )
+    failures = [result for result in results if isinstance(result, Exception)]
+    if failures:
+        logger.warning(f"Pool warm-up: {len(failures)} of {connections} ping(s) failed: {failures[0]}")
+    elapsed = time.perf_counter() - started
+    opened = f"; {pool_stats.open_connections} connection(s) open" if pool_stats is not None else ""
+    logger.info(
+        f"Pool warm-up: {connections - len(failures)} ping(s) in {elapsed * 1000:.0f} ms{opened}"
+    )
+    return elapsed
@@ -2,6 +2,11 @@
 MongoDB MCP Resources.
 """
 
-from .collection_resource import MongoCollectionResource
+from .collection_resource import (
+    RESOURCE_URI_TEMPLATE,
+    MongoCollectionResource,
+    ResourceRequest,
+    parse_resource_uri
+)
 
-__all__ = ['MongoCollectionResource']
\ No newline at end of file
+__all__ = ['RESOURCE_URI_TEMPLATE', 'MongoCollectionResource', 'ResourceRequest', 'parse_resource_uri']
\ No newline at end of file
@@ -3,21 +3,95 @@ MongoDB Collection Resource implementation.
 """
 
 from mcp.types import Resource, TextContent
-from pymongo.database import Database
-from typing import Dict, Any, Optional, List
-import json
+from pymongo.asynchronous.database import AsyncDatabase
+from typing import Dict, Any, Optional, List, NamedTuple
+from urllib.parse import parse_qs, urlsplit
+from bson import json_util
+import asyncio
 import logging
+from .. import config
+from ..counting import CountStrategy
+from ..deadlines import max_time_ms
+from ..encoding import RAW_CODEC_OPTIONS
+from ..executor import MongoExecutor
+from ..formatting import StreamingFormatter
+from ..pagination import PageTokenError, decode_page_token, encode_page_token, keyset_filter
+
+# Resource pages are ordered by _id so every page can be continued by token
+RESOURCE_SORT = [('_id', 1)]
+
+# RFC 6570 template: filter is (extended) JSON, fields a comma-separated
+# projection, page the continuation token from the previous page
+RESOURCE_URI_TEMPLATE = "mongodb://{collection}{?filter,fields,page,limit}"
+DEFAULT_RESOURCE_LIMIT = 10
+MAX_RESOURCE_LIMIT = 100
 
 logger = logging.getLogger(__name__)
 
+class ResourceRequest(NamedTuple):
+    """The slice of a collection addressed by a resource URI."""
+    collection_name: str
+    query: Dict[str, Any]
+    fields: Optional[List[str]]
+    page_token: Optional[str]
+    limit: int
+
+def parse_resource_uri(uri: str) -> ResourceRequest:
+    """
+    Parse a resource URI such as mongodb://prices?filter={"symbol":"AAPL"}&fields=symbol,close&limit=20.
+    
+    Args:
+        uri (str): Resource URI (query parameters percent-encoded)
+        
+    Returns:
+        ResourceRequest: Collection name and the requested slice
+        
+    Raises:
+        ValueError: If the URI or one of its parameters is invalid
+    """
+    parts = urlsplit(str(uri))
+    if parts.scheme != 'mongodb' or not parts.netloc:
+        raise ValueError(f"Unsupported resource URI: {uri}")
+    params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+    
+    query: Dict[str, Any] = {}
+    if params.get('filter'):
+        query = json_util.loads(params['filter'])
+        if not isinstance(query, dict):
+            raise ValueError("filter must be a JSON object")
+    fields = [field.strip() for field in params.get('fields', '').split(',') if field.strip()]
+    try:
+        limit = int(params.get('limit', DEFAULT_RESOURCE_LIMIT))
+    except ValueError:
+        raise ValueError(f"limit must be an integer, got {params['limit']!r}") from None
+    
+    return ResourceRequest(
+        collection_name=parts.netloc,
+        query=query,
+        fields=fields or None,
+        page_token=params.get('page') or None,
+        limit=min(max(limit, 1), MAX_RESOURCE_LIMIT)
+    )
+
 class MongoCollectionResource(Resource):
-    def __init__(self, collection_name: str, db: Database):
+    def __init__(
+        self,
+        collection_name: str,
+        db: AsyncDatabase,
+        executor: Optional[MongoExecutor] = None,
+        raw_bson: bool = config.RAW_BSON,
+        counter: Optional[CountStrategy] = None
+    ):
         """
         Initialize MongoDB Collection Resource.
         
         Args:
             collection_name (str): Name of the MongoDB collection
-            db (Database): MongoDB database instance
+            db (AsyncDatabase): Async MongoDB database instance
+            executor (MongoExecutor, optional): Shared executor for concurrency limits
+            raw_bson (bool): Read documents as RawBSONDocument and encode them without
+                decoding into dicts first
+            counter (CountStrategy, optional): Strategy used to report total matches
         """
         # Initialize base Resource with required fields
         super().__init__(
@@ -28,12 +102,22 @@ class MongoCollectionResource(Resource):
         )
         self.collection = db[collection_name]
         self.collection_name = collection_name
+        self.raw_bson = raw_bson
+        self.read_collection = (
+            self.collection.with_options(codec_options=RAW_CODEC_OPTIONS)
+            if raw_bson else self.collection
+        )
+        self.executor = executor or MongoExecutor()
+        self.formatter = StreamingFormatter(self.executor)
+        self.counter = counter or CountStrategy()
 
     async def get_content(
         self, 
         query: Optional[Dict[str, Any]] = None, 
         skip: int = 0, 
-        limit: int = 10
+        limit: int = DEFAULT_RESOURCE_LIMIT,
+        page_token: Optional[str] = None,
+        fields: Optional[List[str]] = None
     ) -> List[TextContent]:
         """
         Get content from MongoDB collection.
@@ -42,6 +126,9 @@ class MongoCollectionResource(Resource):
             query (Dict[str, Any], optional): MongoDB query to filter documents
             skip (int): Number of documents to skip (default: 0)
             limit (int): Maximum number of documents to return (default: 10)
+            page_token (str, optional): Continuation token from the previous page,
+                used instead of skip
+            fields (List[str], optional): Fields to return (default: whole documents)
             
         Returns:
             List[TextContent]: List of text content representing the documents
@@ -50,33 +137,51 @@ class MongoCollectionResource(Resource):
             query = {}
         
         try:
-            # Get total count for the query
-            total_count = self.collection.count_documents(query)
-            
-            # Fetch documents with pagination
-            cursor = self.collection.find(query).skip(skip).limit(limit)
-            documents = list(cursor)
+            find_query = query
+            if page_token:
+                if skip:
+                    raise PageTokenError("page_token cannot be combined with skip")
+                values = decode_page_token(page_token, RESOURCE_SORT, query)
+                find_query = keyset_filter(query, RESOURCE_SORT, values)
             
-            if not documents:
-                return [TextContent(text="No documents found matching the query.")]
+            async with self.executor.limit(self.collection_name):
+                # Count concurrently with fetching the page
+                count_task = asyncio.create_task(self.counter.count(self.collection, query))
+                try:
+                    # Fetch documents with pagination, streamed into one bounded buffer
+                    projection = {field: 1 for field in fields} if fields else None
+                    cursor = self.read_collection.find(find_query, projection).sort(RESOURCE_SORT)
+                    cursor = cursor.skip(skip).limit(limit)
+                    time_limit = max_time_ms(config.QUERY_MAX_TIME_MS)
+                    if time_limit:
+                        cursor = cursor.max_time_ms(time_limit)
+                    documents = await self.formatter.format_cursor(cursor)
+                    total_count = await count_task
+                finally:
+                    if not count_task.done():
+                        count_task.cancel()
             
-            # Format documents for better readability
-            formatted_docs = []
-            for doc in documents:
-                # Convert ObjectId to string for JSON serialization
-                if '_id' in doc:
-                    doc['_id'] = str(doc['_id'])
-                formatted_docs.append(json.dumps(doc, indent=2))
+            if not documents.count:
+                return [TextContent(type="text", text="No documents found matching the query.")]
             
             # Prepare result text with pagination info
-            result_text = (
-                f"Found {total_count} total documents matching query.\n"
-                f"Showing documents {skip + 1}-{min(skip + len(documents), total_count)}:\n"
-                + "\n".join(formatted_docs)
-            )
-            return [TextContent(text=result_text)]
+            if page_token:
+                result_text = f"Showing {documents.count} document(s) after the previous page:\n"
+            else:
+                result_text = f"Showing documents {skip + 1}-{skip + documents.count}:\n"
+            result_text += documents.text
+            if total_count is not None:
+                result_text = (
+                    f"Found {total_count.display()} total documents matching query.\n" + result_text
+                )
+            if documents.truncated:
+                result_text += f"\n... output truncated at {self.formatter.max_bytes} bytes."
+            if documents.truncated or documents.count == limit:
+                next_token = encode_page_token(RESOURCE_SORT, documents.last_document, query)
+                result_text += f"\nNext page token (pass as page): {next_token}"
+            return [TextContent(type="text", text=result_text)]
             
         except Exception as e:
             error_msg = f"Error retrieving documents from {self.collection_name}: {str(e)}"
             logger.error(error_msg)
-            return [TextContent(text=error_msg)]
\ No newline at end of file
+            return [TextContent(type="text", text=error_msg)]
\ No newline at end of file
@@ -6,15 +6,48 @@ from contextlib import asynccontextmanager
 from mcp.server import Server, NotificationOptions
 from mcp.server.models import InitializationOptions
 from mcp.server.stdio import stdio_server
-from mcp.types import TextContent, Tool, Resource
-from pymongo import MongoClient
+from mcp.types import (
+    ListResourcesRequest,
+    ListResourcesResult,
+    ListToolsRequest,
+    ListToolsResult,
+    Resource,
+    ResourceTemplate,
+    TextContent,
+    Tool
+)
+from pydantic import AnyUrl
+from pymongo import AsyncMongoClient
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterator, List, NamedTuple, Optional
 import asyncio
 import json
-from datetime import datetime
 import logging
+import uuid
+import weakref
+import anyio
 from . import config
+from .advisor import IndexAdvisor
+from .cache import QueryCache
+from .catalog import CollectionCatalog, CollectionHandlers, parse_globs
+from .change_streams import ChangeStreamWatcher
+from .counting import CountStrategy
+from .cursors import CursorRegistry
+from .deadlines import deadline
+from .encoding import MongoJSONEncoder
+from .executor import MongoExecutor
+from .explain import PlanGuard
+from .guardrails import CostGuard
+from .health import CircuitBreaker, HealthMonitor
+from .listings import ListingCache
+from .pool import PoolStats, client_options, warm_up
+from .resources import RESOURCE_URI_TEMPLATE, MongoCollectionResource, parse_resource_uri
+from .singleflight import SingleFlight
+from .subscriptions import SubscriptionManager
+from .tools import FetchMoreTool, IndexAdviceTool, MongoAggregateTool, MongoExplainTool, MongoQueryTool
+from .tools.aggregate_tool import AGGREGATE_INPUT_SCHEMA
+from .tools.explain_tool import EXPLAIN_INPUT_SCHEMA
+from .tools.index_advice_tool import INDEX_ADVICE_INPUT_SCHEMA
 
 # Configure logging
 logging.basicConfig(
@@ -23,120 +56,373 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-class MongoJSONEncoder(json.JSONEncoder):
-    """Custom JSON encoder for MongoDB documents."""
-    def default(self, obj):
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        return super().default(obj)
+class SessionScope(NamedTuple):
+    """Per-session state, created for every client session the MCP server runs."""
+    key: str
 
 class MongoMCPServer:
     def __init__(self):
         self.client = None
+        self.pool_stats = PoolStats()
         self.db = None
-        self.collection = None
+        self.catalog = None
+        self.index_advice_tool = None
         self.is_connected = False
-        self.mcp_server = Server(name="stock-data-mcp-server")
+        self._ready = asyncio.Event()
+        self.breaker = CircuitBreaker()
+        self.health_monitor = None
+        self._connect_task = None
+        self.executor = MongoExecutor()
+        self.query_cache = QueryCache() if config.QUERY_CACHE_ENABLED else None
+        self.change_watcher = None
+        self.singleflight = SingleFlight()
+        self.counter = CountStrategy()
+        self.cursors = CursorRegistry(self.executor)
+        self.fetch_more_tool = FetchMoreTool(self.cursors)
+        self.subscriptions = SubscriptionManager()
+        self.plan_guard = PlanGuard()
+        self.index_advisor = IndexAdvisor()
+        self.cost_guard = CostGuard() if config.COST_GUARD_ENABLED else None
+        self.listings = ListingCache()
+        self._listing_sessions = weakref.WeakSet()
+        self._catalog_task = None
+        self.mcp_server = Server(name="stock-data-mcp-server", lifespan=self._session_scope)
         self._setup_mcp_handlers()
+        # Until connected, list the configured collection (discovered ones are not known yet)
+        self._rebuild_listings([] if config.COLLECTION_DISCOVERY else [config.COLLECTION_NAME])
 
     def _setup_mcp_handlers(self):
         """Set up MCP server handlers."""
         # Create decorators for each handler
         @self.mcp_server.list_resources()
-        async def list_resources() -> List[Resource]:
-            return await self.list_resources()
+        async def list_resources(request: ListResourcesRequest) -> ListResourcesResult:
+            return await self.list_resources(request.params.cursor if request.params else None)
+
+        @self.mcp_server.list_resource_templates()
+        async def list_resource_templates() -> List[ResourceTemplate]:
+            return await self.list_resource_templates()
 
         @self.mcp_server.read_resource()
         async def read_resource(uri: str) -> str:
             return await self.read_resource(uri)
 
+        @self.mcp_server.subscribe_resource()
+        async def subscribe_resource(uri: AnyUrl) -> None:
+            await self.subscribe_resource(str(uri))
+
+        @self.mcp_server.unsubscribe_resource()
+        async def unsubscribe_resource(uri: AnyUrl) -> None:
+            await self.unsubscribe_resource(str(uri))
+
         @self.mcp_server.list_tools()
-        async def list_tools() -> List[Tool]:
-            return await self.list_tools()
+        async def list_tools(request: ListToolsRequest) -> ListToolsResult:
+            if request is None:
+                # The SDK refreshes its input-validation cache this way; give it every tool
+                return ListToolsResult(tools=list(self.listings.snapshot.tools))
+            return await self.list_tools(request.params.cursor if request.params else None)
 
         @self.mcp_server.call_tool()
         async def call_tool(name: str, arguments: Optional[Dict[str, Any]]) -> List[TextContent]:
             return await self.call_tool(name, arguments)
 
-    def setup_mongodb(self) -> bool:
+    async def setup_mongodb(self) -> bool:
         """Initialize MongoDB connection."""
         try:
-            # Initialize MongoDB client with connection timeout
-            self.client = MongoClient(
+            # Initialize the async MongoDB client with the configured pool
+            self.client = AsyncMongoClient(
                 config.MONGO_URI,
-                serverSelectionTimeoutMS=5000  # 5 second timeout
+                event_listeners=[self.pool_stats],
+                **client_options()
             )
             
-            # Test the connection
-            self.client.server_info()
+            # Test the connection, then open connections before calls need them
+            await self.client.server_info()
+            await warm_up(self.client, config.MONGO_MIN_POOL_SIZE, self.pool_stats)
             
-            # Get database and collection
+            # Get database and the collections to expose; their tools are built on first use
             self.db = self.client[config.DB_NAME]
-            self.collection = self.db[config.COLLECTION_NAME]
+            if config.COLLECTION_DISCOVERY:
+                self.catalog = CollectionCatalog(
+                    self.db,
+                    self._build_handlers,
+                    allow=parse_globs(config.COLLECTION_ALLOW),
+                    deny=parse_globs(config.COLLECTION_DENY)
+                )
+                collection_names = await self.catalog.names()
+                logger.info(
+                    f"Successfully connected to MongoDB. Discovered {len(collection_names)} "
+                    f"collection(s) in '{config.DB_NAME}'"
+                )
+            else:
+                self.catalog = CollectionCatalog(self.db, self._build_handlers, [config.COLLECTION_NAME])
+                # Test collection access (metadata count, no collection scan)
+                collection_count = await self.db[config.COLLECTION_NAME].estimated_document_count()
+                logger.info(
+                    f"Successfully connected to MongoDB. Collection '{config.COLLECTION_NAME}' "
+                    f"has about {collection_count} documents"
+                )
+            self.index_advice_tool = IndexAdviceTool(self.index_advisor, self.catalog)
+            await self._sync_listings()
+            self.cursors.start()
+            if config.COLLECTION_DISCOVERY:
+                self._catalog_task = asyncio.create_task(self._watch_catalog(), name="catalog-refresh")
             
-            # Test collection access
-            collection_count = self.collection.count_documents({})
-            logger.info(
-                f"Successfully connected to MongoDB. Collection '{config.COLLECTION_NAME}' "
-                f"has {collection_count} documents"
-            )
+            if config.CHANGE_STREAMS_ENABLED:
+                # Discovered collections are watched once their handlers are built
+                self.change_watcher = ChangeStreamWatcher(
+                    self.db, [] if config.COLLECTION_DISCOVERY else [config.COLLECTION_NAME]
+                )
+                self.change_watcher.add_listener(self._on_collection_change)
+                self.change_watcher.add_listener(self.subscriptions.on_change)
+                self.change_watcher.add_state_listener(self._on_change_stream_state)
+                self.change_watcher.start()
+
+            # Pre-warm the configured collection so the first call does not build its tools
+            if not config.COLLECTION_DISCOVERY:
+                await self.catalog.handlers(config.COLLECTION_NAME)
             self.is_connected = True
+            self._ready.set()
+            self.health_monitor = HealthMonitor(
+                lambda: self.client.admin.command('ping'),
+                self.breaker,
+                on_change=self._on_health_change
+            )
+            self.health_monitor.start()
             return True
             
         except (ConnectionFailure, ServerSelectionTimeoutError) as e:
             logger.error(f"Failed to connect to MongoDB: {e}")
-            self.is_connected = False
+            await self._teardown_connection()
             return False
+        except Exception:
+            # Do not leak the client or started tasks into the next attempt
+            await self._teardown_connection()
+            raise
+
+    async def _teardown_connection(self) -> None:
+        """Undo a partial setup_mongodb: stop what it started and close the client."""
+        self.is_connected = False
+        self._ready.clear()
+        if self.health_monitor is not None:
+            await self.health_monitor.stop()
+            self.health_monitor = None
+        if self.change_watcher is not None:
+            await self.change_watcher.stop()
+            self.change_watcher = None
+        if self._catalog_task is not None:
+            self._catalog_task.cancel()
+            await asyncio.gather(self._catalog_task, return_exceptions=True)
+            self._catalog_task = None
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+        self.db = None
+        self.catalog = None
+        self.index_advice_tool = None
+
+    async def _connect(self) -> None:
+        """Connect in the background, retrying with backoff until MongoDB is reachable."""
+        delay = 1.0
+        while True:
+            try:
+                if await self.setup_mongodb():
+                    return
+            except Exception as e:
+                logger.error(f"Error initializing MongoDB connection: {e}")
+            logger.info(f"Retrying MongoDB connection in {delay:g} s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, config.CONNECT_RETRY_MAX_SECONDS)
+
+    async def _wait_until_connected(self) -> Optional[str]:
+        """Wait for the background connection; return an error message if MongoDB cannot be used."""
+        if not self._ready.is_set():
+            try:
+                await asyncio.wait_for(self._ready.wait(), config.CONNECT_WAIT_SECONDS)
+            except asyncio.TimeoutError:
+                return f"MongoDB connection not ready after {config.CONNECT_WAIT_SECONDS:g} s; try again shortly"
+        # Fail fast while the health monitor sees MongoDB as down
+        if not self.breaker.allow():
+            return self.breaker.describe()
+        return None
+
+    def _on_health_change(self, healthy: bool) -> None:
+        """Track reachability reported by the health monitor."""
+        self.is_connected = healthy
+
+    def _build_handlers(self, collection_name: str) -> CollectionHandlers:
+        """Create the tools and resource for a collection on its first use."""
+        if self.change_watcher is not None:
+            self.change_watcher.watch(collection_name)
+        return CollectionHandlers(
+            query_tool=MongoQueryTool(
+                collection_name,
+                self.db,
+                self.executor,
+                cache=self.query_cache,
+                singleflight=self.singleflight,
+                counter=self.counter,
+                cursors=self.cursors,
+                plan_guard=self.plan_guard,
+                advisor=self.index_advisor,
+                cost_guard=self.cost_guard
+            ),
+            aggregate_tool=MongoAggregateTool(collection_name, self.db, self.executor),
+            explain_tool=MongoExplainTool(collection_name, self.db, self.executor),
+            resource=MongoCollectionResource(collection_name, self.db, self.executor, counter=self.counter)
+        )
+
+    async def _collection_names(self) -> List[str]:
+        """Collections to list tools and resources for."""
+        if self.catalog is not None:
+            return await self.catalog.names()
+        return list(self.listings.snapshot.collection_names)
+
+    def _rebuild_listings(self, collection_names: List[str]) -> bool:
+        """Build every tool and resource descriptor; True if the listings changed."""
+        tools = [tool for name in collection_names for tool in self._collection_tools(name)]
+        resources = [self._collection_resource(name) for name in collection_names]
+        return self.listings.update(collection_names, tools + self._server_tools(), resources)
+
+    async def _sync_listings(self) -> None:
+        """Rebuild the listings when the exposed collections changed and tell listing clients."""
+        collection_names = await self._collection_names()
+        if tuple(collection_names) == self.listings.snapshot.collection_names:
+            return
+        if self._rebuild_listings(collection_names):
+            await self._notify_list_changed()
 
-    async def list_resources(self) -> List[Resource]:
-        """List available MongoDB resources."""
+    async def _notify_list_changed(self) -> None:
+        """Send tools and resources list_changed to every session that has listed them."""
+        for session in list(self._listing_sessions):
+            try:
+                await session.send_tool_list_changed()
+                await session.send_resource_list_changed()
+            except Exception as e:
+                logger.debug(f"Dropping session from list_changed notifications: {e}")
+                self._listing_sessions.discard(session)
+
+    def _remember_listing_session(self) -> None:
+        """Track the calling session so it is told when the listings change."""
+        try:
+            self._listing_sessions.add(self.mcp_server.request_context.session)
+        except LookupError:
+            pass
+
+    async def _watch_catalog(self) -> None:
+        """Refresh discovered collections periodically so clients learn about new ones."""
+        while True:
+            await asyncio.sleep(self.catalog.refresh_interval)
+            try:
+                await self._sync_listings()
+            except Exception as e:
+                logger.warning(f"Error refreshing the collection catalog: {e}")
+
+    def _on_collection_change(self, collection_name: str, change: Optional[Dict[str, Any]]) -> None:
+        """Drop cached results and counts for a collection that changed."""
+        if self.query_cache is not None:
+            self.query_cache.invalidate_collection(collection_name)
+        self.counter.invalidate_collection(collection_name)
+
+    def _on_change_stream_state(self, collection_name: str, active: bool) -> None:
+        """Keep results longer while a change stream invalidates them, TTL otherwise."""
+        if self.query_cache is not None:
+            self.query_cache.set_collection_ttl(
+                collection_name, config.CHANGE_STREAM_CACHE_TTL_SECONDS if active else None
+            )
+
+    async def list_resources(self, cursor: Optional[str] = None) -> ListResourcesResult:
+        """List available MongoDB resources from the precomputed listing, one page at a time."""
+        await self._sync_listings()
+        self._remember_listing_session()
+        return self.listings.resource_page(cursor)
+
+    def _collection_resource(self, collection_name: str) -> Resource:
+        """Describe the resource of one collection."""
+        return Resource(
+            name=f"mongo_{collection_name}",
+            uri=f"mongodb://{collection_name}",
+            display_name=f"MongoDB {collection_name}",
+            description=f"Access to MongoDB collection {collection_name}"
+        )
+
+    async def list_resource_templates(self) -> List[ResourceTemplate]:
+        """List parameterized resource URIs for reading a filtered, projected page."""
         return [
-            Resource(
-                name=f"mongo_{config.COLLECTION_NAME}",
-                uri=f"mongodb://{config.COLLECTION_NAME}",
-                display_name=f"MongoDB {config.COLLECTION_NAME}",
-                description=f"Access to MongoDB collection {config.COLLECTION_NAME}"
+            ResourceTemplate(
+                name="mongo_collection_page",
+                uriTemplate=RESOURCE_URI_TEMPLATE,
+                description=(
+                    "Page of a MongoDB collection. filter: JSON query filter; "
+                    "fields: comma-separated fields to return; page: token from "
+                    "the previous page; limit: documents per page (1-100, default 10)"
+                ),
+                mimeType="text/plain"
             )
         ]
 
     async def read_resource(self, uri: str) -> str:
         """Read content from MongoDB resource."""
         try:
-            if not self.is_connected:
-                return "MongoDB connection not initialized"
+            not_ready = await self._wait_until_connected()
+            if not_ready:
+                return not_ready
 
-            # Parse collection name from URI
-            collection_name = uri.split('://')[-1]
+            # Parse collection name and the requested slice from the URI
+            request = parse_resource_uri(str(uri))
+            handlers = await self.catalog.handlers(request.collection_name)
+            if handlers is None:
+                return f"Unknown collection: {request.collection_name}"
             
             # Get documents with pagination
-            cursor = self.collection.find().limit(10)
-            documents = list(cursor)
-            
-            if not documents:
-                return "No documents found in the collection."
-            
-            # Format documents for better readability
-            formatted_docs = []
-            for doc in documents:
-                # Convert ObjectId to string for JSON serialization
-                if '_id' in doc:
-                    doc['_id'] = str(doc['_id'])
-                formatted_docs.append(json.dumps(doc, indent=2, cls=MongoJSONEncoder))
-            
-            return "\n".join(formatted_docs)
+            with deadline(config.TOOL_TIMEOUT_MS):
+                contents = await handlers.resource.get_content(
+                    query=request.query,
+                    limit=request.limit,
+                    page_token=request.page_token,
+                    fields=request.fields
+                )
+            return "\n".join(content.text for content in contents)
                 
         except Exception as e:
             error_msg = f"Error reading resource: {str(e)}"
             logger.error(error_msg)
             return error_msg
 
-    async def list_tools(self) -> List[Tool]:
-        """List available MongoDB query tools."""
+    async def subscribe_resource(self, uri: str) -> None:
+        """Notify the calling session with resources/updated when the resource's collection changes."""
+        # The change stream watcher is created once the background connection is ready
+        not_ready = await self._wait_until_connected()
+        if not_ready:
+            raise ValueError(not_ready)
+        request = parse_resource_uri(uri)
+        if request.collection_name not in await self._collection_names():
+            raise ValueError(f"Unknown collection: {request.collection_name}")
+        if not config.CHANGE_STREAMS_ENABLED:
+            logger.warning(f"Subscribed to {uri}, but change streams are disabled; no updates will be sent")
+        elif self.change_watcher is not None:
+            # Subscribers share the watcher's one stream per collection
+            self.change_watcher.watch(request.collection_name)
+        self.subscriptions.subscribe(
+            uri, request.collection_name, self._session_key(), self.mcp_server.request_context.session
+        )
+
+    async def unsubscribe_resource(self, uri: str) -> None:
+        """Stop sending resources/updated for a URI to the calling session."""
+        self.subscriptions.unsubscribe(uri, self._session_key())
+
+    async def list_tools(self, cursor: Optional[str] = None) -> ListToolsResult:
+        """List available MongoDB query tools from the precomputed listing, one page at a time."""
+        await self._sync_listings()
+        self._remember_listing_session()
+        return self.listings.tool_page(cursor)
+
+    def _collection_tools(self, collection_name: str) -> List[Tool]:
+        """Describe the query, aggregate and explain tools of one collection."""
         return [
             Tool(
-                name=f"query_{config.COLLECTION_NAME}",
-                display_name=f"Query {config.COLLECTION_NAME}",
-                description=f"Query the {config.COLLECTION_NAME} collection in MongoDB",
+                name=f"query_{collection_name}",
+                display_name=f"Query {collection_name}",
+                description=f"Query the {collection_name} collection in MongoDB",
                 inputSchema={
                     "type": "object",
                     "title": "QueryParameters",
@@ -162,86 +448,240 @@ class MongoMCPServer:
                                     "description": "Maximum number of documents",
                                     "minimum": 1,
                                     "maximum": 100
+                                },
+                                "paginate": {
+                                    "type": "boolean",
+                                    "description": (
+                                        "Return a page_token for the next page (sorts by _id as a "
+                                        "tie-breaker; index the sort fields followed by _id)"
+                                    )
+                                },
+                                "page_token": {
+                                    "type": "string",
+                                    "description": "Continuation token from the previous page"
+                                },
+                                "cursor": {
+                                    "type": "boolean",
+                                    "description": "Keep the cursor open and return a handle for fetch_more"
+                                },
+                                "cache": {
+                                    "type": "boolean",
+                                    "description": "Set to false to bypass the result cache"
+                                },
+                                "count": {
+                                    "type": "boolean",
+                                    "description": "Set to false to skip counting the total matches"
                                 }
                             }
                         }
                     },
                     "required": ["query"]
                 }
+            ),
+            Tool(
+                name=f"aggregate_{collection_name}",
+                display_name=f"Aggregate {collection_name}",
+                description=(
+                    f"Run an aggregation pipeline on the {collection_name} collection "
+                    "in MongoDB (grouping and statistics run on the server)"
+                ),
+                inputSchema=AGGREGATE_INPUT_SCHEMA
+            ),
+            Tool(
+                name=f"explain_{collection_name}",
+                display_name=f"Explain {collection_name}",
+                description=(
+                    f"Show the query plan for a {collection_name} query: winning plan, "
+                    "index used, keys vs documents examined and execution time"
+                ),
+                inputSchema=EXPLAIN_INPUT_SCHEMA
             )
         ]
 
+    def _server_tools(self) -> List[Tool]:
+        """Describe the tools that are not tied to a collection."""
+        return [
+            Tool(
+                name="index_advice",
+                display_name="Index advice",
+                description=(
+                    "Suggest compound indexes for the query shapes seen so far, "
+                    "ranked by the query time they could save"
+                ),
+                inputSchema=INDEX_ADVICE_INPUT_SCHEMA
+            ),
+            Tool(
+                name=self.fetch_more_tool.name,
+                display_name=self.fetch_more_tool.display_name,
+                description=self.fetch_more_tool.description,
+                inputSchema=self.fetch_more_tool.inputSchema
+            ),
+            Tool(
+                name="server_stats",
+                display_name="Server statistics",
+                description="Report executor, cache and connection statistics",
+                inputSchema={
+                    "type": "object",
+                    "title": "StatsParameters",
+                    "properties": {}
+                }
+            )
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Collect runtime statistics from the server's subsystems."""
+        return {
+            "connected": self.is_connected,
+            "health": self.health_monitor.stats() if self.health_monitor else None,
+            "executor": self.executor.stats(),
+            "pool": self.pool_stats.stats(),
+            "query_cache": self.query_cache.stats() if self.query_cache else None,
+            "singleflight": self.singleflight.stats(),
+            "counts": self.counter.stats(),
+            "cursors": self.cursors.stats(),
+            "subscriptions": self.subscriptions.stats(),
+            "plan_guard": self.plan_guard.stats(),
+            "index_advisor": self.index_advisor.stats(),
+            "cost_guard": self.cost_guard.stats() if self.cost_guard else None,
+            "catalog": self.catalog.stats() if self.catalog else None,
+            "listings": self.listings.stats(),
+            "change_streams": self.change_watcher.stats() if self.change_watcher else None
+        }
+
     async def call_tool(self, name: str, arguments: Optional[Dict[str, Any]]) -> List[TextContent]:
         """Execute MongoDB query tool."""
         try:
-            if not self.is_connected:
-                return [TextContent(type="text", text="MongoDB connection not initialized")]
+            if name == "server_stats":
+                return [TextContent(type="text", text=json.dumps(self.get_stats(), indent=2))]
 
-            if not name.startswith("query_"):
-                return [TextContent(type="text", text=f"Unknown tool: {name}")]
-                
-            query = arguments.get("query", {})
-            options = arguments.get("options", {})
-            
-            # Validate options
-            allowed_options = {'projection', 'sort', 'limit', 'skip'}
-            filtered_options = {k: v for k, v in options.items() if k in allowed_options}
-            
-            # Execute the query
-            cursor = self.collection.find(query)
-            if filtered_options.get('limit'):
-                cursor = cursor.limit(filtered_options['limit'])
-            if filtered_options.get('sort'):
-                cursor = cursor.sort(list(filtered_options['sort'].items()))
-            if filtered_options.get('projection'):
-                cursor = cursor.project(filtered_options['projection'])
-            
-            results = list(cursor)
-            
-            if not results:
-                return [TextContent(type="text", text="No matching documents found.")]
-            
-            # Format results
-            formatted_results = []
-            for doc in results:
-                if '_id' in doc:
-                    doc['_id'] = str(doc['_id'])
-                formatted_results.append(json.dumps(doc, indent=2, cls=MongoJSONEncoder))
-            
-            result_text = (
-                f"Found {len(results)} matching documents:\n"
-                + "\n".join(formatted_results)
-            )
-            return [TextContent(type="text", text=result_text)]
+            # Early calls wait for the background connection instead of failing
+            not_ready = await self._wait_until_connected()
+            if not_ready:
+                return [TextContent(type="text", text=not_ready)]
+
+            # The deadline is passed down as maxTimeMS; fail_after interrupts
+            # whatever is still waiting when it passes (cursors are then killed)
+            timeout = config.TOOL_TIMEOUT_MS / 1000 if config.TOOL_TIMEOUT_MS > 0 else None
+            with deadline(config.TOOL_TIMEOUT_MS), anyio.fail_after(timeout):
+                return await self._dispatch_tool(name, arguments or {})
             
+        except TimeoutError:
+            error_msg = f"Tool call {name} exceeded its {config.TOOL_TIMEOUT_MS} ms deadline"
+            logger.error(error_msg)
+            return [TextContent(type="text", text=error_msg)]
+        except asyncio.CancelledError:
+            logger.info(f"Tool call {name} cancelled")
+            raise
         except Exception as e:
             error_msg = f"Error executing query: {str(e)}"
             logger.error(error_msg)
             return [TextContent(type="text", text=error_msg)]
 
+    async def _dispatch_tool(self, name: str, arguments: Dict[str, Any]) -> List[TextContent]:
+        """Route a tool call to the tool that serves it."""
+        if name == "fetch_more":
+            return await self.fetch_more_tool.execute(arguments, self._session_key())
+
+        if name == "index_advice":
+            return await self.index_advice_tool.execute(arguments)
+
+        kind, _, collection_name = name.partition("_")
+        if kind not in ("query", "aggregate", "explain"):
+            return [TextContent(type="text", text=f"Unknown tool: {name}")]
+
+        handlers = await self.catalog.handlers(collection_name)
+        if handlers is None:
+            return [TextContent(type="text", text=f"Unknown collection: {collection_name}")]
+
+        if kind == "explain":
+            return await handlers.explain_tool.execute(arguments)
+
+        if kind == "aggregate":
+            return await handlers.aggregate_tool.execute(arguments)
+            
+        # Queries run on the async driver, so other requests keep being
+        # served by the event loop while this one waits on MongoDB
+        return await handlers.query_tool.execute(arguments, self._session_key())
+
+    def _session_key(self) -> str:
+        """Identify the client session of the current request (owner of kept cursors)."""
+        try:
+            return self.mcp_server.request_context.lifespan_context.key
+        except LookupError:
+            return "default"
+
+    @asynccontextmanager
+    async def _session_scope(self, server: Server) -> AsyncIterator[SessionScope]:
+        """
+        Give each client session a stable key and release its state when it ends.
+
+        The MCP server enters this around every session it runs, on every
+        transport, and exits it once the session is closed.
+        """
+        scope = SessionScope(key=uuid.uuid4().hex)
+        try:
+            yield scope
+        finally:
+            self.subscriptions.remove_session(scope.key)
+            closed = await self.cursors.close_session(scope.key)
+            if closed:
+                logger.info(f"Closed {closed} cursor(s) of an ended session")
+
+    def initialization_options(self) -> InitializationOptions:
+        """Capabilities and server info sent in the initialize reply (shared by all transports)."""
+        capabilities = self.mcp_server.get_capabilities(
+            # Discovered collections can come and go; clients are told with list_changed
+            notification_options=NotificationOptions(
+                tools_changed=config.COLLECTION_DISCOVERY,
+                resources_changed=config.COLLECTION_DISCOVERY
+            ),
+            experimental_capabilities={}
+        )
+        # get_capabilities does not detect the subscribe handler
+        capabilities.resources.subscribe = config.CHANGE_STREAMS_ENABLED
+        return InitializationOptions(
+            server_name="stock-data-mcp-server",
+            server_version="0.1.0",
+            capabilities=capabilities
+        )
+
+    async def start(self) -> None:
+        """Start connecting to MongoDB in the background."""
+        # The transport and initialize reply are not held up by the connection
+        if self._connect_task is None:
+            self._connect_task = asyncio.create_task(self._connect(), name="mongodb-connect")
+
+    async def shutdown(self) -> None:
+        """Stop background tasks, close kept cursors and the client, and release the executor."""
+        for task in (self._connect_task, self._catalog_task):
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        if self.health_monitor is not None:
+            await self.health_monitor.stop()
+        if self.change_watcher is not None:
+            await self.change_watcher.stop()
+        await self.subscriptions.stop()
+        await self.cursors.stop()
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+        self.executor.shutdown()
+
     async def run(self):
         """Run the MCP server using stdio transport."""
         logger.info("Starting MCP server...")
         try:
-            # Initialize MongoDB connection first
-            if not self.setup_mongodb():
-                logger.error("Failed to initialize MongoDB connection")
-                return
+            await self.start()
 
             async with stdio_server() as (read_stream, write_stream):
                 logger.info("MCP server stdio transport initialized")
-                init_options = InitializationOptions(
-                    server_name="stock-data-mcp-server",
-                    server_version="0.1.0",
-                    capabilities=self.mcp_server.get_capabilities(
-                        notification_options=NotificationOptions(),
-                        experimental_capabilities={}
-                    )
-                )
                 logger.info("Starting MCP server with initialization options")
-                await self.mcp_server.run(read_stream, write_stream, init_options)
+                await self.mcp_server.run(read_stream, write_stream, self.initialization_options())
         except Exception as e:
             logger.error(f"Error in MCP server: {e}")
+        finally:
+            await self.shutdown()
 
 async def main():
     """Run the server when running as a script."""
@@ -249,4 +689,11 @@ async def main():
     await server.run()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    if config.MCP_TRANSPORT == "http":
+        from .http_transport import serve
+        serve()
+    elif config.MCP_TRANSPORT == "daemon":
+        from .daemon import run_daemon
+        run_daemon()
+    else:
+        asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,100 @@
+"""
+Thin stdio shim for the shared daemon.
+
+Configure desktop clients to run `python -m src.mongo_mcp_server.shim`
+instead of the server. The shim connects to the daemon's Unix socket,
+starting the daemon first if none is running, and copies bytes between
+its stdin/stdout and the socket. Messages are not parsed, and the shim
+opens no MongoDB connection and holds no caches of its own.
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from . import config
+
+def _spawn_daemon(path: str) -> None:
+    """Start a detached daemon that outlives this shim."""
+    log_path = os.path.join(os.path.dirname(path), 'daemon.log')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(log_path, 'ab') as log:
+        subprocess.Popen(
+            [sys.executable, '-m', f'{__package__}.server'],
+            env={**os.environ, 'MCP_TRANSPORT': 'daemon', 'DAEMON_SOCKET_PATH': path},
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True
+        )
+
+async def _connect(path: str) -> tuple:
+    """Connect to the daemon, starting it if needed and allowed."""
+    try:
+        return await asyncio.open_unix_connection(path)
+    except OSError:
+        if not config.DAEMON_AUTOSTART:
+            raise
+    _spawn_daemon(path)
+    give_up_at = time.monotonic() + config.DAEMON_START_TIMEOUT_SECONDS
+    while True:
+        await asyncio.sleep(0.1)
+        try:
+            return await asyncio.open_unix_connection(path)
+        except OSError:
+            if time.monotonic() > give_up_at:
+                raise
+
+async def _pump(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    while True:
+        data = await reader.read(65536)
+        if not data:
+            break
+        writer.write(data)
+        await writer.drain()
+
+async def forward(path: str = config.DAEMON_SOCKET_PATH) -> int:
+    """
+    Forward stdin to the daemon and the daemon's replies to stdout.
+
+    Args:
+        path (str): Daemon socket path
+
+    Returns:
+        int: Exit status (1 if the daemon could not be reached or closed the connection)
+    """
+    try:
+        socket_reader, socket_writer = await _connect(path)
+    except OSError as e:
+        print(f"Cannot reach the MCP daemon at {path}: {e}", file=sys.stderr)
+        return 1
+
+    loop = asyncio.get_running_loop()
+    stdin = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(stdin), sys.stdin)
+    transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, sys.stdout)
+    stdout = asyncio.StreamWriter(transport, protocol, None, loop)
+
+    upstream = asyncio.create_task(_pump(stdin, socket_writer))
+    downstream = asyncio.create_task(_pump(socket_reader, stdout))
+    done, _ = await asyncio.wait({upstream, downstream}, return_when=asyncio.FIRST_COMPLETED)
+    if upstream in done:
+        # The client closed stdin: let the daemon end the session and flush its replies
+        if socket_writer.can_write_eof():
+            socket_writer.write_eof()
+        await downstream
+        status = 0
+    else:
+        print("MCP daemon closed the connection", file=sys.stderr)
+        upstream.cancel()
+        status = 1
+    socket_writer.close()
+    return status
+
+def main() -> None:
+    """Run the shim as a script."""
+    sys.exit(asyncio.run(forward()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Request coalescing for identical concurrent operations.
+
+When several callers ask for the same key while a call is already in flight,
+they all wait on that call instead of starting their own.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class SingleFlight:
+    def __init__(self):
+        """Initialize an empty set of in-flight calls."""
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[asyncio.Task, int] = {}
+        self.executed = 0
+        self.deduplicated = 0
+        self.abandoned = 0
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run func once per key among concurrent callers and share its result.
+
+        The shared call runs in its own task, so a caller that is cancelled
+        does not cancel the work other callers are waiting on. When the last
+        waiting caller is cancelled, the shared call is cancelled too, which
+        closes its cursor instead of leaving it running on the server.
+
+        Args:
+            key (str): Identity of the operation
+            func (Callable[[], Awaitable[T]]): Coroutine factory performing the operation
+
+        Returns:
+            T: The result of the shared call
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self.executed += 1
+        else:
+            self.deduplicated += 1
+            logger.debug(f"Joined in-flight request {key}")
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[task] == 1 and not task.done():
+                self.abandoned += 1
+                task.cancel()
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every caller went away
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return executed, deduplicated and in-flight call counts."""
+        return {
+            "executed": self.executed,
+            "deduplicated": self.deduplicated,
+            "abandoned": self.abandoned,
+            "in_flight": len(self._inflight)
+        }
@@ -0,0 +1,133 @@
+"""
+Resource subscriptions pushed from change streams.
+
+Clients subscribe to resource URIs; every subscribed collection shares the
+server's single change stream for it. Change events are debounced per
+collection, so a burst of writes produces one resources/updated
+notification per subscribed URI and session rather than one per write.
+A session's subscriptions are dropped when it ends or a notification to it
+fails.
+"""
+
+from typing import Any, Dict, Mapping, Optional, Set
+import asyncio
+import logging
+from pydantic import AnyUrl
+from . import config
+
+logger = logging.getLogger(__name__)
+
+class SubscriptionManager:
+    def __init__(self, debounce: float = config.SUBSCRIPTION_DEBOUNCE_SECONDS):
+        """
+        Initialize the subscription manager.
+
+        Args:
+            debounce (float): Seconds to collect change events before notifying
+        """
+        self.debounce = debounce
+        # uri -> collection name, and uri -> {session key: session}
+        self._collections: Dict[str, str] = {}
+        self._subscribers: Dict[str, Dict[str, Any]] = {}
+        self._timers: Dict[str, asyncio.Task] = {}
+        self.notifications = 0
+        self.coalesced = 0
+        self.failures = 0
+
+    def subscribe(self, uri: str, collection_name: str, session_key: str, session: Any) -> None:
+        """
+        Subscribe a client session to a resource URI.
+
+        Args:
+            uri (str): Resource URI as given by the client
+            collection_name (str): Collection the resource reads
+            session_key (str): Stable identity of the client session
+            session: MCP server session to notify
+        """
+        self._collections[uri] = collection_name
+        self._subscribers.setdefault(uri, {})[session_key] = session
+
+    def unsubscribe(self, uri: str, session_key: str) -> bool:
+        """
+        Remove a session's subscription to a resource URI.
+
+        Returns:
+            bool: True if the session was subscribed
+        """
+        sessions = self._subscribers.get(uri)
+        if sessions is None or sessions.pop(session_key, None) is None:
+            return False
+        if not sessions:
+            del self._subscribers[uri]
+            del self._collections[uri]
+        return True
+
+    def remove_session(self, session_key: str) -> int:
+        """
+        Drop every subscription held by a session, e.g. when it ends.
+
+        Returns:
+            int: Number of subscriptions removed
+        """
+        return sum(self.unsubscribe(uri, session_key) for uri in list(self._subscribers))
+
+    def collections(self) -> Set[str]:
+        """Return the collections that have at least one subscriber."""
+        return set(self._collections.values())
+
+    def on_change(self, collection_name: str, change: Optional[Mapping[str, Any]]) -> None:
+        """
+        Change stream listener: schedule a debounced notification for the collection.
+
+        A None change (stream lost, events may have been missed) notifies too.
+        """
+        if collection_name not in self.collections():
+            return
+        if collection_name in self._timers:
+            self.coalesced += 1
+            return
+        self._timers[collection_name] = asyncio.create_task(
+            self._notify_after_debounce(collection_name),
+            name=f"resource-updated-{collection_name}"
+        )
+
+    async def _notify_after_debounce(self, collection_name: str) -> None:
+        try:
+            await asyncio.sleep(self.debounce)
+        finally:
+            self._timers.pop(collection_name, None)
+
+        sends = [
+            self._send(uri, session_key, session)
+            for uri, name in list(self._collections.items()) if name == collection_name
+            for session_key, session in list(self._subscribers.get(uri, {}).items())
+        ]
+        await asyncio.gather(*sends)
+
+    async def _send(self, uri: str, session_key: str, session: Any) -> None:
+        try:
+            await session.send_resource_updated(AnyUrl(uri))
+            self.notifications += 1
+        except Exception as e:
+            # The session is gone; stop notifying it
+            logger.info(f"Dropping subscriptions of a closed session: {e}")
+            self.failures += 1
+            self.remove_session(session_key)
+
+    async def stop(self) -> None:
+        """Cancel pending notifications."""
+        for task in self._timers.values():
+            task.cancel()
+        await asyncio.gather(*self._timers.values(), return_exceptions=True)
+        self._timers.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return subscription counts and notification counters."""
+        return {
+            "uris": len(self._subscribers),
+            "sessions": len({key for sessions in self._subscribers.values() for key in sessions}),
+            "subscriptions": sum(len(sessions) for sessions in self._subscribers.values()),
+            "notifications": self.notifications,
+            "coalesced_events": self.coalesced,
+            "failed_sends": self.failures
+        }
@@ -2,6 +2,16 @@
 MongoDB MCP Tools.
 """
 
+from .aggregate_tool import MongoAggregateTool
+from .explain_tool import MongoExplainTool
+from .fetch_more_tool import FetchMoreTool
+from .index_advice_tool import IndexAdviceTool
 from .query_tool import MongoQueryTool
 
-__all__ = ['MongoQueryTool']
\ No newline at end of file
+__all__ = [
+    'FetchMoreTool',
+    'IndexAdviceTool',
+    'MongoAggregateTool',
+    'MongoExplainTool',
+    'MongoQueryTool'
+]
\ No newline at end of file
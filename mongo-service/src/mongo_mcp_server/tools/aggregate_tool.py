@@ -0,0 +1,183 @@
+"""
+MongoDB Aggregation Tool implementation.
+"""
+
+from mcp.types import Tool, TextContent
+from pymongo.asynchronous.database import AsyncDatabase
+from typing import Dict, Any, List, Optional
+import logging
+from .. import config
+from ..deadlines import max_time_ms as deadline_max_time_ms
+from ..encoding import RAW_CODEC_OPTIONS
+from ..executor import MongoExecutor
+from ..formatting import StreamingFormatter
+
+logger = logging.getLogger(__name__)
+
+# Read-only stages that stay within the collection
+ALLOWED_STAGES = {
+    '$match', '$project', '$addFields', '$set', '$unset', '$group', '$sort',
+    '$limit', '$skip', '$count', '$unwind', '$bucket', '$bucketAuto',
+    '$sortByCount', '$facet', '$replaceRoot', '$replaceWith', '$sample',
+    '$setWindowFields', '$densify', '$fill', '$geoNear', '$redact'
+}
+# Server-side JavaScript is never allowed, in any stage
+FORBIDDEN_OPERATORS = {'$where', '$function', '$accumulator'}
+
+AGGREGATE_INPUT_SCHEMA = {
+    "type": "object",
+    "title": "AggregateParameters",
+    "properties": {
+        "pipeline": {
+            "type": "array",
+            "description": "Aggregation pipeline stages (no $out, $merge or cross-collection stages)",
+            "items": {"type": "object"}
+        },
+        "options": {
+            "type": "object",
+            "description": "Aggregation options",
+            "properties": {
+                "allowDiskUse": {
+                    "type": "boolean",
+                    "description": "Let $group and $sort spill to disk for large inputs (if the server allows it)"
+                },
+                "maxTimeMS": {
+                    "type": "integer",
+                    "description": "Server-side time limit in milliseconds",
+                    "minimum": 1
+                }
+            }
+        }
+    },
+    "required": ["pipeline"]
+}
+
+def validate_pipeline(pipeline: Any) -> List[Dict[str, Any]]:
+    """
+    Check a pipeline against the stage allowlist.
+
+    Args:
+        pipeline (Any): Pipeline as received from the client
+
+    Returns:
+        List[Dict[str, Any]]: The validated pipeline
+
+    Raises:
+        ValueError: If a stage is malformed or not allowed
+    """
+    if not isinstance(pipeline, list):
+        raise ValueError("pipeline must be an array of stages")
+    for stage in pipeline:
+        if not isinstance(stage, dict) or len(stage) != 1:
+            raise ValueError(f"Each stage must be an object with exactly one operator: {stage}")
+        name, spec = next(iter(stage.items()))
+        if name not in ALLOWED_STAGES:
+            raise ValueError(f"Stage {name} is not allowed")
+        if name == '$facet':
+            if not isinstance(spec, dict):
+                raise ValueError("$facet must map output fields to pipelines")
+            for sub_pipeline in spec.values():
+                validate_pipeline(sub_pipeline)
+        _check_operators(spec)
+    return pipeline
+
+def aggregate_options(options: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Clamp client aggregation options to the configured limits.
+
+    Args:
+        options (Dict[str, Any], optional): Options as received from the client
+
+    Returns:
+        Dict[str, Any]: {"maxTimeMS": int, "allowDiskUse": bool} to pass to aggregate()
+    """
+    options = options or {}
+    max_time_ms = options.get("maxTimeMS")
+    if not isinstance(max_time_ms, int) or isinstance(max_time_ms, bool) or max_time_ms <= 0:
+        max_time_ms = config.AGGREGATE_MAX_TIME_MS
+    return {
+        # Also bounded by the time left for this tool call
+        "maxTimeMS": deadline_max_time_ms(min(max_time_ms, config.AGGREGATE_MAX_TIME_MS)),
+        # Clients can opt out of disk use, but only enable it where the server allows it
+        "allowDiskUse": config.AGGREGATE_ALLOW_DISK_USE and options.get("allowDiskUse", True) is not False
+    }
+
+def _check_operators(value: Any) -> None:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key in FORBIDDEN_OPERATORS:
+                raise ValueError(f"Operator {key} is not allowed")
+            _check_operators(item)
+    elif isinstance(value, list):
+        for item in value:
+            _check_operators(item)
+
+class MongoAggregateTool(Tool):
+    def __init__(
+        self,
+        collection_name: str,
+        db: AsyncDatabase,
+        executor: Optional[MongoExecutor] = None,
+        raw_bson: bool = config.RAW_BSON
+    ):
+        """
+        Initialize MongoDB Aggregation Tool.
+
+        Args:
+            collection_name (str): Name of the MongoDB collection
+            db (AsyncDatabase): Async MongoDB database instance
+            executor (MongoExecutor, optional): Shared executor for concurrency limits
+            raw_bson (bool): Read result documents as RawBSONDocument
+        """
+        super().__init__(
+            name=f"aggregate_{collection_name}",
+            display_name=f"Aggregate {collection_name}",
+            description=f"Run an aggregation pipeline on the {collection_name} collection in MongoDB",
+            inputSchema=AGGREGATE_INPUT_SCHEMA
+        )
+        self.collection = db[collection_name]
+        self.collection_name = collection_name
+        self.read_collection = (
+            self.collection.with_options(codec_options=RAW_CODEC_OPTIONS)
+            if raw_bson else self.collection
+        )
+        self.executor = executor or MongoExecutor()
+        self.formatter = StreamingFormatter(self.executor)
+
+    async def execute(self, params: Dict[str, Any]) -> List[TextContent]:
+        """
+        Execute an aggregation pipeline on the MongoDB collection.
+
+        Args:
+            params (Dict[str, Any]): {
+                "pipeline": List of aggregation stages,
+                "options": {"allowDiskUse": bool, "maxTimeMS": int} (optional)
+            }
+
+        Returns:
+            List[TextContent]: List of text content representing the results
+        """
+        try:
+            pipeline = validate_pipeline(params.get("pipeline"))
+            options = aggregate_options(params.get("options"))
+
+            async with self.executor.limit(self.collection_name):
+                cursor = await self.read_collection.aggregate(
+                    pipeline,
+                    batchSize=self.formatter.batch_size,
+                    **options
+                )
+                # Results are streamed batch by batch and cut off at the byte budget
+                results = await self.formatter.format_cursor(cursor)
+
+            if not results.count:
+                return [TextContent(type="text", text="Aggregation returned no documents.")]
+            result_text = f"Aggregation returned {results.count} document(s):\n" + results.text
+            if results.truncated:
+                result_text += f"\n... output truncated at {self.formatter.max_bytes} bytes."
+            return [TextContent(type="text", text=result_text)]
+
+        except Exception as e:
+            error_msg = f"Error running aggregation on {self.collection_name}: {str(e)}"
+            logger.error(error_msg)
+            return [TextContent(type="text", text=error_msg)]
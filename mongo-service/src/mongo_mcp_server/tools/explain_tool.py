@@ -0,0 +1,116 @@
+"""
+MongoDB Explain Tool implementation.
+"""
+
+from mcp.types import Tool, TextContent
+from pymongo.asynchronous.database import AsyncDatabase
+from typing import Dict, Any, List, Optional, Set
+import logging
+from ..executor import MongoExecutor
+from ..explain import explain_find, summarize_explain
+from ..pagination import plan_find, validate_find_options
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_INPUT_SCHEMA = {
+    "type": "object",
+    "title": "ExplainParameters",
+    "properties": {
+        "query": {
+            "type": "object",
+            "description": "MongoDB query filter"
+        },
+        "options": {
+            "type": "object",
+            "description": "The same options the query tool accepts",
+            "properties": {
+                "projection": {
+                    "type": "object",
+                    "description": "Fields to include/exclude"
+                },
+                "sort": {
+                    "type": "object",
+                    "description": "Sort criteria"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of documents",
+                    "minimum": 1,
+                    "maximum": 100
+                },
+                "skip": {
+                    "type": "integer",
+                    "description": "Number of documents to skip",
+                    "minimum": 0
+                },
+                "paginate": {
+                    "type": "boolean",
+                    "description": "Explain the query as the first page of a paginated query"
+                },
+                "page_token": {
+                    "type": "string",
+                    "description": "Explain the query as the page this token continues to"
+                }
+            }
+        }
+    },
+    "required": ["query"]
+}
+
+class MongoExplainTool(Tool):
+    # Query tool options that change the find command being explained
+    ALLOWED_OPTIONS: Set[str] = {'projection', 'sort', 'limit', 'skip', 'paginate', 'page_token'}
+
+    def __init__(
+        self,
+        collection_name: str,
+        db: AsyncDatabase,
+        executor: Optional[MongoExecutor] = None
+    ):
+        """
+        Initialize MongoDB Explain Tool.
+
+        Args:
+            collection_name (str): Name of the MongoDB collection
+            db (AsyncDatabase): Async MongoDB database instance
+            executor (MongoExecutor, optional): Shared executor for concurrency limits
+        """
+        super().__init__(
+            name=f"explain_{collection_name}",
+            display_name=f"Explain {collection_name}",
+            description=f"Show the query plan MongoDB uses for a query on the {collection_name} collection",
+            inputSchema=EXPLAIN_INPUT_SCHEMA
+        )
+        self.collection = db[collection_name]
+        self.collection_name = collection_name
+        self.executor = executor or MongoExecutor()
+
+    async def execute(self, params: Dict[str, Any]) -> List[TextContent]:
+        """
+        Explain a query with executionStats verbosity.
+
+        Args:
+            params (Dict[str, Any]): {
+                "query": MongoDB query filter,
+                "options": projection, sort, limit, skip, paginate and page_token (optional)
+            }
+
+        Returns:
+            List[TextContent]: Compact plan summary
+        """
+        try:
+            query = params.get("query", {})
+            options = validate_find_options(params.get("options") or {}, self.ALLOWED_OPTIONS)
+
+            # The same find command the query tool would send, tie-breaker,
+            # page range and widened projection included
+            spec = plan_find(query, options)
+            async with self.executor.limit(self.collection_name):
+                explain = await explain_find(self.collection, spec)
+            summary = summarize_explain(explain)
+            return [TextContent(type="text", text=summary.describe())]
+
+        except Exception as e:
+            error_msg = f"Error explaining query on {self.collection_name}: {str(e)}"
+            logger.error(error_msg)
+            return [TextContent(type="text", text=error_msg)]
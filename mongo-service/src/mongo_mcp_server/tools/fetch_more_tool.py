@@ -0,0 +1,95 @@
+"""
+Fetch More Tool implementation.
+"""
+
+from mcp.types import Tool, TextContent
+from pymongo.errors import CursorNotFound
+from typing import Dict, Any, List
+import logging
+from ..cursors import CursorHandleError, CursorRegistry
+
+logger = logging.getLogger(__name__)
+
+class FetchMoreTool(Tool):
+    def __init__(self, cursors: CursorRegistry):
+        """
+        Initialize the Fetch More Tool.
+
+        Args:
+            cursors (CursorRegistry): Registry holding the cursors kept open by queries
+        """
+        super().__init__(
+            name="fetch_more",
+            display_name="Fetch more results",
+            description="Read the next batch from a cursor opened by a query with options.cursor = true",
+            inputSchema={
+                "type": "object",
+                "title": "FetchMoreParameters",
+                "properties": {
+                    "cursor": {
+                        "type": "string",
+                        "description": "Cursor handle returned by the query"
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of documents",
+                        "minimum": 1,
+                        "maximum": 100
+                    },
+                    "close": {
+                        "type": "boolean",
+                        "description": "Close the cursor instead of reading from it"
+                    }
+                },
+                "required": ["cursor"]
+            }
+        )
+        self.cursors = cursors
+
+    async def execute(self, params: Dict[str, Any], session_key: str = "default") -> List[TextContent]:
+        """
+        Fetch the next batch of documents from an open cursor.
+
+        Args:
+            params (Dict[str, Any]): {
+                "cursor": Cursor handle,
+                "limit": Maximum number of documents (optional),
+                "close": Close the cursor instead (optional)
+            }
+            session_key (str): Identity of the calling client session
+
+        Returns:
+            List[TextContent]: List of text content representing the documents
+        """
+        handle = params.get("cursor", "")
+        try:
+            if params.get("close"):
+                closed = await self.cursors.close(handle, session_key)
+                text = f"Cursor {handle} closed." if closed else f"Cursor {handle} not found."
+                return [TextContent(type="text", text=text)]
+
+            limit = params.get("limit")
+            if not isinstance(limit, int) or not 1 <= limit <= 100:
+                limit = self.cursors.formatter.batch_size
+            results, more = await self.cursors.fetch(handle, session_key, limit)
+
+            if not results.count:
+                return [TextContent(type="text", text="No more documents.")]
+            result_text = f"Showing {results.count} more document(s):\n" + results.text
+            if results.truncated:
+                result_text += f"\n... output truncated at {self.cursors.formatter.max_bytes} bytes."
+            if more:
+                result_text += f"\nMore results: call fetch_more with {{\"cursor\": \"{handle}\"}}"
+            else:
+                result_text += "\nCursor exhausted."
+            return [TextContent(type="text", text=result_text)]
+
+        except CursorHandleError as e:
+            return [TextContent(type="text", text=str(e))]
+        except CursorNotFound:
+            # The server killed the cursor (e.g. its own idle timeout)
+            return [TextContent(type="text", text=f"Cursor {handle} expired on the server; run the query again")]
+        except Exception as e:
+            error_msg = f"Error fetching from cursor {handle}: {str(e)}"
+            logger.error(error_msg)
+            return [TextContent(type="text", text=error_msg)]
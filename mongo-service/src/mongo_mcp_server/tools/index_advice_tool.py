@@ -0,0 +1,80 @@
+"""
+Index Advice Tool implementation.
+"""
+
+from mcp.types import Tool, TextContent
+from pymongo.asynchronous.collection import AsyncCollection
+from typing import Dict, Any, List, Mapping
+import json
+import logging
+from ..advisor import IndexAdvisor
+
+logger = logging.getLogger(__name__)
+
+INDEX_ADVICE_INPUT_SCHEMA = {
+    "type": "object",
+    "title": "IndexAdviceParameters",
+    "properties": {
+        "limit": {
+            "type": "integer",
+            "description": "Maximum number of suggestions",
+            "minimum": 1,
+            "maximum": 50
+        }
+    }
+}
+
+class IndexAdviceTool(Tool):
+    def __init__(self, advisor: IndexAdvisor, collections: Mapping[str, AsyncCollection]):
+        """
+        Initialize the Index Advice Tool.
+
+        Args:
+            advisor (IndexAdvisor): Advisor holding the observed query shapes
+            collections (Mapping[str, AsyncCollection]): Collections whose indexes are checked
+        """
+        super().__init__(
+            name="index_advice",
+            display_name="Index advice",
+            description="Suggest compound indexes for the query shapes seen so far, ranked by time they could save",
+            inputSchema=INDEX_ADVICE_INPUT_SCHEMA
+        )
+        self.advisor = advisor
+        self.collections = collections
+
+    async def execute(self, params: Dict[str, Any]) -> List[TextContent]:
+        """
+        Report index suggestions.
+
+        Args:
+            params (Dict[str, Any]): {"limit": Maximum number of suggestions (optional)}
+
+        Returns:
+            List[TextContent]: Ranked suggestions and the shapes already covered
+        """
+        try:
+            limit = params.get("limit")
+            if not isinstance(limit, int) or not 1 <= limit <= 50:
+                limit = 10
+            suggestions, covered = await self.advisor.advise(self.collections)
+
+            if suggestions:
+                lines = [f"{len(suggestions)} index suggestion(s), ranked by observed query time:"]
+                lines.extend(
+                    f"{rank}. {suggestion.describe()}"
+                    for rank, suggestion in enumerate(suggestions[:limit], start=1)
+                )
+            else:
+                lines = ["No index suggestions: every observed query shape is served by an index."]
+            if covered:
+                lines.append(f"{len(covered)} shape(s) already covered by existing indexes:")
+                lines.extend(
+                    f"- {json.dumps(shape.filter)} -> {index_name}"
+                    for shape, index_name in covered[:limit]
+                )
+            return [TextContent(type="text", text="\n".join(lines))]
+
+        except Exception as e:
+            error_msg = f"Error computing index advice: {str(e)}"
+            logger.error(error_msg)
+            return [TextContent(type="text", text=error_msg)]
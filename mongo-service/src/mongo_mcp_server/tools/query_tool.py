@@ -3,24 +3,64 @@ MongoDB Query Tool implementation.
 """
 
 from mcp.types import Tool, TextContent
-from pymongo.database import Database
-from typing import Dict, Any, List, Set
-import json
+from pymongo.asynchronous.database import AsyncDatabase
+from typing import Dict, Any, List, Optional, Set
+import asyncio
 import logging
+import time
+from .. import config
+from ..advisor import IndexAdvisor
+from ..cache import QueryCache
+from ..counting import CountStrategy
+from ..cursors import CursorRegistry
+from ..deadlines import max_time_ms, shielded_close
+from ..encoding import RAW_CODEC_OPTIONS
+from ..executor import MongoExecutor
+from ..explain import PlanGuard
+from ..formatting import StreamingFormatter
+from ..guardrails import CostGuard
+from ..pagination import FindSpec, PageTokenError, encode_page_token, plan_find, validate_find_options
+from ..singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
 class MongoQueryTool(Tool):
     # Set of allowed MongoDB query options
-    ALLOWED_OPTIONS: Set[str] = {'projection', 'sort', 'limit', 'skip'}
+    ALLOWED_OPTIONS: Set[str] = {
+        'projection', 'sort', 'limit', 'skip', 'paginate', 'page_token', 'cursor', 'cache', 'count'
+    }
 
-    def __init__(self, collection_name: str, db: Database):
+    def __init__(
+        self,
+        collection_name: str,
+        db: AsyncDatabase,
+        executor: Optional[MongoExecutor] = None,
+        raw_bson: bool = config.RAW_BSON,
+        cache: Optional[QueryCache] = None,
+        singleflight: Optional[SingleFlight] = None,
+        counter: Optional[CountStrategy] = None,
+        cursors: Optional[CursorRegistry] = None,
+        plan_guard: Optional[PlanGuard] = None,
+        advisor: Optional[IndexAdvisor] = None,
+        cost_guard: Optional[CostGuard] = None
+    ):
         """
         Initialize MongoDB Query Tool.
         
         Args:
             collection_name (str): Name of the MongoDB collection
-            db (Database): MongoDB database instance
+            db (AsyncDatabase): Async MongoDB database instance
+            executor (MongoExecutor, optional): Shared executor for concurrency limits
+            raw_bson (bool): Read documents as RawBSONDocument and encode them without
+                decoding into dicts first
+            cache (QueryCache, optional): Shared result cache; results are not cached if omitted
+            singleflight (SingleFlight, optional): Shared coalescing layer for identical queries
+            counter (CountStrategy, optional): Strategy used to report total matches
+            cursors (CursorRegistry, optional): Registry for cursors kept open across
+                calls; the cursor option is rejected if omitted
+            plan_guard (PlanGuard, optional): Warns about or rejects collection scans
+            advisor (IndexAdvisor, optional): Records query shapes and latencies for index advice
+            cost_guard (CostGuard, optional): Lowers oversized limits and rejects unindexed sorts
         """
         super().__init__(
             name=f"query_{collection_name}",  # Required: Unique name for the tool
@@ -54,8 +94,31 @@ class MongoQueryTool(Tool):
                             },
                             "skip": {
                                 "type": "integer",
-                                "description": "Number of documents to skip",
+                                "description": "Number of documents to skip (prefer page_token)",
                                 "minimum": 0
+                            },
+                            "paginate": {
+                                "type": "boolean",
+                                "description": (
+                                    "Return a page_token for the next page (sorts by _id as a "
+                                    "tie-breaker; index the sort fields followed by _id)"
+                                )
+                            },
+                            "page_token": {
+                                "type": "string",
+                                "description": "Continuation token from the previous page; use with the same query and sort"
+                            },
+                            "cursor": {
+                                "type": "boolean",
+                                "description": "Keep the cursor open and return a handle for fetch_more"
+                            },
+                            "cache": {
+                                "type": "boolean",
+                                "description": "Set to false to bypass the result cache"
+                            },
+                            "count": {
+                                "type": "boolean",
+                                "description": "Set to false to skip counting the total matches"
                             }
                         }
                     }
@@ -65,29 +128,22 @@ class MongoQueryTool(Tool):
         )
         self.collection = db[collection_name]
         self.collection_name = collection_name
+        self.raw_bson = raw_bson
+        self.read_collection = (
+            self.collection.with_options(codec_options=RAW_CODEC_OPTIONS)
+            if raw_bson else self.collection
+        )
+        self.executor = executor or MongoExecutor()
+        self.formatter = StreamingFormatter(self.executor)
+        self.cache = cache
+        self.singleflight = singleflight or SingleFlight()
+        self.counter = counter or CountStrategy()
+        self.cursors = cursors
+        self.plan_guard = plan_guard
+        self.advisor = advisor
+        self.cost_guard = cost_guard
 
-    def _validate_options(self, options: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Validate and filter MongoDB query options.
-        
-        Args:
-            options (Dict[str, Any]): Raw query options
-            
-        Returns:
-            Dict[str, Any]: Validated and filtered options
-        """
-        validated = {}
-        for key, value in options.items():
-            if key in self.ALLOWED_OPTIONS:
-                if key == 'limit' and (not isinstance(value, int) or value > 100):
-                    validated[key] = 100  # Cap limit at 100
-                elif key == 'skip' and (not isinstance(value, int) or value < 0):
-                    validated[key] = 0  # Ensure skip is non-negative
-                else:
-                    validated[key] = value
-        return validated
-
-    async def execute(self, params: Dict[str, Any]) -> List[TextContent]:
+    async def execute(self, params: Dict[str, Any], session_key: str = "default") -> List[TextContent]:
         """
         Execute a query on the MongoDB collection.
         
@@ -96,52 +152,195 @@ class MongoQueryTool(Tool):
                 "query": MongoDB query filter,
                 "options": MongoDB query options (optional)
             }
+            session_key (str): Identity of the calling client session, owner of kept cursors
             
         Returns:
             List[TextContent]: List of text content representing the query results
         """
         try:
             query = params.get("query", {})
-            options = self._validate_options(params.get("options", {}))
+            options = validate_find_options(params.get("options") or {}, self.ALLOWED_OPTIONS)
             
-            # Get total count for the query
-            total_count = self.collection.count_documents(query)
+            # Paginated queries get the _id tie-breaker and resolve their token
+            # into a range on the sort keys; others keep the caller's sort
+            spec = plan_find(query, options)
             
-            # Execute the query with options
-            cursor = self.collection.find(query)
+            if options.get('cursor'):
+                if self.cursors is None:
+                    raise ValueError("Cursor sessions are not enabled")
+                if spec.paginate:
+                    raise PageTokenError("page_token and paginate cannot be combined with cursor")
+                # An open cursor belongs to one caller, so it is never cached or shared
+                result_text = await self._run_query(options, spec, session_key)
+                return [TextContent(type="text", text=result_text)]
             
-            # Apply options
-            if options.get('projection'):
-                cursor = cursor.projection(options['projection'])
-            if options.get('sort'):
-                cursor = cursor.sort(list(options['sort'].items()))
-            if options.get('skip'):
-                cursor = cursor.skip(options['skip'])
-            if options.get('limit'):
-                cursor = cursor.limit(options['limit'])
+            cache_key = spec.cache_key(self.collection_name)
+            if options.get('count', True) is False:
+                # The response has no total line, so it must not share a cache entry
+                cache_key += ":nocount"
+            if spec.paginate:
+                # Only paginated responses end with a page token
+                cache_key += ":paginate"
+            use_cache = self.cache is not None and options.get('cache', True) is not False
+            if use_cache:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    return [TextContent(type="text", text=cached)]
             
-            # Get results
-            results = list(cursor)
-            
-            if not results:
-                return [TextContent(text="No matching documents found.")]
-            
-            # Format results
-            formatted_results = []
-            for doc in results:
-                if '_id' in doc:
-                    doc['_id'] = str(doc['_id'])
-                formatted_results.append(json.dumps(doc, indent=2))
-            
-            # Prepare result text
-            result_text = (
-                f"Found {total_count} total matching documents.\n"
-                f"Showing {len(results)} document(s):\n"
-                + "\n".join(formatted_results)
+            # Identical concurrent queries share one round trip and one response
+            store_key = cache_key if use_cache else None
+            result_text = await self.singleflight.do(
+                cache_key, lambda: self._run_and_cache(store_key, options, spec)
             )
-            return [TextContent(text=result_text)]
+            return [TextContent(type="text", text=result_text)]
             
         except Exception as e:
             error_msg = f"Error executing query on {self.collection_name}: {str(e)}"
             logger.error(error_msg)
-            return [TextContent(text=error_msg)]
\ No newline at end of file
+            return [TextContent(type="text", text=error_msg)]
+
+    async def _run_and_cache(
+        self,
+        cache_key: Optional[str],
+        options: Dict[str, Any],
+        spec: FindSpec
+    ) -> str:
+        """
+        Run the query and cache its response unless the collection changed meanwhile.
+        
+        Args:
+            cache_key (str, optional): Key to cache the response under; None to skip caching
+            options (Dict[str, Any]): Validated query options
+            spec (FindSpec): Find command to run
+            
+        Returns:
+            str: Formatted result text
+        """
+        # Read in the task that runs the query, so callers joining it later
+        # cannot cache a result that predates an invalidation
+        generation = self.cache.generation(self.collection_name) if cache_key else None
+        result_text = await self._run_query(options, spec)
+        if cache_key:
+            self.cache.set(cache_key, result_text, self.collection_name, generation)
+        return result_text
+
+    async def _run_query(
+        self,
+        options: Dict[str, Any],
+        spec: FindSpec,
+        session_key: str = "default"
+    ) -> str:
+        """
+        Run the query against MongoDB and format the response text.
+        
+        Args:
+            options (Dict[str, Any]): Validated query options
+            spec (FindSpec): Find command to run (filter, projection, sort, skip, limit)
+            session_key (str): Owner of the cursor when the cursor option is set
+            
+        Returns:
+            str: Formatted result text
+        """
+        query = spec.query
+        async with self.executor.limit(self.collection_name):
+            # Count concurrently with the find instead of before it
+            count_task = None
+            if options.get('count', True) is not False:
+                count_task = asyncio.create_task(self.counter.count(self.collection, query))
+            else:
+                self.counter.skip()
+            
+            try:
+                # Both guards see the find exactly as it is sent: the cost
+                # guard may lower its limit, then the plan guard checks it
+                notes = []
+                if self.cost_guard is not None:
+                    estimate = await self.cost_guard.check(self.collection, spec)
+                    if estimate.limit != (spec.limit or None):
+                        spec = spec._replace(limit=estimate.limit)
+                    notes = estimate.notes
+                warning = None
+                if self.plan_guard is not None:
+                    warning = await self.plan_guard.check(self.collection, spec)
+                
+                started = time.monotonic()
+                # Execute the query as planned; a paginated projection keeps
+                # the sort keys so the next page token can be built
+                cursor = self.read_collection.find(spec.filter, spec.projection)
+                
+                # Apply options
+                if spec.sort:
+                    cursor = cursor.sort(spec.sort)
+                time_limit = max_time_ms(config.QUERY_MAX_TIME_MS)
+                if time_limit:
+                    cursor = cursor.max_time_ms(time_limit)
+                if spec.skip:
+                    cursor = cursor.skip(spec.skip)
+                
+                handle = None
+                if options.get('cursor'):
+                    # No limit on the cursor: later pages are getMores on it,
+                    # the limit only sizes this first page
+                    cursor = cursor.batch_size(self.formatter.batch_size)
+                    try:
+                        results = await self.formatter.format_cursor(
+                            cursor,
+                            max_documents=spec.limit or self.formatter.batch_size,
+                            keep_open=True
+                        )
+                        handle = await self.cursors.register(
+                            cursor, self.collection_name, session_key, results
+                        )
+                    except BaseException:
+                        await shielded_close(cursor)
+                        raise
+                else:
+                    if spec.limit:
+                        cursor = cursor.limit(spec.limit)
+                    
+                    # Stream results into a single bounded buffer
+                    results = await self.formatter.format_cursor(cursor)
+                if self.advisor is not None:
+                    self.advisor.record(
+                        self.collection_name,
+                        query,
+                        spec.sort_document(),
+                        options.get('projection'),
+                        (time.monotonic() - started) * 1000
+                    )
+                total_count = await count_task if count_task else None
+            finally:
+                if count_task and not count_task.done():
+                    count_task.cancel()
+        
+        if not results.count:
+            if warning:
+                return warning + "\nNo matching documents found."
+            if options.get('page_token'):
+                return "No more matching documents."
+            return "No matching documents found."
+        
+        # Prepare result text
+        result_text = f"Showing {results.count} document(s):\n" + results.text
+        if total_count is not None:
+            result_text = f"Found {total_count.display()} total matching documents.\n" + result_text
+        if warning:
+            result_text = warning + "\n" + result_text
+        if notes:
+            result_text = "\n".join(notes) + "\n" + result_text
+        if results.truncated:
+            result_text += f"\n... output truncated at {self.formatter.max_bytes} bytes."
+        if handle:
+            result_text += f"\nMore results: call fetch_more with {{\"cursor\": \"{handle}\"}}"
+        elif not options.get('cursor') and (results.truncated or results.count == spec.limit):
+            if spec.paginate:
+                next_token = encode_page_token(spec.sort, results.last_document, query)
+                result_text += (
+                    f"\nNext page: repeat the query with options.page_token = \"{next_token}\""
+                )
+            else:
+                result_text += (
+                    "\nMore documents may match: repeat the query with options.paginate = true "
+                    "to get a page token"
+                )
+        return result_text
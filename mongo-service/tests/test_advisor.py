@@ -0,0 +1,122 @@
+"""
+Tests for query shapes and equality-sort-range index suggestions.
+"""
+
+import pytest
+from src.mongo_mcp_server.advisor import IndexAdvisor, make_shape, strip_values
+
+def test_strip_values_keeps_fields_and_operators():
+    shape = strip_values({
+        "symbol": "AAPL",
+        "close": {"$gte": 10, "$lt": 20},
+        "meta": {"exchange": "NASDAQ"},
+        "$or": [{"a": 1}, {"b": {"$in": [1, 2]}}],
+        "lots": {"$elemMatch": {"qty": {"$gt": 5}}}
+    })
+    assert shape == {
+        "symbol": "?",
+        "close": {"$gte": "?", "$lt": "?"},
+        "meta": "?",
+        "$or": [{"a": "?"}, {"b": {"$in": "?"}}],
+        "lots": {"$elemMatch": {"qty": {"$gt": "?"}}}
+    }
+
+def test_same_shape_for_different_values():
+    first = make_shape("prices", {"symbol": "AAPL", "close": {"$gt": 1}}, {"date": -1})
+    second = make_shape("prices", {"symbol": "MSFT", "close": {"$gt": 99}}, {"date": -1})
+    assert first.key == second.key
+
+def test_suggested_index_orders_equality_sort_range():
+    shape = make_shape(
+        "prices",
+        {"close": {"$gte": 10}, "symbol": "AAPL", "exchange": {"$in": ["X", "Y"]}},
+        {"date": -1}
+    )
+    assert shape.equality == ["symbol", "exchange"]
+    assert shape.ranges == ["close"]
+    assert shape.suggested_index() == [("symbol", 1), ("exchange", 1), ("date", -1), ("close", 1)]
+
+def test_suggested_index_skips_sort_fields_already_matched_by_equality():
+    shape = make_shape("prices", {"symbol": "AAPL"}, {"symbol": 1, "date": 1})
+    assert shape.suggested_index() == [("symbol", 1), ("date", 1)]
+
+def test_and_clauses_are_classified_and_or_is_ignored():
+    shape = make_shape("prices", {"$and": [{"a": 1}, {"b": {"$lt": 2}}], "$or": [{"c": 1}]})
+    assert (shape.equality, shape.ranges) == (["a"], ["b"])
+
+def test_covered_by_exact_and_prefix_index():
+    shape = make_shape("prices", {"symbol": "AAPL", "close": {"$gt": 1}}, {"date": -1})
+    assert shape.is_covered_by([("symbol", 1), ("date", -1), ("close", 1)])
+    # A longer index that starts with the equality fields and the sort also serves it
+    assert shape.is_covered_by([("symbol", 1), ("date", -1), ("volume", 1), ("close", 1)])
+
+def test_equality_fields_may_appear_in_any_order():
+    shape = make_shape("prices", {"a": 1, "b": 2})
+    assert shape.is_covered_by([("b", 1), ("a", -1)])
+
+def test_covered_by_fully_reversed_sort():
+    shape = make_shape("prices", {"symbol": "AAPL"}, {"date": -1, "time": 1})
+    assert shape.is_covered_by([("symbol", 1), ("date", 1), ("time", -1)])
+    # Reversing only some of the sort keys forces an in-memory sort
+    assert not shape.is_covered_by([("symbol", 1), ("date", 1), ("time", 1)])
+
+def test_not_covered_when_index_misses_the_shape():
+    shape = make_shape("prices", {"symbol": "AAPL"}, {"date": -1})
+    assert not shape.is_covered_by([("date", -1)])
+    assert not shape.is_covered_by([("symbol", 1), ("close", 1), ("date", -1)])
+    assert not shape.is_covered_by([("symbol", 1)])
+
+def test_range_only_shape_needs_index_leading_with_a_range_field():
+    shape = make_shape("prices", {"close": {"$gt": 1}})
+    assert shape.is_covered_by([("close", 1)])
+    assert not shape.is_covered_by([("symbol", 1), ("close", 1)])
+
+class FakeIndexCursor:
+    def __init__(self, indexes):
+        self.indexes = indexes
+
+    async def to_list(self):
+        return self.indexes
+
+class FakeCollection:
+    def __init__(self, indexes):
+        self.indexes = indexes
+
+    async def list_indexes(self):
+        return FakeIndexCursor(self.indexes)
+
+@pytest.mark.asyncio
+async def test_advise_skips_covered_shapes_and_ranks_by_time():
+    advisor = IndexAdvisor(max_shapes=10)
+    advisor.record("prices", {"symbol": "AAPL"}, {"date": -1}, None, 5.0)
+    advisor.record("prices", {"symbol": "MSFT"}, {"date": -1}, None, 7.0)
+    advisor.record("prices", {"sector": "tech"}, None, None, 100.0)
+    advisor.record("prices", {"close": {"$gt": 1}}, None, None, 3.0)
+    collection = FakeCollection([
+        {"name": "_id_", "key": {"_id": 1}},
+        {"name": "symbol_1_date_-1", "key": {"symbol": 1, "date": -1}},
+        {"name": "text", "key": {"_fts": "text", "_ftsx": 1}}
+    ])
+
+    suggestions, covered = await advisor.advise({"prices": collection})
+    assert [(shape.filter, name) for shape, name in covered] == [({"symbol": "?"}, "symbol_1_date_-1")]
+    assert [suggestion.index for suggestion in suggestions] == [[("sector", 1)], [("close", 1)]]
+    assert suggestions[0].total_ms == 100.0
+
+@pytest.mark.asyncio
+async def test_advise_groups_shapes_with_the_same_suggestion():
+    advisor = IndexAdvisor(max_shapes=10)
+    advisor.record("prices", {"symbol": "AAPL"}, None, None, 1.0)
+    advisor.record("prices", {"symbol": {"$eq": "AAPL"}}, None, None, 2.0)
+    suggestions, _ = await advisor.advise({"prices": FakeCollection([])})
+    assert len(suggestions) == 1
+    assert (suggestions[0].queries, suggestions[0].total_ms) == (2, 3.0)
+    assert len(suggestions[0].shapes) == 2
+
+def test_least_used_shape_is_dropped_at_capacity():
+    advisor = IndexAdvisor(max_shapes=2)
+    advisor.record("prices", {"a": 1}, None, None, 1.0)
+    advisor.record("prices", {"a": 2}, None, None, 1.0)
+    advisor.record("prices", {"b": 1}, None, None, 1.0)
+    advisor.record("prices", {"c": 1}, None, None, 1.0)
+    assert advisor.stats() == {"shapes": 2, "recorded": 4}
@@ -0,0 +1,77 @@
+"""
+Tests for aggregation pipeline validation and option clamping.
+"""
+
+import pytest
+from src.mongo_mcp_server import config
+from src.mongo_mcp_server.deadlines import deadline
+from src.mongo_mcp_server.tools.aggregate_tool import aggregate_options, validate_pipeline
+
+@pytest.mark.parametrize("stage", [
+    {"$out": "copy"},
+    {"$merge": {"into": "copy"}},
+    {"$lookup": {"from": "other", "localField": "a", "foreignField": "b", "as": "c"}},
+    {"$graphLookup": {"from": "other", "startWith": "$a", "connectFromField": "a",
+                      "connectToField": "b", "as": "c"}},
+    {"$unionWith": "other"},
+    {"$collStats": {}},
+    {"$currentOp": {}}
+])
+def test_rejects_writing_and_cross_collection_stages(stage):
+    with pytest.raises(ValueError, match="is not allowed"):
+        validate_pipeline([{"$match": {}}, stage])
+
+def test_accepts_read_only_stages():
+    pipeline = [
+        {"$match": {"symbol": "AAPL"}},
+        {"$group": {"_id": "$year", "close": {"$avg": "$close"}}},
+        {"$sort": {"_id": 1}},
+        {"$limit": 10}
+    ]
+    assert validate_pipeline(pipeline) is pipeline
+
+def test_checks_facet_sub_pipelines():
+    validate_pipeline([{"$facet": {"counts": [{"$count": "n"}]}}])
+    with pytest.raises(ValueError, match=r"\$out is not allowed"):
+        validate_pipeline([{"$facet": {"copy": [{"$out": "copy"}]}}])
+    with pytest.raises(ValueError, match="must map output fields"):
+        validate_pipeline([{"$facet": [{"$out": "copy"}]}])
+
+@pytest.mark.parametrize("operator", [
+    {"$match": {"$where": "this.a > 1"}},
+    {"$match": {"$expr": {"$function": {"body": "return true", "args": [], "lang": "js"}}}},
+    {"$group": {"_id": None, "x": {"$accumulator": {}}}},
+    {"$facet": {"f": [{"$match": {"$or": [{"$where": "true"}]}}]}}
+])
+def test_rejects_server_side_javascript_at_any_depth(operator):
+    with pytest.raises(ValueError, match="Operator .* is not allowed"):
+        validate_pipeline([operator])
+
+@pytest.mark.parametrize("pipeline", [
+    {"$match": {}},
+    [{"$match": {}, "$limit": 1}],
+    ["$match"]
+])
+def test_rejects_malformed_pipelines(pipeline):
+    with pytest.raises(ValueError):
+        validate_pipeline(pipeline)
+
+def test_max_time_ms_defaults_to_and_is_capped_by_config(monkeypatch):
+    monkeypatch.setattr(config, "AGGREGATE_MAX_TIME_MS", 30000)
+    assert aggregate_options(None)["maxTimeMS"] == 30000
+    assert aggregate_options({"maxTimeMS": 500})["maxTimeMS"] == 500
+    assert aggregate_options({"maxTimeMS": 10 ** 9})["maxTimeMS"] == 30000
+    for invalid in (0, -1, "500", 2.5, True):
+        assert aggregate_options({"maxTimeMS": invalid})["maxTimeMS"] == 30000
+
+def test_max_time_ms_is_capped_by_request_deadline(monkeypatch):
+    monkeypatch.setattr(config, "AGGREGATE_MAX_TIME_MS", 30000)
+    with deadline(1000):
+        assert aggregate_options({"maxTimeMS": 20000})["maxTimeMS"] <= 1000
+
+def test_allow_disk_use_needs_server_permission(monkeypatch):
+    monkeypatch.setattr(config, "AGGREGATE_ALLOW_DISK_USE", False)
+    assert aggregate_options({"allowDiskUse": True})["allowDiskUse"] is False
+    monkeypatch.setattr(config, "AGGREGATE_ALLOW_DISK_USE", True)
+    assert aggregate_options({})["allowDiskUse"] is True
+    assert aggregate_options({"allowDiskUse": False})["allowDiskUse"] is False
@@ -0,0 +1,139 @@
+"""
+Tests for the query result cache and its key canonicalization.
+"""
+
+from src.mongo_mcp_server import cache as cache_module
+from src.mongo_mcp_server.cache import QueryCache, filter_digest, make_cache_key
+
+class FakeClock:
+    """Stands in for time.monotonic so TTL expiry can be tested without sleeping."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def test_key_ignores_top_level_filter_order():
+    assert make_cache_key("prices", {"a": 1, "b": 2}) == make_cache_key("prices", {"b": 2, "a": 1})
+
+def test_key_ignores_operator_order():
+    first = make_cache_key("prices", {"close": {"$gte": 1, "$lt": 5}})
+    second = make_cache_key("prices", {"close": {"$lt": 5, "$gte": 1}})
+    assert first == second
+
+def test_key_keeps_embedded_document_order():
+    # Exact matches on embedded documents are order-sensitive in MongoDB
+    first = make_cache_key("prices", {"a": {"x": 1, "y": 2}})
+    second = make_cache_key("prices", {"a": {"y": 2, "x": 1}})
+    assert first != second
+
+def test_key_keeps_sort_order():
+    first = make_cache_key("prices", {}, sort={"a": 1, "b": -1})
+    second = make_cache_key("prices", {}, sort={"b": -1, "a": 1})
+    assert first != second
+
+def test_key_distinguishes_shape():
+    base = make_cache_key("prices", {"a": 1})
+    assert base.startswith("prices:")
+    assert base != make_cache_key("quotes", {"a": 1})
+    assert base != make_cache_key("prices", {"a": 1}, projection={"a": 1})
+    assert base != make_cache_key("prices", {"a": 1}, skip=10)
+    assert base != make_cache_key("prices", {"a": 1}, limit=10)
+    assert base == make_cache_key("prices", {"a": 1}, None, None, 0, 0)
+
+def test_filter_digest_is_canonical():
+    assert filter_digest({"a": 1, "b": 2}) == filter_digest({"b": 2, "a": 1})
+    assert filter_digest(None) == filter_digest({})
+    assert len(filter_digest({"a": 1})) == 16
+
+def test_get_and_set():
+    cache = QueryCache(max_entries=10, max_bytes=10_000, ttl=60)
+    assert cache.get("k") is None
+    cache.set("k", "value", "prices")
+    assert cache.get("k") == "value"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_evicts_least_recently_used_entry():
+    cache = QueryCache(max_entries=2, max_bytes=10_000, ttl=60)
+    cache.set("a", "1", "prices")
+    cache.set("b", "2", "prices")
+    cache.get("a")  # b is now the least recently used
+    cache.set("c", "3", "prices")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    assert cache.evictions == 1
+
+def test_byte_accounting_evicts_to_fit():
+    cache = QueryCache(max_entries=100, max_bytes=30, ttl=60)
+    cache.set("a", "x" * 9, "prices")  # 10 bytes with the key
+    cache.set("b", "x" * 9, "prices")
+    cache.set("c", "x" * 9, "prices")
+    assert cache.stats()["bytes"] == 30
+    cache.set("d", "x" * 9, "prices")
+    assert cache.stats()["bytes"] == 30
+    assert cache.get("a") is None
+    assert len(cache) == 3
+
+def test_byte_accounting_on_overwrite_and_removal():
+    cache = QueryCache(max_entries=100, max_bytes=1000, ttl=60)
+    cache.set("a", "x" * 9, "prices")
+    cache.set("a", "x" * 19, "prices")
+    assert cache.stats()["bytes"] == 20
+    cache.invalidate_collection("prices")
+    assert cache.stats()["bytes"] == 0
+    assert len(cache) == 0
+
+def test_byte_accounting_counts_utf8_bytes():
+    cache = QueryCache(max_entries=100, max_bytes=1000, ttl=60)
+    cache.set("k", "€" * 3, "prices")  # 3 characters, 9 bytes
+    assert cache.stats()["bytes"] == 10
+    cache.set("é", "x", "prices")
+    assert cache.stats()["bytes"] == 13
+
+def test_multibyte_value_over_the_byte_limit_is_not_cached():
+    cache = QueryCache(max_entries=100, max_bytes=20, ttl=60)
+    cache.set("a", "€" * 10, "prices")  # 11 characters but 31 bytes
+    assert len(cache) == 0
+
+def test_oversized_value_is_not_cached():
+    cache = QueryCache(max_entries=100, max_bytes=10, ttl=60)
+    cache.set("a", "x" * 50, "prices")
+    assert len(cache) == 0
+    assert cache.stats()["bytes"] == 0
+
+def test_ttl_expiry(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    cache = QueryCache(max_entries=10, max_bytes=10_000, ttl=5)
+    cache.set("a", "1", "prices")
+    clock.now += 4.9
+    assert cache.get("a") == "1"
+    clock.now += 0.1
+    assert cache.get("a") is None
+    assert cache.expirations == 1
+    assert cache.stats()["bytes"] == 0
+
+def test_collection_ttl_override(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    cache = QueryCache(max_entries=10, max_bytes=10_000, ttl=5)
+    cache.set_collection_ttl("prices", 600)
+    cache.set("a", "1", "prices")
+    cache.set("b", "2", "quotes")
+    clock.now += 10
+    assert cache.get("a") == "1"
+    assert cache.get("b") is None
+    cache.set_collection_ttl("prices", None)
+    cache.set("c", "3", "prices")
+    clock.now += 10
+    assert cache.get("c") is None
+
+def test_invalidate_collection_only_drops_that_collection():
+    cache = QueryCache(max_entries=10, max_bytes=10_000, ttl=60)
+    cache.set("a", "1", "prices")
+    cache.set("b", "2", "quotes")
+    assert cache.invalidate_collection("prices") == 1
+    assert cache.get("a") is None
+    assert cache.get("b") == "2"
@@ -0,0 +1,109 @@
+"""
+Tests for collection allow/deny globs and catalog refresh.
+"""
+
+import pytest
+from pymongo.errors import AutoReconnect
+from src.mongo_mcp_server import config
+from src.mongo_mcp_server.catalog import CollectionCatalog, collection_allowed, parse_globs
+
+def test_parse_globs():
+    assert parse_globs(" orders, stock_* ,,") == ["orders", "stock_*"]
+    assert parse_globs("") == []
+
+def test_deny_wins_over_allow():
+    assert collection_allowed("stock_prices", ["stock_*"], [])
+    assert not collection_allowed("stock_secret", ["stock_*"], ["*_secret"])
+    assert not collection_allowed("orders", ["stock_*"], [])
+    assert not collection_allowed("anything", [], [])
+
+def test_globs_are_case_sensitive_and_match_the_whole_name():
+    assert not collection_allowed("Stock_prices", ["stock_*"], [])
+    assert not collection_allowed("stock", ["stock_*"], [])
+    assert collection_allowed("stock_", ["stock_*"], [])
+    assert collection_allowed("a.b", ["a.?"], [])
+
+def test_default_deny_hides_system_collections():
+    deny = parse_globs(config.COLLECTION_DENY)
+    assert not collection_allowed("system.profile", ["*"], deny)
+    assert not collection_allowed("system.views", ["*"], deny)
+    assert collection_allowed("prices", ["*"], deny)
+
+class FakeDatabase:
+    def __init__(self, names):
+        self.names = list(names)
+        self.error = None
+
+    async def list_collection_names(self):
+        if self.error is not None:
+            raise self.error
+        return list(self.names)
+
+    def __getitem__(self, name):
+        return f"collection:{name}"
+
+def make_catalog(db, **kwargs):
+    built = []
+
+    def factory(name):
+        built.append(name)
+        return f"handlers:{name}"
+
+    return CollectionCatalog(db, factory, refresh_interval=0, **kwargs), built
+
+@pytest.mark.asyncio
+async def test_discovery_applies_allow_and_deny():
+    db = FakeDatabase(["prices", "quotes", "stock_internal", "system.profile"])
+    catalog, _ = make_catalog(db, allow=["*"], deny=["system.*", "*_internal"])
+    assert await catalog.names() == ["prices", "quotes"]
+    assert "stock_internal" not in catalog
+    with pytest.raises(KeyError):
+        catalog["system.profile"]
+    assert catalog["prices"] == "collection:prices"
+
+@pytest.mark.asyncio
+async def test_refresh_adds_and_removes_collections():
+    db = FakeDatabase(["prices", "quotes"])
+    catalog, built = make_catalog(db)
+    assert await catalog.handlers("quotes") == "handlers:quotes"
+
+    db.names = ["prices", "trades"]
+    assert await catalog.refresh()
+    assert list(catalog) == ["prices", "trades"]
+    # Handlers of a dropped collection are released, and it is no longer served
+    assert await catalog.handlers("quotes") is None
+    assert await catalog.handlers("trades") == "handlers:trades"
+    assert built == ["quotes", "trades"]
+    assert catalog.stats()["loaded"] == 1
+
+@pytest.mark.asyncio
+async def test_refresh_reports_unchanged_list():
+    db = FakeDatabase(["b", "a"])
+    catalog, _ = make_catalog(db)
+    assert await catalog.refresh()
+    db.names = ["a", "b"]
+    assert not await catalog.refresh()
+
+@pytest.mark.asyncio
+async def test_refresh_error_keeps_last_known_list():
+    db = FakeDatabase(["prices"])
+    catalog, _ = make_catalog(db)
+    await catalog.refresh()
+    db.error = AutoReconnect("down")
+    assert not await catalog.refresh()
+    assert list(catalog) == ["prices"]
+
+@pytest.mark.asyncio
+async def test_handlers_are_built_once():
+    catalog, built = make_catalog(FakeDatabase(["prices"]))
+    await catalog.handlers("prices")
+    await catalog.handlers("prices")
+    assert built == ["prices"]
+
+@pytest.mark.asyncio
+async def test_fixed_collection_list_is_never_refreshed():
+    db = FakeDatabase(["other"])
+    catalog = CollectionCatalog(db, lambda name: name, ["prices"])
+    assert await catalog.names() == ["prices"]
+    assert not await catalog.refresh()
+    assert catalog.stats()["refreshes"] == 0
@@ -0,0 +1,209 @@
+"""
+Tests for change-stream cache invalidation, using an in-memory stand-in for
+a replica set's change streams.
+"""
+
+import asyncio
+import pytest
+from pymongo.errors import AutoReconnect, OperationFailure
+from src.mongo_mcp_server import change_streams
+from src.mongo_mcp_server import config
+from src.mongo_mcp_server.cache import QueryCache
+from src.mongo_mcp_server.change_streams import ChangeStreamWatcher
+from src.mongo_mcp_server.server import MongoMCPServer
+from src.mongo_mcp_server.tools import MongoQueryTool
+
+class FakeChangeStream:
+    """Yields scripted and pushed change events, or drops the connection when scripted to."""
+
+    def __init__(self, events, error=None):
+        self.events = list(events)
+        self.error = error
+        self.pushed = asyncio.Queue()
+        self.resume_token = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.events:
+            change = self.events.pop(0)
+            self.resume_token = change["_id"]
+            return change
+        if self.error is not None:
+            raise self.error
+        change = await self.pushed.get()  # Stay open until a change is pushed
+        self.resume_token = change["_id"]
+        return change
+
+class FakeCollection:
+    """Collection whose watch() calls follow a script of streams and errors."""
+
+    def __init__(self, name, script):
+        self.name = name
+        self.script = list(script)
+        self.resume_after = []
+
+    async def watch(self, resume_after=None):
+        self.resume_after.append(resume_after)
+        outcome = self.script.pop(0) if self.script else FakeChangeStream([])
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+class FakeDatabase:
+    name = "testdb"
+
+    def __init__(self, *collections):
+        self.collections = {collection.name: collection for collection in collections}
+
+    def __getitem__(self, name):
+        return self.collections[name]
+
+def change(token):
+    return {"_id": {"_data": token}, "operationType": "insert"}
+
+async def wait_until(predicate, timeout=2.0):
+    async def poll():
+        while not predicate():
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    """Make the watcher's reconnect backoff instant."""
+    sleep = asyncio.sleep
+    monkeypatch.setattr(change_streams.asyncio, "sleep", lambda delay: sleep(0))
+
+@pytest.mark.asyncio
+async def test_change_event_invalidates_cached_results(tmp_path):
+    server = MongoMCPServer()
+    server.query_cache = QueryCache(max_entries=10, max_bytes=10_000, ttl=60)
+    server.query_cache.set("prices:key", "cached", "prices")
+    server.query_cache.set("quotes:key", "cached", "quotes")
+    stream = FakeChangeStream([])
+    watcher = ChangeStreamWatcher(
+        FakeDatabase(FakeCollection("prices", [stream])), ["prices"], token_path=str(tmp_path / "tokens.json")
+    )
+    watcher.add_listener(server._on_collection_change)
+    watcher.add_state_listener(server._on_change_stream_state)
+    watcher.start()
+    try:
+        await wait_until(lambda: watcher.active.get("prices"))
+        # Results live longer while the stream keeps them fresh
+        assert server.query_cache.collection_ttls["prices"] == config.CHANGE_STREAM_CACHE_TTL_SECONDS
+        assert server.query_cache.get("prices:key") == "cached"
+
+        stream.pushed.put_nowait(change("1"))
+        await wait_until(lambda: watcher.events == 1)
+        assert server.query_cache.get("prices:key") is None
+        assert server.query_cache.get("quotes:key") == "cached"
+    finally:
+        await watcher.stop()
+        server.executor.shutdown()
+
+@pytest.mark.asyncio
+async def test_result_read_during_invalidation_is_not_cached():
+    cache = QueryCache(max_entries=10, max_bytes=10_000, ttl=600)
+    tool = MongoQueryTool("prices", {"prices": object()}, raw_bson=False, cache=cache)
+    running = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_query(*args, **kwargs):
+        running.set()
+        await release.wait()
+        return "Showing 1 document(s):\n{}"
+
+    tool._run_query = slow_query
+    try:
+        call = asyncio.create_task(tool.execute({"query": {"symbol": "AAPL"}}))
+        await running.wait()
+        # A change event arrives while the find is still running
+        cache.invalidate_collection("prices")
+        release.set()
+        await call
+        assert len(cache) == 0
+        assert cache.stale_writes == 1
+
+        # A query that starts after the invalidation is cached as usual
+        await tool.execute({"query": {"symbol": "AAPL"}})
+        assert len(cache) == 1
+    finally:
+        tool.executor.shutdown()
+
+@pytest.mark.asyncio
+async def test_resume_token_is_persisted_and_used_after_restart(tmp_path):
+    token_path = str(tmp_path / "tokens.json")
+    first = FakeCollection("prices", [FakeChangeStream([change("1"), change("2")])])
+    watcher = ChangeStreamWatcher(FakeDatabase(first), ["prices"], token_path=token_path)
+    watcher.start()
+    await wait_until(lambda: watcher.events == 2)
+    await watcher.stop()
+    assert first.resume_after == [None]
+
+    # A restarted server resumes after the last event it saw
+    second = FakeCollection("prices", [FakeChangeStream([])])
+    restarted = ChangeStreamWatcher(FakeDatabase(second), ["prices"], token_path=token_path)
+    restarted.start()
+    await wait_until(lambda: second.resume_after)
+    await restarted.stop()
+    assert second.resume_after == [{"_data": "2"}]
+
+@pytest.mark.asyncio
+async def test_reconnects_after_stream_error(tmp_path, no_backoff):
+    collection = FakeCollection("prices", [
+        FakeChangeStream([change("1")], error=AutoReconnect("connection reset")),
+        FakeChangeStream([change("2")])
+    ])
+    notifications = []
+    states = []
+    watcher = ChangeStreamWatcher(FakeDatabase(collection), ["prices"], token_path=str(tmp_path / "tokens.json"))
+    watcher.add_listener(lambda name, event: notifications.append(event and event["_id"]["_data"]))
+    watcher.add_state_listener(lambda name, active: states.append(active))
+    watcher.start()
+    try:
+        await wait_until(lambda: watcher.events == 2)
+    finally:
+        await watcher.stop()
+    # A lost stream invalidates everything (None), then the stream resumes where it stopped
+    assert notifications == ["1", None, "2"]
+    assert states == [True, False, True]
+    assert collection.resume_after == [None, {"_data": "1"}]
+
+@pytest.mark.asyncio
+async def test_expired_resume_token_restarts_stream(tmp_path, no_backoff):
+    collection = FakeCollection("prices", [
+        FakeChangeStream([change("1")], error=OperationFailure("history lost", code=286)),
+        FakeChangeStream([])
+    ])
+    watcher = ChangeStreamWatcher(FakeDatabase(collection), ["prices"], token_path=str(tmp_path / "tokens.json"))
+    watcher.start()
+    try:
+        await wait_until(lambda: len(collection.resume_after) == 2)
+    finally:
+        await watcher.stop()
+    assert collection.resume_after == [None, None]
+
+@pytest.mark.asyncio
+async def test_standalone_server_falls_back_to_ttl(tmp_path):
+    server = MongoMCPServer()
+    server.query_cache = QueryCache(max_entries=10, max_bytes=10_000, ttl=60)
+    collection = FakeCollection("prices", [
+        OperationFailure("The $changeStream stage is only supported on replica sets", code=40573)
+    ])
+    watcher = ChangeStreamWatcher(FakeDatabase(collection), ["prices"], token_path=str(tmp_path / "tokens.json"))
+    watcher.add_state_listener(server._on_change_stream_state)
+    watcher.start()
+    try:
+        await wait_until(lambda: "prices" in watcher.active)
+        assert watcher.active["prices"] is False
+        assert "prices" not in server.query_cache.collection_ttls
+    finally:
+        await watcher.stop()
+        server.executor.shutdown()
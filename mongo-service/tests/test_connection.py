@@ -0,0 +1,119 @@
+"""
+Tests that a failed connection attempt releases everything it started.
+"""
+
+import asyncio
+import pytest
+from pymongo.errors import ServerSelectionTimeoutError
+from src.mongo_mcp_server import config
+from src.mongo_mcp_server import server as server_module
+from src.mongo_mcp_server.catalog import CollectionCatalog
+from src.mongo_mcp_server.server import MongoMCPServer
+
+class FakeStream:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await asyncio.Event().wait()
+
+class FakeCollection:
+    def __init__(self, name):
+        self.name = name
+
+    async def estimated_document_count(self):
+        return 10
+
+    async def watch(self, resume_after=None):
+        return FakeStream()
+
+class FakeDatabase:
+    name = "testdb"
+
+    def __getitem__(self, name):
+        return FakeCollection(name)
+
+class FakeClient:
+    """AsyncMongoClient stand-in that records every client created and closed."""
+    created = []
+    next_error = None
+
+    def __init__(self, *args, **kwargs):
+        self.closed = False
+        self.server_info_error = FakeClient.next_error
+        FakeClient.created.append(self)
+
+    async def server_info(self):
+        if self.server_info_error is not None:
+            raise self.server_info_error
+        return {}
+
+    def __getitem__(self, name):
+        return FakeDatabase()
+
+    async def close(self):
+        self.closed = True
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    FakeClient.created = []
+    FakeClient.next_error = None
+    monkeypatch.setattr(server_module, "AsyncMongoClient", FakeClient)
+    monkeypatch.setattr(config, "COLLECTION_DISCOVERY", False)
+    monkeypatch.setattr(config, "CHANGE_STREAMS_ENABLED", True)
+
+    async def no_warm_up(client, size, pool_stats=None):
+        return 0
+
+    monkeypatch.setattr(server_module, "warm_up", no_warm_up)
+    return FakeClient
+
+def background_tasks():
+    return {task for task in asyncio.all_tasks() if task is not asyncio.current_task()}
+
+@pytest.mark.asyncio
+async def test_unexpected_error_closes_client_and_stops_started_tasks(fake_client, monkeypatch):
+    async def broken_handlers(self, name):
+        raise RuntimeError("handlers failed")
+
+    monkeypatch.setattr(CollectionCatalog, "handlers", broken_handlers)
+    server = MongoMCPServer()
+    before = background_tasks()
+    try:
+        with pytest.raises(RuntimeError, match="handlers failed"):
+            await server.setup_mongodb()
+        # The change stream watcher had started; nothing it started is left running
+        await asyncio.sleep(0)
+        leaked = {task for task in background_tasks() - before if task.get_name() != "cursor-reaper"}
+        assert leaked == set()
+        assert fake_client.created[0].closed
+        assert server.client is None and server.change_watcher is None
+        assert not server.is_connected
+    finally:
+        await server.shutdown()
+
+@pytest.mark.asyncio
+async def test_connection_failure_closes_client(fake_client):
+    fake_client.next_error = ServerSelectionTimeoutError("no servers")
+    server = MongoMCPServer()
+    try:
+        assert await server.setup_mongodb() is False
+        assert fake_client.created[0].closed
+        assert server.client is None
+    finally:
+        await server.shutdown()
+
+@pytest.mark.asyncio
+async def test_shutdown_closes_client(fake_client):
+    server = MongoMCPServer()
+    assert await server.setup_mongodb()
+    client = server.client
+    await server.shutdown()
+    assert client.closed
+    assert server.client is None
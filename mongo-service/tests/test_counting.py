@@ -0,0 +1,145 @@
+"""
+Tests for the count strategies and the count cache.
+"""
+
+import asyncio
+import pytest
+from src.mongo_mcp_server import counting as counting_module
+from src.mongo_mcp_server.counting import CountResult, CountStrategy
+
+class FakeClock:
+    """Stands in for time.monotonic so TTL expiry can be tested without sleeping."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+class FakeCollection:
+    """Counts a fixed number of matches and records how it was asked."""
+
+    def __init__(self, name="prices", matches=50, estimate=1_000_000):
+        self.name = name
+        self.matches = matches
+        self.estimate = estimate
+        self.calls = []
+
+    async def count_documents(self, query, limit=None, **kwargs):
+        self.calls.append(("count_documents", query, limit))
+        return min(self.matches, limit) if limit else self.matches
+
+    async def estimated_document_count(self, **kwargs):
+        self.calls.append(("estimated_document_count",))
+        return self.estimate
+
+def test_display():
+    assert CountResult(42, 'exact').display() == "42"
+    assert CountResult(1_200_000, 'estimated').display() == "~1,200,000"
+    assert CountResult(10_000, 'capped').display() == "10,000+"
+
+@pytest.mark.asyncio
+async def test_capped_mode_counts_one_past_the_limit():
+    strategy = CountStrategy(mode='capped', limit=10, cache_ttl=0)
+    collection = FakeCollection(matches=50)
+    result = await strategy.count(collection, {"symbol": "AAPL"})
+    assert result == CountResult(10, 'capped')
+    assert result.display() == "10+"
+    assert collection.calls == [("count_documents", {"symbol": "AAPL"}, 11)]
+
+@pytest.mark.asyncio
+async def test_capped_mode_reports_exact_count_at_the_limit():
+    strategy = CountStrategy(mode='capped', limit=10, cache_ttl=0)
+    assert await strategy.count(FakeCollection(matches=10), {"a": 1}) == CountResult(10, 'exact')
+    assert await strategy.count(FakeCollection(matches=3), {"a": 1}) == CountResult(3, 'exact')
+
+@pytest.mark.asyncio
+async def test_exact_mode_counts_without_limit():
+    strategy = CountStrategy(mode='exact', cache_ttl=0)
+    collection = FakeCollection(matches=50)
+    assert await strategy.count(collection, {"a": 1}) == CountResult(50, 'exact')
+    assert collection.calls == [("count_documents", {"a": 1}, None)]
+
+@pytest.mark.asyncio
+async def test_empty_filter_uses_the_estimate():
+    strategy = CountStrategy(mode='exact', cache_ttl=0)
+    collection = FakeCollection()
+    result = await strategy.count(collection, {})
+    assert result == CountResult(1_000_000, 'estimated')
+    assert result.display() == "~1,000,000"
+    assert collection.calls == [("estimated_document_count",)]
+
+@pytest.mark.asyncio
+async def test_none_mode_skips_counting():
+    strategy = CountStrategy(mode='none')
+    collection = FakeCollection()
+    assert await strategy.count(collection, {"a": 1}) is None
+    strategy.skip()
+    assert collection.calls == []
+    assert strategy.stats()["skipped"] == 2
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError, match="Unknown count mode"):
+        CountStrategy(mode='approximate')
+
+@pytest.mark.asyncio
+async def test_counts_are_cached_per_filter_until_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(counting_module.time, "monotonic", clock)
+    strategy = CountStrategy(mode='exact', cache_ttl=30)
+    collection = FakeCollection()
+
+    await strategy.count(collection, {"a": 1, "b": 2})
+    # Same filter in another key order is a cache hit
+    await strategy.count(collection, {"b": 2, "a": 1})
+    await strategy.count(collection, {"a": 2})
+    assert len(collection.calls) == 2
+    assert strategy.stats()["cached"] == 1
+
+    clock.now += 31
+    await strategy.count(collection, {"a": 1, "b": 2})
+    assert len(collection.calls) == 3
+
+@pytest.mark.asyncio
+async def test_cache_evicts_least_recently_used():
+    strategy = CountStrategy(mode='exact', cache_ttl=30, max_entries=2)
+    collection = FakeCollection()
+    for value in (1, 2, 1, 3):
+        await strategy.count(collection, {"a": value})
+    # {"a": 2} was the least recently used entry when {"a": 3} arrived
+    await strategy.count(collection, {"a": 1})
+    await strategy.count(collection, {"a": 2})
+    assert [call[1] for call in collection.calls] == [{"a": 1}, {"a": 2}, {"a": 3}, {"a": 2}]
+
+@pytest.mark.asyncio
+async def test_invalidate_collection_drops_only_its_counts():
+    strategy = CountStrategy(mode='exact', cache_ttl=30)
+    prices, quotes = FakeCollection("prices"), FakeCollection("quotes")
+    await strategy.count(prices, {"a": 1})
+    await strategy.count(quotes, {"a": 1})
+    strategy.invalidate_collection("prices")
+    await strategy.count(prices, {"a": 1})
+    await strategy.count(quotes, {"a": 1})
+    assert len(prices.calls) == 2
+    assert len(quotes.calls) == 1
+
+@pytest.mark.asyncio
+async def test_count_read_during_invalidation_is_not_cached():
+    strategy = CountStrategy(mode='exact', cache_ttl=30)
+    running = asyncio.Event()
+    release = asyncio.Event()
+
+    class SlowCollection(FakeCollection):
+        async def count_documents(self, query, limit=None, **kwargs):
+            running.set()
+            await release.wait()
+            return await super().count_documents(query, limit, **kwargs)
+
+    collection = SlowCollection()
+    count = asyncio.create_task(strategy.count(collection, {"a": 1}))
+    await running.wait()
+    # A change event arrives while the count is still running
+    strategy.invalidate_collection("prices")
+    release.set()
+    assert await count == CountResult(50, 'exact')
+    assert strategy.stats()["cached_counts"] == 0
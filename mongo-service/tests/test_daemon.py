@@ -0,0 +1,65 @@
+"""
+Tests for the daemon's socket transport and socket permissions.
+"""
+
+import asyncio
+import os
+import stat
+import anyio
+import pytest
+from anyio.streams.stapled import StapledObjectStream
+from mcp.shared.message import SessionMessage
+from src.mongo_mcp_server.daemon import serve_daemon, socket_transport
+from src.mongo_mcp_server.server import MongoMCPServer
+
+def byte_pipe():
+    """A client end and a server end connected through memory streams."""
+    to_server, server_inbox = anyio.create_memory_object_stream(10)
+    to_client, client_inbox = anyio.create_memory_object_stream(10)
+    return StapledObjectStream(to_server, client_inbox), StapledObjectStream(to_client, server_inbox)
+
+@pytest.mark.asyncio
+async def test_messages_are_split_on_newlines():
+    client, server_end = byte_pipe()
+    async with socket_transport(server_end, max_message_bytes=1024) as (read_stream, write_stream):
+        await client.send(b'{"jsonrpc": "2.0", "method": "ping", "id": 1}\n\n')
+        message = await read_stream.receive()
+        assert isinstance(message, SessionMessage)
+        assert message.message.root.method == "ping"
+
+@pytest.mark.asyncio
+async def test_oversized_message_is_rejected_and_session_ends():
+    client, server_end = byte_pipe()
+    async with socket_transport(server_end, max_message_bytes=64) as (read_stream, write_stream):
+        await client.send(b'{"jsonrpc": "2.0", "method": "ping", "params": {"x": "' + b"a" * 100)
+        with anyio.fail_after(2):
+            error = await read_stream.receive()
+            assert isinstance(error, ValueError)
+            assert "64-byte limit" in str(error)
+            with pytest.raises(anyio.EndOfStream):
+                await read_stream.receive()
+
+@pytest.mark.asyncio
+async def test_socket_is_private_from_creation(tmp_path):
+    server = MongoMCPServer()
+
+    async def no_connect():
+        pass
+
+    server.start = no_connect
+    path = str(tmp_path / "run" / "daemon.sock")
+    umask = os.umask(0o022)
+    daemon = asyncio.create_task(serve_daemon(server, path))
+    try:
+        with anyio.fail_after(2):
+            while not os.path.exists(path):
+                await asyncio.sleep(0.01)
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+        assert stat.S_IMODE(os.stat(os.path.dirname(path)).st_mode) == 0o700
+        # The process umask is restored after binding
+        assert os.umask(0o022) == 0o022
+    finally:
+        daemon.cancel()
+        await asyncio.gather(daemon, return_exceptions=True)
+        os.umask(umask)
+    assert not os.path.exists(path)
@@ -0,0 +1,79 @@
+"""
+Tests for BSON conversion and the JSON encoder backends.
+"""
+
+from datetime import datetime, timezone
+from uuid import UUID
+import pytest
+from bson import BSON, Binary, Decimal128, Int64, ObjectId
+from bson.raw_bson import RawBSONDocument
+from src.mongo_mcp_server.encoding import DocumentEncoder, convert_bson, orjson
+
+BACKENDS = ["json", pytest.param("orjson", marks=pytest.mark.skipif(orjson is None, reason="orjson not installed"))]
+
+UUID_VALUE = UUID("12345678-1234-5678-1234-567812345678")
+
+DOCUMENT = {
+    "_id": ObjectId("64b7f0c2a1b2c3d4e5f60718"),
+    "timestamp": datetime(2024, 3, 1, 14, 30, 5, 123000),
+    "aware": datetime(2024, 3, 1, 14, 30, tzinfo=timezone.utc),
+    "price": Decimal128("187.25"),
+    "request": UUID_VALUE,
+    "uuid_binary": Binary.from_uuid(UUID_VALUE),
+    "payload": Binary(b"\x00\x01\x02"),
+    "volume": Int64(2 ** 40),
+    "name": "Société Générale ✓",
+    "tags": ["a", 1, 2.5, True, None],
+    "nested": {"empty": {}, "list": []}
+}
+
+def test_convert_bson_type_mappings():
+    assert convert_bson(ObjectId("64b7f0c2a1b2c3d4e5f60718")) == "64b7f0c2a1b2c3d4e5f60718"
+    assert convert_bson(datetime(2024, 3, 1, 14, 30)) == "2024-03-01T14:30:00"
+    assert convert_bson(Decimal128("187.25")) == "187.25"
+    assert convert_bson(UUID_VALUE) == str(UUID_VALUE)
+    assert convert_bson(Binary.from_uuid(UUID_VALUE)) == str(UUID_VALUE)
+    assert convert_bson(Binary(b"\x00\x01\x02")) == "AAEC"
+    assert convert_bson(b"\x00\x01\x02") == "AAEC"
+    assert convert_bson(Int64(5)) == 5 and type(convert_bson(Int64(5))) is int
+    raw = RawBSONDocument(BSON.encode({"a": 1, "b": {"c": 2}}))
+    converted = convert_bson(raw)
+    assert converted["a"] == 1
+    # Only the top level is decoded; nested documents stay raw until encoded
+    assert isinstance(converted["b"], RawBSONDocument)
+
+def test_convert_bson_rejects_unknown_types():
+    with pytest.raises(TypeError, match="not JSON serializable"):
+        convert_bson(object())
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_compact_output(backend):
+    encoder = DocumentEncoder(backend=backend, compact=True)
+    text = encoder.encode({"a": 1, "b": [1, 2], "c": "é"})
+    assert text == '{"a":1,"b":[1,2],"c":"é"}'
+    assert encoder.encode_bytes({"c": "é"}) == '{"c":"é"}'.encode("utf-8")
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_indented_output(backend):
+    encoder = DocumentEncoder(backend=backend, compact=False)
+    assert encoder.encode({"a": 1, "b": [1, 2]}) == '{\n  "a": 1,\n  "b": [\n    1,\n    2\n  ]\n}'
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_raw_bson_encodes_like_decoded_documents(backend):
+    encoder = DocumentEncoder(backend=backend, compact=True)
+    decoded = {"a": 1, "b": {"c": [ObjectId("64b7f0c2a1b2c3d4e5f60718")]}}
+    raw = RawBSONDocument(BSON.encode(decoded))
+    assert encoder.encode(raw) == encoder.encode(decoded)
+
+@pytest.mark.skipif(orjson is None, reason="orjson not installed")
+@pytest.mark.parametrize("compact", [True, False])
+def test_backends_produce_identical_output(compact):
+    fast = DocumentEncoder(backend="orjson", compact=compact)
+    fallback = DocumentEncoder(backend="json", compact=compact)
+    assert fast.encode_bytes(DOCUMENT) == fallback.encode_bytes(DOCUMENT)
+    raw = RawBSONDocument(BSON.encode({"_id": 1, "nested": {"x": Decimal128("1.5")}}))
+    assert fast.encode(raw) == fallback.encode(raw)
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError, match="Unknown JSON encoder backend"):
+        DocumentEncoder(backend="yaml")
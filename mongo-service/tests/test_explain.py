@@ -0,0 +1,91 @@
+"""
+Tests that explain and the plan guard inspect the find command that actually runs.
+"""
+
+import pytest
+from src.mongo_mcp_server.explain import CollectionScanRejected, PlanGuard
+from src.mongo_mcp_server.pagination import encode_page_token, keyset_filter, plan_find
+from src.mongo_mcp_server.tools.explain_tool import MongoExplainTool
+
+COLLSCAN = {"queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}}}
+IXSCAN = {"queryPlanner": {"winningPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "a_1"}}}}
+
+class FakeDatabase:
+    """Records explain commands and answers them with a fixed plan."""
+
+    def __init__(self, plan, size=1_000_000):
+        self.plan = plan
+        self.size = size
+        self.commands = []
+
+    def __getitem__(self, name):
+        return FakeCollection(name, self)
+
+    async def command(self, command):
+        self.commands.append(command["explain"])
+        return self.plan
+
+class FakeCollection:
+    def __init__(self, name, database):
+        self.name = name
+        self.database = database
+
+    async def estimated_document_count(self):
+        return self.database.size
+
+@pytest.mark.asyncio
+async def test_explain_tool_sends_the_paginated_find():
+    db = FakeDatabase(IXSCAN)
+    tool = MongoExplainTool("prices", db)
+    token = encode_page_token([("a", 1), ("_id", 1)], {"_id": 3, "a": 2}, {"s": 1})
+    try:
+        result = await tool.execute({
+            "query": {"s": 1},
+            "options": {"sort": {"a": 1}, "projection": {"b": 1}, "limit": 500, "page_token": token}
+        })
+    finally:
+        tool.executor.shutdown()
+    assert "Index used: a_1" in result[0].text
+    command = dict(db.commands[0])
+    assert command.pop("maxTimeMS") > 0
+    assert command == {
+        "find": "prices",
+        "filter": keyset_filter({"s": 1}, [("a", 1), ("_id", 1)], [2, 3]),
+        "projection": {"b": 1, "a": 1, "_id": 1},
+        "sort": {"a": 1, "_id": 1},
+        "limit": 100
+    }
+
+@pytest.mark.asyncio
+async def test_explain_tool_keeps_unpaginated_sort():
+    db = FakeDatabase(IXSCAN)
+    tool = MongoExplainTool("prices", db)
+    try:
+        await tool.execute({"query": {}, "options": {"sort": {"a": -1}}})
+    finally:
+        tool.executor.shutdown()
+    assert db.commands[0]["sort"] == {"a": -1}
+
+@pytest.mark.asyncio
+async def test_plan_guard_checks_and_caches_the_executed_find():
+    db = FakeDatabase(COLLSCAN)
+    guard = PlanGuard(mode="warn", min_documents=10)
+    collection = db["prices"]
+    plain = plan_find({"s": 1}, {"sort": {"a": 1}})
+    paginated = plan_find({"s": 1}, {"sort": {"a": 1}, "paginate": True})
+
+    assert "without an index" in await guard.check(collection, plain)
+    assert "without an index" in await guard.check(collection, plain)
+    await guard.check(collection, paginated)
+    # One explain per distinct find command, each for the command that runs
+    assert [command["sort"] for command in db.commands] == [{"a": 1}, {"a": 1, "_id": 1}]
+    assert guard.checked == 2
+
+@pytest.mark.asyncio
+async def test_plan_guard_rejects_collscan_in_reject_mode():
+    guard = PlanGuard(mode="reject", min_documents=10)
+    with pytest.raises(CollectionScanRejected):
+        await guard.check(FakeDatabase(COLLSCAN)["prices"], plan_find({}, {}))
+    assert await PlanGuard(mode="reject", min_documents=10).check(
+        FakeDatabase(IXSCAN)["prices"], plan_find({}, {})
+    ) is None
@@ -0,0 +1,108 @@
+"""
+Tests for streaming result formatting within the byte budget.
+"""
+
+import pytest
+from src.mongo_mcp_server.encoding import DocumentEncoder
+from src.mongo_mcp_server.executor import MongoExecutor
+from src.mongo_mcp_server.formatting import StreamingFormatter
+
+class FakeCursor:
+    """Async cursor stand-in serving a list of documents."""
+
+    def __init__(self, documents):
+        self.documents = list(documents)
+        self.closed = False
+
+    @property
+    def alive(self):
+        return bool(self.documents) and not self.closed
+
+    def batch_size(self, size):
+        return self
+
+    async def to_list(self, length):
+        batch, self.documents = self.documents[:length], self.documents[length:]
+        return batch
+
+    async def close(self):
+        self.closed = True
+
+@pytest.fixture
+def executor():
+    executor = MongoExecutor()
+    yield executor
+    executor.shutdown()
+
+def formatter(executor, max_bytes, batch_size=10):
+    return StreamingFormatter(
+        executor, max_bytes=max_bytes, batch_size=batch_size,
+        encoder=DocumentEncoder(backend="json", compact=True)
+    )
+
+@pytest.mark.asyncio
+async def test_everything_fits(executor):
+    cursor = FakeCursor([{"a": 1}, {"a": 2}])
+    results = await formatter(executor, 1000).format_cursor(cursor)
+    assert results.text == '{"a":1}\n{"a":2}'
+    assert (results.count, results.truncated) == (2, False)
+    assert results.last_document == {"a": 2}
+    assert cursor.closed
+
+@pytest.mark.asyncio
+async def test_budget_counts_utf8_bytes_of_multibyte_text(executor):
+    # Each document is 11 characters but 15 UTF-8 bytes ("é" and "€" are multibyte)
+    documents = [{"s": "é€é"}, {"s": "é€é"}, {"s": "é€é"}]
+    document_bytes = len('{"s":"é€é"}'.encode("utf-8"))
+    assert document_bytes == 15
+
+    # Two documents and their newline fit exactly
+    exact = await formatter(executor, 2 * document_bytes + 1).format_cursor(FakeCursor(documents))
+    assert (exact.count, exact.truncated) == (2, True)
+    assert len(exact.text.encode("utf-8")) == 2 * document_bytes + 1
+
+    # One byte less: the second document would overrun the budget, although
+    # its characters would still fit
+    short = await formatter(executor, 2 * document_bytes).format_cursor(FakeCursor(documents))
+    assert (short.count, short.truncated) == (1, True)
+    assert 2 * len('{"s":"é€é"}') + 1 <= 2 * document_bytes
+
+@pytest.mark.asyncio
+async def test_first_document_larger_than_budget_is_returned(executor):
+    cursor = FakeCursor([{"text": "x" * 100}, {"text": "y"}])
+    results = await formatter(executor, 10).format_cursor(cursor)
+    assert results.count == 1
+    assert results.truncated
+    assert results.text == '{"text":"' + "x" * 100 + '"}'
+    assert cursor.closed
+
+@pytest.mark.asyncio
+async def test_single_oversized_document_is_not_truncated(executor):
+    results = await formatter(executor, 10).format_cursor(FakeCursor([{"text": "x" * 100}]))
+    assert (results.count, results.truncated) == (1, False)
+
+@pytest.mark.asyncio
+async def test_max_documents_stops_reading(executor):
+    cursor = FakeCursor([{"a": i} for i in range(10)])
+    results = await formatter(executor, 1000, batch_size=3).format_cursor(cursor, max_documents=4)
+    assert results.count == 4
+    assert results.last_document == {"a": 3}
+
+@pytest.mark.asyncio
+async def test_keep_open_returns_unwritten_documents_as_pending(executor):
+    documents = [{"a": i} for i in range(6)]
+    cursor = FakeCursor(documents)
+    # Room for two documents of a four-document batch
+    results = await formatter(executor, 15, batch_size=4).format_cursor(cursor, keep_open=True)
+    assert results.count == 2
+    assert results.pending == ({"a": 2}, {"a": 3})
+    assert results.truncated
+    assert not cursor.closed
+    # The rest stay on the cursor for the next page
+    assert cursor.documents == [{"a": 4}, {"a": 5}]
+
+@pytest.mark.asyncio
+async def test_keep_open_exhausted_cursor_is_not_truncated(executor):
+    cursor = FakeCursor([{"a": 1}])
+    results = await formatter(executor, 1000).format_cursor(cursor, keep_open=True)
+    assert (results.count, results.truncated, results.pending) == (1, False, ())
@@ -0,0 +1,87 @@
+"""
+Tests that the cost guard judges the find command that actually runs.
+"""
+
+import pytest
+from src.mongo_mcp_server.guardrails import CostGuard, UnindexedSortRejected
+from src.mongo_mcp_server.pagination import encode_page_token, plan_find
+
+IN_MEMORY_SORT = {"queryPlanner": {"winningPlan": {"stage": "SORT", "inputStage": {"stage": "COLLSCAN"}}}}
+
+class FakeDatabase:
+    def __init__(self, count, avg_size=100, plan=IN_MEMORY_SORT):
+        self.stats = {"count": count, "avgObjSize": avg_size}
+        self.plan = plan
+        self.explained = []
+
+    async def command(self, command, *args):
+        if command == "collStats":
+            return self.stats
+        self.explained.append(command["explain"])
+        return self.plan
+
+class FakeCollection:
+    def __init__(self, database, indexes):
+        self.name = "prices"
+        self.database = database
+        self.indexes = indexes
+
+    async def index_information(self):
+        return {f"index_{i}": {"key": key} for i, key in enumerate(self.indexes)}
+
+@pytest.mark.asyncio
+async def test_paginated_sort_needs_an_index_ending_in_id():
+    guard = CostGuard(max_response_bytes=10 ** 9, sort_max_documents=1000)
+    database = FakeDatabase(count=10_000)
+    collection = FakeCollection(database, [[("_id", 1)], [("close", -1)]])
+
+    # {close: -1} alone is served by the close index
+    estimate = await guard.check(collection, plan_find({}, {"sort": {"close": -1}}))
+    assert estimate.notes == []
+
+    # The paginated find sorts on {close: -1, _id: -1}, which that index does not provide
+    with pytest.raises(UnindexedSortRejected, match=r"\['close', '_id'\]"):
+        await guard.check(collection, plan_find({}, {"sort": {"close": -1}, "paginate": True}))
+    assert database.explained[0]["sort"] == {"close": -1, "_id": -1}
+
+    collection.indexes.append([("close", -1), ("_id", -1)])
+    guard._indexes.clear()
+    await guard.check(collection, plan_find({}, {"sort": {"close": -1}, "paginate": True}))
+
+@pytest.mark.asyncio
+async def test_explains_the_keyset_filter_of_a_later_page():
+    guard = CostGuard(max_response_bytes=10 ** 9, sort_max_documents=1000)
+    database = FakeDatabase(count=10_000)
+    collection = FakeCollection(database, [[("_id", 1)]])
+    token = encode_page_token([("close", 1), ("_id", 1)], {"_id": 5, "close": 2.0}, {"s": 1})
+    spec = plan_find({"s": 1}, {"sort": {"close": 1}, "page_token": token})
+    with pytest.raises(UnindexedSortRejected):
+        await guard.check(collection, spec)
+    assert database.explained[0]["filter"] == spec.filter
+
+@pytest.mark.asyncio
+async def test_selective_equality_filter_allows_an_unindexed_sort():
+    guard = CostGuard(max_response_bytes=10 ** 9, sort_max_documents=1000)
+    database = FakeDatabase(count=10_000_000)
+    collection = FakeCollection(database, [[("_id", 1)], [("symbol", 1)]])
+
+    # Only the documents for one symbol are sorted in memory
+    estimate = await guard.check(collection, plan_find({"symbol": "AAPL"}, {"sort": {"close": -1}}))
+    assert estimate.notes == []
+    assert database.explained == []
+
+    # A range on the indexed field, or equality on an unindexed one, does not narrow enough to tell
+    with pytest.raises(UnindexedSortRejected):
+        await guard.check(collection, plan_find({"symbol": {"$gt": "A"}}, {"sort": {"close": -1}}))
+    with pytest.raises(UnindexedSortRejected):
+        await guard.check(collection, plan_find({"exchange": "NASDAQ"}, {"sort": {"close": -1}}))
+
+@pytest.mark.asyncio
+async def test_limit_lowered_from_the_executed_limit():
+    guard = CostGuard(max_response_bytes=10_000, sort_max_documents=10 ** 9)
+    collection = FakeCollection(FakeDatabase(count=1000, avg_size=1000), [[("_id", 1)]])
+    estimate = await guard.check(collection, plan_find({}, {"limit": 50}))
+    assert estimate.limit == 10
+    assert "Limit lowered to 10" in estimate.notes[0]
+    # Limits within the budget are kept
+    assert (await guard.check(collection, plan_find({}, {"limit": 5}))).limit == 5
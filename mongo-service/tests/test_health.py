@@ -0,0 +1,102 @@
+"""
+Tests for the circuit breaker and the health monitor.
+"""
+
+import asyncio
+import pytest
+from src.mongo_mcp_server.health import CircuitBreaker, HealthMonitor
+
+def test_opens_after_threshold_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3)
+    assert not breaker.record_failure("timeout")
+    assert not breaker.record_failure("timeout")
+    assert breaker.allow()
+    assert breaker.record_failure("timeout")
+    assert breaker.state == CircuitBreaker.OPEN
+    # Further failures do not count as new trips
+    assert not breaker.record_failure("timeout")
+    assert breaker.trips == 1
+
+def test_success_resets_the_failure_streak():
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure("timeout")
+    assert not breaker.record_success()
+    assert not breaker.record_failure("timeout")
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_open_breaker_rejects_calls():
+    breaker = CircuitBreaker(failure_threshold=1)
+    breaker.record_failure("connection refused")
+    assert not breaker.allow()
+    assert not breaker.allow()
+    assert breaker.rejected == 2
+    assert "connection refused" in breaker.describe()
+
+def test_success_closes_only_on_the_transition():
+    breaker = CircuitBreaker(failure_threshold=1)
+    breaker.record_failure("down")
+    assert breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+    assert not breaker.record_success()
+    assert breaker.stats()["last_error"] is None
+    assert breaker.describe() == "MongoDB is reachable"
+
+def test_threshold_is_at_least_one():
+    assert CircuitBreaker(failure_threshold=0).failure_threshold == 1
+
+@pytest.mark.asyncio
+async def test_check_updates_the_breaker_and_reports_changes():
+    results = []
+    changes = []
+
+    async def ping():
+        outcome = results.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return {"ok": 1}
+
+    breaker = CircuitBreaker(failure_threshold=2)
+    monitor = HealthMonitor(ping, breaker, timeout=1, on_change=changes.append)
+    results.extend([ConnectionError("refused"), ConnectionError("refused"), {"ok": 1}, {"ok": 1}])
+
+    assert not await monitor.check()
+    assert changes == []
+    assert not await monitor.check()
+    assert changes == [False]
+    assert breaker.state == CircuitBreaker.OPEN
+    assert await monitor.check()
+    assert changes == [False, True]
+    assert await monitor.check()
+    assert changes == [False, True]
+    assert monitor.checks == 4
+    assert monitor.last_latency_ms is not None
+
+@pytest.mark.asyncio
+async def test_slow_ping_counts_as_failure():
+    async def hang():
+        await asyncio.Event().wait()
+
+    breaker = CircuitBreaker(failure_threshold=1)
+    monitor = HealthMonitor(hang, breaker, timeout=0.01)
+    assert not await monitor.check()
+    assert breaker.last_error == "no reply within 0.01 s"
+
+@pytest.mark.asyncio
+async def test_background_checks_run_until_stopped():
+    pings = 0
+
+    async def ping():
+        nonlocal pings
+        pings += 1
+
+    monitor = HealthMonitor(ping, CircuitBreaker(), interval=0.01)
+    monitor.start()
+    try:
+        async def wait_for_pings():
+            while pings < 2:
+                await asyncio.sleep(0.01)
+        await asyncio.wait_for(wait_for_pings(), 2)
+    finally:
+        await monitor.stop()
+    assert monitor._task is None
@@ -0,0 +1,80 @@
+"""
+Tests for the precomputed, paginated tools/list and resources/list responses.
+"""
+
+import pytest
+from mcp.types import Resource, Tool
+from src.mongo_mcp_server.listings import ListingCache
+
+def tools(*names):
+    return [Tool(name=name, inputSchema={"type": "object"}) for name in names]
+
+def resources(*names):
+    return [Resource(uri=f"mongodb://{name}", name=name) for name in names]
+
+def test_empty_cache_has_one_empty_page():
+    cache = ListingCache(page_size=2)
+    page = cache.tool_page()
+    assert page.tools == [] and page.nextCursor is None
+    assert cache.resource_page().resources == []
+
+def test_pages_are_sliced_with_version_cursors():
+    cache = ListingCache(page_size=2)
+    assert cache.update(["a"], tools("t1", "t2", "t3", "t4", "t5"), resources("a"))
+    first = cache.tool_page()
+    assert [tool.name for tool in first.tools] == ["t1", "t2"]
+    assert first.nextCursor == "1:1"
+    second = cache.tool_page(first.nextCursor)
+    assert [tool.name for tool in second.tools] == ["t3", "t4"]
+    third = cache.tool_page(second.nextCursor)
+    assert [tool.name for tool in third.tools] == ["t5"]
+    assert third.nextCursor is None
+    # Resources are paged separately
+    assert cache.resource_page().nextCursor is None
+
+def test_pages_are_prebuilt_and_shared():
+    cache = ListingCache(page_size=2)
+    cache.update(["a"], tools("t1", "t2", "t3"), resources("a"))
+    assert cache.tool_page() is cache.tool_page()
+    assert cache.tool_page("1:1") is cache.tool_page("1:1")
+
+def test_page_size_zero_returns_everything():
+    cache = ListingCache(page_size=0)
+    cache.update(["a"], tools("t1", "t2", "t3"), resources("a"))
+    page = cache.tool_page()
+    assert len(page.tools) == 3 and page.nextCursor is None
+
+def test_cursor_from_an_older_version_is_rejected():
+    cache = ListingCache(page_size=1)
+    cache.update(["a"], tools("t1", "t2"), resources("a"))
+    cursor = cache.tool_page().nextCursor
+    cache.update(["a", "b"], tools("t1", "t2", "t3"), resources("a", "b"))
+    with pytest.raises(ValueError, match="listing version 1, now 2; list again"):
+        cache.tool_page(cursor)
+    assert cache.tool_page("2:1").tools[0].name == "t2"
+
+@pytest.mark.parametrize("cursor", ["garbage", "1:", "1:0", "1:9", "-1:1", "x:1"])
+def test_malformed_cursors_are_rejected(cursor):
+    cache = ListingCache(page_size=1)
+    cache.update(["a"], tools("t1", "t2"), resources("a"))
+    with pytest.raises(ValueError):
+        cache.tool_page(cursor)
+
+def test_unchanged_descriptors_keep_the_version():
+    cache = ListingCache(page_size=2)
+    assert cache.update(["a"], tools("t1"), resources("a"))
+    snapshot = cache.snapshot
+    # Equal content built again from scratch does not publish a new version
+    assert not cache.update(["a", "empty"], tools("t1"), resources("a"))
+    assert cache.snapshot.version == 1
+    assert cache.snapshot.tool_pages is snapshot.tool_pages
+    assert cache.snapshot.collection_names == ("a", "empty")
+    assert cache.stats() == {"version": 1, "tools": 1, "resources": 1, "rebuilds": 1, "unchanged": 1}
+
+def test_changed_descriptors_publish_a_new_version():
+    cache = ListingCache(page_size=2)
+    cache.update(["a"], tools("t1"), resources("a"))
+    changed = tools("t1")
+    changed[0].description = "now described"
+    assert cache.update(["a"], changed, resources("a"))
+    assert cache.snapshot.version == 2
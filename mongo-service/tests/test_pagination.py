@@ -0,0 +1,144 @@
+"""
+Tests for keyset pagination: tokens, range filters and the planned find.
+"""
+
+import pytest
+from bson import ObjectId
+from src.mongo_mcp_server.pagination import (
+    PageTokenError,
+    decode_page_token,
+    encode_page_token,
+    include_sort_fields,
+    keyset_filter,
+    normalize_sort,
+    plan_find,
+    validate_find_options
+)
+
+def test_normalize_sort_appends_id_in_last_direction():
+    assert normalize_sort({"a": 1, "b": -1}) == [("a", 1), ("b", -1), ("_id", -1)]
+    assert normalize_sort(None) == [("_id", 1)]
+    assert normalize_sort({"_id": -1}) == [("_id", -1)]
+
+def test_normalize_sort_rejects_non_numeric_directions():
+    with pytest.raises(PageTokenError):
+        normalize_sort({"score": {"$meta": "textScore"}})
+    with pytest.raises(PageTokenError):
+        normalize_sort({"a": "asc"})
+
+def test_keyset_filter_single_key():
+    assert keyset_filter({}, [("_id", 1)], [5]) == {"$or": [{"_id": {"$gt": 5}}]}
+
+def test_keyset_filter_compound_sort():
+    result = keyset_filter({"symbol": "AAPL"}, [("a", 1), ("b", -1), ("_id", -1)], [1, 2, 3])
+    assert result == {"$and": [
+        {"symbol": "AAPL"},
+        {"$or": [
+            {"a": {"$gt": 1}},
+            {"a": 1, "b": {"$lt": 2}},
+            {"a": 1, "b": 2, "_id": {"$lt": 3}}
+        ]}
+    ]}
+
+def test_keyset_filter_null_values():
+    # Ascending: null sorts first, so every non-null value comes after it
+    ascending = keyset_filter({}, [("a", 1), ("_id", 1)], [None, 7])
+    assert ascending == {"$or": [{"a": {"$ne": None}}, {"a": None, "_id": {"$gt": 7}}]}
+    # Descending: null sorts last, so only ties on a can follow
+    descending = keyset_filter({}, [("a", -1), ("_id", -1)], [None, 7])
+    assert descending == {"$or": [{"a": None, "_id": {"$lt": 7}}]}
+
+def test_token_round_trip():
+    sort_spec = [("close", -1), ("_id", -1)]
+    last = {"_id": ObjectId("64b7f0c2a1b2c3d4e5f60718"), "close": 187.5, "symbol": "AAPL"}
+    token = encode_page_token(sort_spec, last, {"symbol": "AAPL"})
+    assert "=" not in token
+    assert decode_page_token(token, sort_spec, {"symbol": "AAPL"}) == [187.5, last["_id"]]
+
+def test_token_reads_dotted_paths_and_missing_fields():
+    sort_spec = [("quote.close", 1), ("volume", 1), ("_id", 1)]
+    token = encode_page_token(sort_spec, {"_id": 1, "quote": {"close": 2.5}}, {})
+    assert decode_page_token(token, sort_spec, {}) == [2.5, None, 1]
+
+def test_token_accepts_equivalent_filter():
+    sort_spec = [("_id", 1)]
+    token = encode_page_token(sort_spec, {"_id": 1}, {"a": 1, "b": 2})
+    assert decode_page_token(token, sort_spec, {"b": 2, "a": 1}) == [1]
+
+def test_token_rejects_different_filter():
+    sort_spec = [("_id", 1)]
+    token = encode_page_token(sort_spec, {"_id": 1}, {"symbol": "AAPL"})
+    with pytest.raises(PageTokenError, match="different query filter"):
+        decode_page_token(token, sort_spec, {"symbol": "MSFT"})
+
+def test_token_rejects_different_sort():
+    token = encode_page_token([("a", 1), ("_id", 1)], {"_id": 1, "a": 2}, {})
+    with pytest.raises(PageTokenError, match="different sort order"):
+        decode_page_token(token, [("a", -1), ("_id", -1)], {})
+
+def test_token_rejects_garbage():
+    with pytest.raises(PageTokenError, match="Invalid page token"):
+        decode_page_token("not-a-token", [("_id", 1)], {})
+
+def test_include_sort_fields():
+    sort_spec = [("close", -1), ("_id", -1)]
+    assert include_sort_fields({"symbol": 1}, sort_spec) == {"symbol": 1, "close": 1, "_id": 1}
+    assert include_sort_fields({"close": 0, "notes": 0}, sort_spec) == {"notes": 0}
+    assert include_sort_fields(None, sort_spec) is None
+
+def test_plan_find_keeps_caller_sort_without_pagination():
+    spec = plan_find({"a": 1}, {"sort": {"a": 1}, "projection": {"b": 1}, "limit": 10})
+    assert spec.sort == [("a", 1)]
+    assert spec.projection == {"b": 1}
+    assert spec.filter == {"a": 1}
+    assert not spec.paginate
+
+def test_plan_find_leaves_unsorted_queries_unsorted():
+    spec = plan_find({}, {"limit": 5})
+    assert spec.sort is None
+    assert spec.sort_document() is None
+
+def test_plan_find_passes_meta_and_string_sorts_through():
+    assert plan_find({}, {"sort": {"score": {"$meta": "textScore"}}}).sort == [("score", {"$meta": "textScore"})]
+    assert plan_find({}, {"sort": {"a": "asc"}}).sort == [("a", "asc")]
+
+def test_plan_find_paginate_adds_tie_breaker():
+    spec = plan_find({}, {"sort": {"a": 1}, "projection": {"b": 1}, "paginate": True})
+    assert spec.sort == [("a", 1), ("_id", 1)]
+    assert spec.projection == {"b": 1, "a": 1, "_id": 1}
+    assert spec.paginate
+
+def test_plan_find_paginate_rejects_meta_sort():
+    with pytest.raises(PageTokenError):
+        plan_find({}, {"sort": {"score": {"$meta": "textScore"}}, "paginate": True})
+
+def test_plan_find_resolves_page_token():
+    token = encode_page_token([("a", 1), ("_id", 1)], {"_id": 3, "a": 2}, {"s": 1})
+    spec = plan_find({"s": 1}, {"sort": {"a": 1}, "page_token": token})
+    assert spec.query == {"s": 1}
+    assert spec.filter == keyset_filter({"s": 1}, [("a", 1), ("_id", 1)], [2, 3])
+    assert spec.paginate
+
+def test_plan_find_rejects_token_with_skip():
+    token = encode_page_token([("_id", 1)], {"_id": 3}, {})
+    with pytest.raises(PageTokenError, match="skip"):
+        plan_find({}, {"page_token": token, "skip": 10})
+
+def test_plan_find_rejects_token_for_changed_sort():
+    token = encode_page_token([("a", 1), ("_id", 1)], {"_id": 3, "a": 2}, {})
+    with pytest.raises(PageTokenError, match="different sort order"):
+        plan_find({}, {"sort": {"b": 1}, "page_token": token})
+
+def test_validate_find_options_drops_unknown_options():
+    options = {"sort": {"a": 1}, "hint": "a_1", "limit": 5}
+    assert validate_find_options(options, {"sort", "limit"}) == {"sort": {"a": 1}, "limit": 5}
+
+@pytest.mark.parametrize("options, expected", [
+    ({"limit": 500}, {"limit": 100}),
+    ({"limit": "10"}, {"limit": 100}),
+    ({"skip": -1}, {"skip": 0}),
+    ({"skip": 2.5}, {"skip": 0}),
+    ({"limit": 20, "skip": 40}, {"limit": 20, "skip": 40})
+])
+def test_validate_find_options_clamps_limit_and_skip(options, expected):
+    assert validate_find_options(options, {"limit", "skip"}) == expected
@@ -0,0 +1,41 @@
+"""
+Tests for the pool warm-up.
+"""
+
+import logging
+import pytest
+from src.mongo_mcp_server.pool import PoolStats, warm_up
+
+class FakeAdmin:
+    def __init__(self, fail_every=0):
+        self.pings = 0
+        self.fail_every = fail_every
+
+    async def command(self, name):
+        self.pings += 1
+        if self.fail_every and self.pings % self.fail_every == 0:
+            raise ConnectionError("reset")
+        return {"ok": 1}
+
+class FakeClient:
+    def __init__(self, admin):
+        self.admin = admin
+
+@pytest.mark.asyncio
+async def test_warm_up_reports_connections_actually_open(caplog):
+    stats = PoolStats()
+    # Pings may share connections; the pool reports what really got opened
+    stats.open_connections = 2
+    client = FakeClient(FakeAdmin(fail_every=4))
+    with caplog.at_level(logging.INFO):
+        elapsed = await warm_up(client, 4, stats)
+    assert elapsed is not None
+    assert client.admin.pings == 4
+    assert "3 ping(s)" in caplog.text
+    assert "2 connection(s) open" in caplog.text
+
+@pytest.mark.asyncio
+async def test_warm_up_disabled():
+    client = FakeClient(FakeAdmin())
+    assert await warm_up(client, 0) is None
+    assert client.admin.pings == 0
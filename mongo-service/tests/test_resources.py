@@ -0,0 +1,73 @@
+"""
+Tests for resource URI parsing.
+"""
+
+from urllib.parse import quote
+import pytest
+from bson import ObjectId
+from src.mongo_mcp_server.catalog import CollectionCatalog
+from src.mongo_mcp_server.resources import parse_resource_uri
+from src.mongo_mcp_server.server import MongoMCPServer
+
+def test_plain_collection_uri_uses_defaults():
+    request = parse_resource_uri("mongodb://prices")
+    assert request.collection_name == "prices"
+    assert request.query == {}
+    assert request.fields is None
+    assert request.page_token is None
+    assert request.limit == 10
+
+def test_filter_fields_page_and_limit():
+    query = quote('{"symbol": "AAPL", "close": {"$gt": 100}}')
+    request = parse_resource_uri(f"mongodb://prices?filter={query}&fields=symbol,%20close,&page=abc&limit=20")
+    assert request.query == {"symbol": "AAPL", "close": {"$gt": 100}}
+    assert request.fields == ["symbol", "close"]
+    assert request.page_token == "abc"
+    assert request.limit == 20
+
+def test_filter_accepts_extended_json():
+    query = quote('{"_id": {"$oid": "64b7f0c2a1b2c3d4e5f60718"}}')
+    request = parse_resource_uri(f"mongodb://prices?filter={query}")
+    assert request.query == {"_id": ObjectId("64b7f0c2a1b2c3d4e5f60718")}
+
+def test_last_repeated_parameter_wins():
+    assert parse_resource_uri("mongodb://prices?limit=5&limit=7").limit == 7
+
+@pytest.mark.parametrize("limit, expected", [("0", 1), ("-5", 1), ("1000", 100), ("100", 100)])
+def test_limit_is_clamped(limit, expected):
+    assert parse_resource_uri(f"mongodb://prices?limit={limit}").limit == expected
+
+def test_non_integer_limit_is_rejected():
+    with pytest.raises(ValueError, match="limit must be an integer"):
+        parse_resource_uri("mongodb://prices?limit=ten")
+
+@pytest.mark.parametrize("value", [quote('{"symbol": '), quote("not json")])
+def test_malformed_filter_is_rejected(value):
+    with pytest.raises(ValueError):
+        parse_resource_uri(f"mongodb://prices?filter={value}")
+
+def test_filter_must_be_an_object():
+    with pytest.raises(ValueError, match="filter must be a JSON object"):
+        parse_resource_uri(f"mongodb://prices?filter={quote('[1, 2]')}")
+
+@pytest.mark.parametrize("uri", ["http://prices", "mongodb://", "mongodb:///prices", "prices"])
+def test_unsupported_uri_is_rejected(uri):
+    with pytest.raises(ValueError, match="Unsupported resource URI"):
+        parse_resource_uri(uri)
+
+class FakeDatabase:
+    def __getitem__(self, name):
+        raise AssertionError("an unknown collection must not be read")
+
+@pytest.mark.asyncio
+async def test_reading_an_unknown_collection_is_an_error():
+    server = MongoMCPServer()
+    server.catalog = CollectionCatalog(FakeDatabase(), lambda name: None, ["prices"])
+    server._ready.set()
+    try:
+        assert await server.read_resource("mongodb://orders") == "Unknown collection: orders"
+        assert (await server.read_resource("http://prices")).startswith(
+            "Error reading resource: Unsupported resource URI"
+        )
+    finally:
+        await server.shutdown()
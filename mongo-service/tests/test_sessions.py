@@ -0,0 +1,163 @@
+"""
+Tests for per-session state: session keys, cursor release and subscriptions.
+"""
+
+import asyncio
+import pytest
+from pydantic import AnyUrl
+from mcp.shared.memory import create_connected_server_and_client_session
+from src.mongo_mcp_server.cursors import CursorRegistry
+from src.mongo_mcp_server.executor import MongoExecutor
+from src.mongo_mcp_server.formatting import FormattedResults
+from src.mongo_mcp_server.server import MongoMCPServer
+from src.mongo_mcp_server.subscriptions import SubscriptionManager
+
+class FakeCursor:
+    """Driver cursor stand-in with more documents left on the server."""
+
+    def __init__(self):
+        self.alive = True
+        self.closed = False
+
+    async def to_list(self, length):
+        return []
+
+    async def close(self):
+        self.alive = False
+        self.closed = True
+
+FIRST_PAGE = FormattedResults('{"_id": 1}', 1, True, {"_id": 1})
+
+@pytest.mark.asyncio
+async def test_close_session_only_closes_that_sessions_cursors():
+    executor = MongoExecutor()
+    cursors = CursorRegistry(executor)
+    mine, theirs = FakeCursor(), FakeCursor()
+    try:
+        await cursors.register(mine, "prices", "session-a", FIRST_PAGE)
+        await cursors.register(theirs, "prices", "session-b", FIRST_PAGE)
+        assert await cursors.close_session("session-a") == 1
+        assert mine.closed and not theirs.closed
+        assert len(cursors) == 1
+    finally:
+        await cursors.stop()
+        executor.shutdown()
+
+@pytest.mark.asyncio
+async def test_sessions_get_stable_keys_and_release_cursors_when_closed():
+    server = MongoMCPServer()
+    server._ready.set()
+    seen = []
+    cursors = []
+
+    async def record_session(params, session_key):
+        seen.append(session_key)
+        cursor = FakeCursor()
+        cursors.append(cursor)
+        await server.cursors.register(cursor, "prices", session_key, FIRST_PAGE)
+        return []
+
+    server.fetch_more_tool.execute = record_session
+    try:
+        async with create_connected_server_and_client_session(server.mcp_server) as client:
+            await client.call_tool("fetch_more", {"cursor": "x"})
+            await client.call_tool("fetch_more", {"cursor": "x"})
+            async with create_connected_server_and_client_session(server.mcp_server) as other:
+                await other.call_tool("fetch_more", {"cursor": "x"})
+            # The other session ended: its cursor is closed, ours stay open
+            assert [cursor.closed for cursor in cursors] == [False, False, True]
+
+        assert seen[0] == seen[1] != seen[2]
+        assert all(cursor.closed for cursor in cursors)
+        assert len(server.cursors) == 0
+    finally:
+        await server.shutdown()
+
+class FakeSession:
+    """MCP session stand-in that records notifications, or fails once closed."""
+
+    def __init__(self, closed=False):
+        self.closed = closed
+        self.updated = []
+
+    async def send_resource_updated(self, uri):
+        if self.closed:
+            raise ConnectionError("session closed")
+        self.updated.append(str(uri))
+
+@pytest.mark.asyncio
+async def test_failed_send_drops_the_session():
+    subscriptions = SubscriptionManager(debounce=0)
+    live, gone = FakeSession(), FakeSession(closed=True)
+    subscriptions.subscribe("mongodb://prices", "prices", "live", live)
+    subscriptions.subscribe("mongodb://prices", "prices", "gone", gone)
+    subscriptions.subscribe("mongodb://prices/AAPL", "prices", "gone", gone)
+
+    subscriptions.on_change("prices", None)
+    await subscriptions._timers["prices"]
+    assert live.updated == ["mongodb://prices"]
+    assert subscriptions.stats()["sessions"] == 1
+    assert subscriptions.failures >= 1
+
+    # Later changes only reach the live session
+    subscriptions.on_change("prices", None)
+    await subscriptions._timers["prices"]
+    assert live.updated == ["mongodb://prices"] * 2
+    assert subscriptions.stats()["subscriptions"] == 1
+
+def test_remove_session_unsubscribes_everything():
+    subscriptions = SubscriptionManager()
+    subscriptions.subscribe("mongodb://prices", "prices", "a", FakeSession())
+    subscriptions.subscribe("mongodb://quotes", "quotes", "a", FakeSession())
+    subscriptions.subscribe("mongodb://quotes", "quotes", "b", FakeSession())
+    assert subscriptions.remove_session("a") == 2
+    assert subscriptions.collections() == {"quotes"}
+    assert not subscriptions.unsubscribe("mongodb://prices", "a")
+
+@pytest.mark.asyncio
+async def test_subscriptions_end_with_their_session():
+    server = MongoMCPServer()
+    server._ready.set()
+
+    async def collection_names():
+        return ["prices"]
+
+    server._collection_names = collection_names
+    try:
+        async with create_connected_server_and_client_session(server.mcp_server) as client:
+            await client.subscribe_resource(AnyUrl("mongodb://prices"))
+            async with create_connected_server_and_client_session(server.mcp_server) as other:
+                await other.subscribe_resource(AnyUrl("mongodb://prices"))
+                assert server.subscriptions.stats()["sessions"] == 2
+            assert server.subscriptions.stats()["sessions"] == 1
+        assert server.subscriptions.stats()["subscriptions"] == 0
+        assert server.subscriptions.collections() == set()
+    finally:
+        await server.shutdown()
+
+@pytest.mark.asyncio
+async def test_subscribe_during_startup_waits_for_the_watcher():
+    server = MongoMCPServer()
+    watched = []
+
+    class FakeWatcher:
+        def watch(self, collection_name):
+            watched.append(collection_name)
+
+    async def collection_names():
+        return ["prices"]
+
+    server._collection_names = collection_names
+    try:
+        async with create_connected_server_and_client_session(server.mcp_server) as client:
+            subscribe = asyncio.create_task(client.subscribe_resource(AnyUrl("mongodb://prices")))
+            await asyncio.sleep(0.05)
+            assert not subscribe.done()
+            # The background connection finishes and creates the watcher
+            server.change_watcher = FakeWatcher()
+            server._ready.set()
+            await asyncio.wait_for(subscribe, 2)
+        assert watched == ["prices"]
+    finally:
+        server.change_watcher = None
+        await server.shutdown()
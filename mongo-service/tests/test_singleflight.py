@@ -0,0 +1,108 @@
+"""
+Tests for request coalescing.
+"""
+
+import asyncio
+import pytest
+from src.mongo_mcp_server.singleflight import SingleFlight
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "result"
+
+    waiters = [asyncio.create_task(flight.do("key", work)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    assert await asyncio.gather(*waiters) == ["result"] * 5
+    assert calls == 1
+    assert flight.stats() == {"executed": 1, "deduplicated": 4, "abandoned": 0, "in_flight": 0}
+
+@pytest.mark.asyncio
+async def test_different_keys_run_separately():
+    flight = SingleFlight()
+
+    async def work(value):
+        await asyncio.sleep(0)
+        return value
+
+    results = await asyncio.gather(flight.do("a", lambda: work(1)), flight.do("b", lambda: work(2)))
+    assert results == [1, 2]
+    assert flight.executed == 2
+
+@pytest.mark.asyncio
+async def test_sequential_calls_are_not_coalesced():
+    flight = SingleFlight()
+
+    async def work():
+        return "result"
+
+    await flight.do("key", work)
+    await flight.do("key", work)
+    assert flight.executed == 2
+    assert flight.deduplicated == 0
+
+@pytest.mark.asyncio
+async def test_error_reaches_every_waiter():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def work():
+        await release.wait()
+        raise ValueError("boom")
+
+    waiters = [asyncio.create_task(flight.do("key", work)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert all(isinstance(result, ValueError) and str(result) == "boom" for result in results)
+    assert flight.executed == 1
+    assert flight.stats()["in_flight"] == 0
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_shared_call():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def work():
+        await release.wait()
+        return "result"
+
+    first = asyncio.create_task(flight.do("key", work))
+    second = asyncio.create_task(flight.do("key", work))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+    assert await second == "result"
+    assert first.cancelled()
+    assert flight.abandoned == 0
+
+@pytest.mark.asyncio
+async def test_last_waiter_cancelled_cancels_shared_call():
+    flight = SingleFlight()
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def work():
+        started.set()
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    waiter = asyncio.create_task(flight.do("key", work))
+    await started.wait()
+    waiter.cancel()
+    await asyncio.wait_for(cancelled.wait(), 1)
+    assert flight.abandoned == 1
+    await asyncio.sleep(0)
+    assert flight.stats()["in_flight"] == 0